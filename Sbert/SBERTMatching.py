@@ -2,6 +2,10 @@ from sentence_transformers import SentenceTransformer, util
 import torch
 import os
 from Sbert.utils.convert_to_text import convert_to_text
+from Sbert.utils.split_text import split_into_chunks, split_requirements
+from Sbert.utils.onnx_backend import load_onnx_model
+from Sbert.utils.inference_worker import InferenceWorker
+from utils.tracing import span
 
 
 
@@ -12,14 +16,53 @@ class SBERTMatching:
     (CV et offre d’emploi) à l’aide de SBERT (Sentence-BERT).
     """
 
-    def __init__(self, model_path='https://drive.google.com/uc?export=download&id=1KPuaQuwp4gEQZv6HwpVm8CHtJm3qr03Z'):
+    def __init__(self, model_path='https://drive.google.com/uc?export=download&id=1KPuaQuwp4gEQZv6HwpVm8CHtJm3qr03Z',
+                 backend="torch", onnx_path=None, quantize=False, inference_thread=False,
+                 max_batch_size=64, max_wait_ms=0):
         """
         Initialise le modèle SBERT à partir du chemin fourni.
 
         Args:
         - model_path (str): Chemin vers le modèle Sentence-BERT fine-tuné.
+        - backend (str): "torch" (par défaut) ou "onnx" pour l'inférence CPU via ONNX Runtime.
+        - onnx_path (str): Dossier du modèle exporté en ONNX (backend "onnx" uniquement,
+          export préalable : python -m Sbert.utils.onnx_backend).
+        - quantize (bool): Utilise la variante ONNX quantifiée int8 (backend "onnx" uniquement).
+        - inference_thread (bool): Fait passer tous les encodes par un thread d'inférence dédié
+          qui regroupe les requêtes concurrentes en un seul batch.
+        - max_batch_size (int): Nombre maximal de textes par batch du thread d'inférence.
+        - max_wait_ms (float): Attente maximale du thread d'inférence pour compléter un batch.
         """
-        self.model = SentenceTransformer(model_path)
+        if backend == "onnx":
+            self.model = load_onnx_model(onnx_path or "sbert_onnx", quantize=quantize)
+        elif backend == "torch":
+            self.model = SentenceTransformer(model_path)
+        else:
+            raise ValueError(f"Backend SBERT inconnu : {backend}. Valeurs possibles : torch, onnx.")
+        self.inference_worker = None
+        if inference_thread:
+            self.inference_worker = InferenceWorker(self.model, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    def encode(self, texts, batch_size=32):
+        """
+        Encode un texte ou une liste de textes, sans suivi des gradients.
+
+        Args:
+        - texts (str or list[str]): Texte(s) à encoder.
+        - batch_size (int): Taille de batch passée à model.encode.
+
+        Returns:
+        - torch.Tensor: Embedding (1 dimension pour un texte, 2 pour une liste).
+        """
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        with span("sbert_encode"):
+            if self.inference_worker is not None:
+                embeddings = self.inference_worker.encode(batch)
+            else:
+                with torch.inference_mode():
+                    embeddings = self.model.encode(batch, batch_size=batch_size, convert_to_tensor=True)
+        return embeddings[0] if single else embeddings
 
     def process_input(self, input_data):
         """
@@ -33,7 +76,8 @@ class SBERTMatching:
         """
         if isinstance(input_data, str):
             if os.path.isfile(input_data) and input_data.lower().endswith(('.txt', '.pdf','.docx')):
-                return convert_to_text(input_data)
+                with span("document_parse"):
+                    return convert_to_text(input_data)
             else:
                 # Not a file or unsupported extension, treat as raw text
                 return input_data
@@ -56,8 +100,8 @@ class SBERTMatching:
         t2 = self.process_input(text2)
         # print("t1",t1)
 
-        emb1 = self.model.encode(t1, convert_to_tensor=True)
-        emb2 = self.model.encode(t2, convert_to_tensor=True)
+        emb1 = self.encode(t1)
+        emb2 = self.encode(t2)
 
         cosine_sim = util.pytorch_cos_sim(emb1, emb2).item()
         return cosine_sim
@@ -84,7 +128,87 @@ class SBERTMatching:
     
     # comparer deux textes directement
     def compute_similarity_from_texts(self, cv_text, job_text):
-        cv_embedding = self.model.encode(cv_text, convert_to_tensor=True)
-        job_embedding = self.model.encode(job_text, convert_to_tensor=True)
+        cv_embedding = self.encode(cv_text)
+        job_embedding = self.encode(job_text)
         similarity = util.cos_sim(cv_embedding, job_embedding)
         return float(similarity[0][0])
+
+    # comparer deux embeddings déjà calculés (ex. embedding de CV mis en cache)
+    def compute_similarity_from_embeddings(self, cv_embedding, job_embedding):
+        similarity = util.cos_sim(cv_embedding, job_embedding)
+        return float(similarity[0][0])
+
+    # découper et encoder un CV bloc par bloc
+    def encode_chunks(self, cv_text, batch_size=32):
+        """
+        Découpe le CV en blocs et les encode en un seul appel batché.
+
+        Args:
+        - cv_text (str): Texte du CV.
+        - batch_size (int): Taille de batch passée à model.encode.
+
+        Returns:
+        - tuple[list[str], torch.Tensor or None]: Blocs du CV et leurs embeddings.
+        """
+        with span("sbert_split"):
+            cv_chunks = split_into_chunks(cv_text)
+        if not cv_chunks:
+            return cv_chunks, None
+        return cv_chunks, self.encode(cv_chunks, batch_size=batch_size)
+
+    # comparer les blocs du CV aux exigences de l'offre
+    def compute_chunk_similarity(self, cv_text, job_text, batch_size=32) -> dict:
+        """
+        Calcule un score "meilleure preuve du CV par exigence".
+
+        Le CV est découpé en blocs et l'offre en lignes d'exigences ; chaque côté
+        est encodé en un seul appel batché, puis la matrice exigences × blocs est
+        obtenue par un unique produit matriciel.
+
+        Args:
+        - cv_text (str): Texte du CV.
+        - job_text (str): Texte de l'offre.
+        - batch_size (int): Taille de batch passée à model.encode.
+
+        Returns:
+        - dict: {"score": float, "matches": [{"requirement", "cv_chunk", "similarity"}]}
+          où score est la moyenne, sur les exigences, de la meilleure similarité.
+        """
+        cv_chunks, cv_embeddings = self.encode_chunks(cv_text, batch_size=batch_size)
+        return self.compute_chunk_similarity_from_embeddings(cv_chunks, cv_embeddings, job_text, batch_size=batch_size)
+
+    def compute_chunk_similarity_from_embeddings(self, cv_chunks, cv_embeddings, job_text, batch_size=32) -> dict:
+        """
+        Variante de compute_chunk_similarity à partir des blocs du CV déjà encodés.
+
+        Args:
+        - cv_chunks (list[str]): Blocs du CV (voir encode_chunks).
+        - cv_embeddings (torch.Tensor or np.ndarray): Embeddings des blocs.
+        - job_text (str or list[str]): Texte de l'offre, ou ses exigences déjà découpées.
+        - batch_size (int): Taille de batch passée à model.encode.
+
+        Returns:
+        - dict: Même format que compute_chunk_similarity.
+        """
+        if isinstance(job_text, str):
+            with span("sbert_split"):
+                requirements = split_requirements(job_text)
+        else:
+            requirements = list(job_text)
+        if not cv_chunks or not requirements:
+            return {"score": 0.0, "matches": []}
+
+        req_embeddings = self.encode(requirements, batch_size=batch_size)
+
+        similarity = util.cos_sim(req_embeddings, cv_embeddings)
+        best_scores, best_indices = similarity.max(dim=1)
+
+        matches = [
+            {
+                "requirement": requirement,
+                "cv_chunk": cv_chunks[index],
+                "similarity": round(score, 4)
+            }
+            for requirement, score, index in zip(requirements, best_scores.tolist(), best_indices.tolist())
+        ]
+        return {"score": float(best_scores.mean()), "matches": matches}
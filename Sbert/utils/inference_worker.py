@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+import torch
+
+
+class InferenceWorker:
+    """
+    Thread d'inférence dédié d'un worker : toutes les requêtes d'encodage passent
+    par une file, et celles qui arrivent dans une même fenêtre de temps sont
+    regroupées en un seul appel model.encode (micro-batching dynamique).
+    """
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=0):
+        """
+        Démarre le thread d'inférence.
+
+        Args:
+        - model (SentenceTransformer): Modèle utilisé pour l'encodage.
+        - max_batch_size (int): Nombre maximal de textes fusionnés en une seule passe du modèle.
+        - max_wait_ms (float): Attente maximale, après la première requête, pour
+          compléter le batch (0 : on ne prend que les requêtes déjà en file).
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.requests = queue.Queue()
+        self.carry = None
+
+        # Métriques : distribution des tailles de batch et attente en file
+        self.lock = threading.Lock()
+        self.batch_sizes = Counter()
+        self.requests_per_batch = Counter()
+        self.queue_waits_ms = deque(maxlen=1000)
+        self.queue_wait_total_ms = 0.0
+        self.queue_wait_max_ms = 0.0
+        self.encoded_requests = 0
+
+        self.thread = threading.Thread(target=self._run, name="sbert-inference", daemon=True)
+        self.thread.start()
+
+    def encode(self, texts):
+        """
+        Encode une liste de textes via le thread d'inférence (appel bloquant).
+
+        Args:
+        - texts (list[str]): Textes à encoder.
+
+        Returns:
+        - torch.Tensor: Embeddings, une ligne par texte.
+        """
+        future = Future()
+        self.requests.put((texts, future, time.perf_counter()))
+        return future.result()
+
+    def metrics(self) -> dict:
+        """
+        Retourne les métriques du micro-batching.
+
+        Returns:
+        - dict: Distribution des tailles de batch (en textes et en requêtes) et
+          statistiques d'attente en file (en ms).
+        """
+        with self.lock:
+            waits = list(self.queue_waits_ms)
+            count = self.encoded_requests
+            return {
+                "batches": sum(self.batch_sizes.values()),
+                "batch_size_distribution": dict(sorted(self.batch_sizes.items())),
+                "requests_per_batch_distribution": dict(sorted(self.requests_per_batch.items())),
+                "queue_wait_ms": {
+                    "count": count,
+                    "mean": round(self.queue_wait_total_ms / count, 3) if count else 0.0,
+                    "max": round(self.queue_wait_max_ms, 3),
+                    "p50": round(float(np.percentile(waits, 50)), 3) if waits else 0.0,
+                    "p95": round(float(np.percentile(waits, 95)), 3) if waits else 0.0,
+                }
+            }
+
+    def _next_request(self, timeout=None):
+        if self.carry is not None:
+            request, self.carry = self.carry, None
+            return request
+        if timeout is None:
+            return self.requests.get()
+        if timeout <= 0:
+            return self.requests.get_nowait()
+        return self.requests.get(timeout=timeout)
+
+    def _collect(self):
+        """
+        Attend une requête puis complète le batch jusqu'à max_batch_size textes
+        ou jusqu'à l'expiration de max_wait_ms.
+        """
+        pending = [self._next_request()]
+        size = len(pending[0][0])
+        deadline = time.perf_counter() + self.max_wait_ms / 1000
+        while size < self.max_batch_size:
+            try:
+                request = self._next_request(timeout=deadline - time.perf_counter())
+            except queue.Empty:
+                break
+            if size + len(request[0]) > self.max_batch_size:
+                # Requête gardée pour le batch suivant
+                self.carry = request
+                break
+            pending.append(request)
+            size += len(request[0])
+        return pending
+
+    def _record(self, pending, started):
+        with self.lock:
+            self.batch_sizes[sum(len(texts) for texts, _, _ in pending)] += 1
+            self.requests_per_batch[len(pending)] += 1
+            for _, _, submitted in pending:
+                wait_ms = (started - submitted) * 1000
+                self.queue_waits_ms.append(wait_ms)
+                self.queue_wait_total_ms += wait_ms
+                self.queue_wait_max_ms = max(self.queue_wait_max_ms, wait_ms)
+                self.encoded_requests += 1
+
+    def _run(self):
+        with torch.inference_mode():
+            while True:
+                pending = self._collect()
+                self._record(pending, time.perf_counter())
+                texts = [text for request_texts, _, _ in pending for text in request_texts]
+                try:
+                    embeddings = self.model.encode(texts, batch_size=self.max_batch_size, convert_to_tensor=True)
+                except Exception as e:
+                    for _, future, _ in pending:
+                        future.set_exception(e)
+                    continue
+
+                # Redistribution des embeddings à chaque requête
+                start = 0
+                for request_texts, future, _ in pending:
+                    end = start + len(request_texts)
+                    future.set_result(embeddings[start:end])
+                    start = end
@@ -0,0 +1,109 @@
+"""
+Backend ONNX Runtime de SBERTMatching.
+
+Le modèle est exporté une fois, avant le démarrage des workers, par :
+
+    python -m Sbert.utils.onnx_backend --model-path <modele> --onnx-path sbert_onnx [--quantize]
+
+L'export est écrit dans un dossier temporaire voisin puis chaque fichier est
+déplacé par os.replace, le fichier .onnx en dernier : un worker ne charge
+jamais un modèle à moitié écrit.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+# Fichiers produits par sentence-transformers dans <onnx_path>/onnx/
+ONNX_FILE_NAME = "onnx/model.onnx"
+QUANTIZATION_CONFIG = "avx2"
+QUANTIZED_FILE_SUFFIX = "int8"
+QUANTIZED_ONNX_FILE_NAME = f"onnx/model_{QUANTIZED_FILE_SUFFIX}.onnx"
+
+# Tolérance documentée par rapport au backend torch : similarité cosinus minimale
+# entre l'embedding torch et l'embedding ONNX d'un même texte.
+ONNX_FP32_MIN_COSINE = 0.9999
+ONNX_INT8_MIN_COSINE = 0.98
+
+
+def _move_files(source, destination, last):
+    # Fichiers de source déplacés dans destination, le fichier `last` (relatif) en dernier
+    files = []
+    for root, _, names in os.walk(source):
+        files += [os.path.relpath(os.path.join(root, name), source) for name in names]
+    for name in sorted(files, key=lambda name: name == last):
+        target = os.path.join(destination, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(os.path.join(source, name), target)
+
+
+def export_onnx_model(model_path, onnx_path, quantize=False):
+    """
+    Exporte une seule fois le modèle SBERT au format ONNX (et optionnellement
+    sa version quantifiée int8 dynamique) dans le dossier onnx_path.
+
+    Nécessite le paquet optionnel optimum[onnxruntime].
+
+    Args:
+    - model_path (str): Chemin ou URL du modèle Sentence-BERT fine-tuné.
+    - onnx_path (str): Dossier de sortie du modèle exporté.
+    - quantize (bool): Exporte aussi la variante int8 quantifiée.
+
+    Returns:
+    - str: Le dossier onnx_path.
+    """
+    parent = os.path.dirname(os.path.abspath(onnx_path))
+    os.makedirs(parent, exist_ok=True)
+    if not os.path.isfile(os.path.join(onnx_path, ONNX_FILE_NAME)):
+        tmp_path = tempfile.mkdtemp(prefix=".sbert_onnx-", dir=parent)
+        try:
+            SentenceTransformer(model_path, backend="onnx").save_pretrained(tmp_path)
+            _move_files(tmp_path, onnx_path, ONNX_FILE_NAME)
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    if quantize and not os.path.isfile(os.path.join(onnx_path, QUANTIZED_ONNX_FILE_NAME)):
+        tmp_path = tempfile.mkdtemp(prefix=".sbert_onnx-", dir=parent)
+        try:
+            model = SentenceTransformer(onnx_path, backend="onnx", model_kwargs={"file_name": ONNX_FILE_NAME})
+            export_dynamic_quantized_onnx_model(model, QUANTIZATION_CONFIG, tmp_path, file_suffix=QUANTIZED_FILE_SUFFIX)
+            _move_files(os.path.join(tmp_path, "onnx"), os.path.join(onnx_path, "onnx"),
+                        os.path.basename(QUANTIZED_ONNX_FILE_NAME))
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+    return onnx_path
+
+
+def load_onnx_model(onnx_path, quantize=False):
+    """
+    Charge le modèle SBERT exporté (export_onnx_model), exécuté par ONNX Runtime.
+
+    Le modèle retourné expose la même méthode encode() que le backend torch.
+
+    Args:
+    - onnx_path (str): Dossier du modèle exporté.
+    - quantize (bool): Utilise la variante int8 quantifiée.
+
+    Returns:
+    - SentenceTransformer: Modèle utilisant le backend ONNX Runtime.
+    """
+    file_name = QUANTIZED_ONNX_FILE_NAME if quantize else ONNX_FILE_NAME
+    if not os.path.isfile(os.path.join(onnx_path, file_name)):
+        raise FileNotFoundError(
+            f"Modèle ONNX {os.path.join(onnx_path, file_name)} absent. À exporter avant le démarrage : "
+            f"python -m Sbert.utils.onnx_backend --model-path <modele> --onnx-path {onnx_path}"
+            + (" --quantize" if quantize else ""))
+    return SentenceTransformer(onnx_path, backend="onnx", model_kwargs={"file_name": file_name})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporte le modèle SBERT au format ONNX (étape de build).")
+    parser.add_argument("--model-path", required=True, help="Chemin ou URL du modèle Sentence-BERT fine-tuné.")
+    parser.add_argument("--onnx-path", default="sbert_onnx", help="Dossier du modèle exporté.")
+    parser.add_argument("--quantize", action="store_true", help="Exporte aussi la variante int8 quantifiée.")
+    args = parser.parse_args()
+    print(export_onnx_model(args.model_path, args.onnx_path, quantize=args.quantize))
+
+
+if __name__ == "__main__":
+    main()
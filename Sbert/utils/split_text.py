@@ -0,0 +1,86 @@
+import re
+
+# Puces, tirets et séparateurs de lignes fréquents dans les CV et les offres
+BULLET_PATTERN = re.compile(r"[•▪●♦■▶→◦]|^\s*[\-\*]\s+", re.MULTILINE)
+SENTENCE_PATTERN = re.compile(r"(?<=[.;!?])\s+|\n+")
+
+
+def _split_segments(text):
+    """
+    Découpe un texte en segments élémentaires (lignes, puces, phrases).
+
+    Args:
+    - text (str): Texte brut.
+
+    Returns:
+    - list[str]: Segments non vides, dans l'ordre du texte.
+    """
+    text = text.replace("\r", "\n")
+    text = BULLET_PATTERN.sub("\n", text)
+    segments = [" ".join(seg.split()) for seg in SENTENCE_PATTERN.split(text)]
+    return [seg for seg in segments if seg]
+
+
+def split_into_chunks(text, max_words=40, min_words=4):
+    """
+    Découpe un CV en blocs de quelques lignes consécutives.
+
+    Les segments trop courts (titres, dates) sont regroupés avec leurs voisins
+    afin que chaque bloc porte assez de contexte pour être encodé par SBERT.
+
+    Args:
+    - text (str): Texte du CV.
+    - max_words (int): Nombre maximal de mots par bloc.
+    - min_words (int): Nombre minimal de mots pour clôturer un bloc.
+
+    Returns:
+    - list[str]: Blocs de texte du CV.
+    """
+    chunks = []
+    current = []
+    current_len = 0
+    for segment in _split_segments(text):
+        words = segment.split()
+        # Segment trop long : on le coupe en fenêtres de max_words mots
+        while len(words) > max_words:
+            if current:
+                chunks.append(" ".join(current))
+                current, current_len = [], 0
+            chunks.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        if current_len + len(words) > max_words and current_len >= min_words:
+            chunks.append(" ".join(current))
+            current, current_len = [], 0
+        current.extend(words)
+        current_len += len(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def split_requirements(text, min_words=2):
+    """
+    Découpe une offre d'emploi en lignes d'exigences.
+
+    Args:
+    - text (str): Texte de l'offre.
+    - min_words (int): Les segments plus courts sont rattachés au suivant.
+
+    Returns:
+    - list[str]: Exigences de l'offre, une par ligne ou phrase.
+    """
+    requirements = []
+    pending = ""
+    for segment in _split_segments(text):
+        segment = f"{pending} {segment}".strip() if pending else segment
+        if len(segment.split()) < min_words:
+            pending = segment
+            continue
+        requirements.append(segment)
+        pending = ""
+    if pending:
+        if requirements:
+            requirements[-1] = f"{requirements[-1]} {pending}"
+        else:
+            requirements.append(pending)
+    return requirements
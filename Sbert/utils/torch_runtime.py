@@ -0,0 +1,44 @@
+import os
+import torch
+
+
+def default_num_threads():
+    """
+    Nombre de threads intra-op par worker : les coeurs de la machine partagés
+    entre les workers gunicorn (WEB_CONCURRENCY), ou None si non configuré.
+
+    Returns:
+    - int or None: Nombre de threads conseillé, None pour garder le défaut de torch.
+    """
+    workers = os.environ.get("WEB_CONCURRENCY")
+    if not workers:
+        return None
+    return max(1, (os.cpu_count() or 1) // int(workers))
+
+
+def configure_torch_threads(num_threads=None, num_interop_threads=None):
+    """
+    Fixe explicitement les pools de threads de torch pour le worker courant.
+
+    À appeler au chargement de l'application, avant tout encode : torch refuse
+    de modifier le pool inter-op une fois qu'un calcul parallèle a démarré.
+
+    Args:
+    - num_threads (int): Threads intra-op (None : default_num_threads()).
+    - num_interop_threads (int): Threads inter-op (None : défaut de torch).
+
+    Returns:
+    - dict: Valeurs effectivement appliquées par torch.
+    """
+    num_threads = num_threads or default_num_threads()
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    if num_interop_threads:
+        try:
+            torch.set_num_interop_threads(num_interop_threads)
+        except RuntimeError as e:
+            print(f"Impossible de modifier les threads inter-op de torch : {e}")
+    return {
+        "num_threads": torch.get_num_threads(),
+        "num_interop_threads": torch.get_num_interop_threads()
+    }
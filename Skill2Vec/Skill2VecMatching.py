@@ -2,30 +2,40 @@ from Skill2Vec.utils.convert_to_text import convert_to_text
 from Skill2Vec.utils.extract_skills import extract_skills
 from gensim.models import Word2Vec
 from Skill2Vec.utils.skill2vec_matching import skillset_similarity, get_skill_vector, cosine_similarity
+from Skill2Vec.utils.skill_vectors import SkillVectors, load_skill_names, load_skill_vectors
+from utils.tracing import span
 import os
 
 
 class Skill2VecMatching:
     
-    def __init__(self, model_path="https://drive.google.com/uc?export=download&id=1Orr6HYjK6fAIhSM32iRAv5qpnqLwsvoh"):
+    def __init__(self, model_path="https://drive.google.com/uc?export=download&id=1Orr6HYjK6fAIhSM32iRAv5qpnqLwsvoh",
+                 vectors_path=None):
         """
-        Initialise le modèle Word2Vec pré-entrainé.
+        Initialise les vecteurs du modèle Word2Vec pré-entrainé : export projeté en mémoire
+        (voir Skill2Vec/utils/skill_vectors.py) s'il existe dans vectors_path, sinon modèle
+        complet, dont seuls les vecteurs des mots sont conservés. Dans les deux cas, les
+        compétences de SKILL_DB en plusieurs mots ont un vecteur composé.
         """
-        self.model = Word2Vec.load(model_path)
+        self.vectors = load_skill_vectors(vectors_path) if vectors_path else None
+        if self.vectors is None:
+            self.vectors = SkillVectors.from_keyed_vectors(Word2Vec.load(model_path).wv, load_skill_names())
         
     def process_input(self, input_data):
         """
         Traite l'entrée (chemin de fichier ou texte brut).
         """
         if isinstance(input_data, str) and os.path.isfile(input_data):
-            return convert_to_text(input_data)
+            with span("document_parse"):
+                return convert_to_text(input_data)
         return input_data
     
     def extract_skills_from_text(self, text):
         """
         Extrait les compétences depuis le texte via extract_skills().
         """
-        skills = extract_skills(text)
+        with span("skillner_extract"):
+            skills = extract_skills(text)
         return self.process_skills(skills)
     
     def process_skills(self, skills):
@@ -38,7 +48,8 @@ class Skill2VecMatching:
         """
         Calcule la similarité entre deux listes de compétences.
         """
-        return skillset_similarity(cv_skills, job_skills, self.model)
+        with span("skill2vec_similarity"):
+            return skillset_similarity(cv_skills, job_skills, self.vectors)
     
     def get_similarity_score(self, cv_input, job_input):
         """
@@ -58,11 +69,11 @@ class Skill2VecMatching:
         """
         scores = []
         for cv_skill in cv_skills:
-            vec_cv = get_skill_vector(cv_skill, self.model)
+            vec_cv = get_skill_vector(cv_skill, self.vectors)
             if vec_cv is None:
                 continue
             for job_skill in job_skills:
-                vec_job = get_skill_vector(job_skill, self.model)
+                vec_job = get_skill_vector(job_skill, self.vectors)
                 if vec_job is None:
                     continue
                 sim = cosine_similarity(vec_cv, vec_job)
@@ -75,6 +86,6 @@ class Skill2VecMatching:
         Retourne les compétences du texte qui sont réellement vectorisées par le modèle.
         """
         tokens = text.lower().split()
-        vectorized = [token for token in tokens if token in self.model.wv]
+        vectorized = [token for token in tokens if token in self.vectors]
         return [{"skill_name": token} for token in sorted(set(vectorized))]
     
@@ -1,5 +1,6 @@
 import os
-from pdfminer.high_level import extract_text as extract_pdf_text
+from utils.pdf_text import extraire_texte_pdf
+from utils.text_stream import lire_texte
 from docx import Document
 
 def convert_to_text(file_path):
@@ -19,15 +20,15 @@ def convert_to_text(file_path):
     ext = ext.lower()
 
     if ext == ".pdf":
-        return extract_pdf_text(file_path)
+        return extraire_texte_pdf(file_path)
 
     elif ext == ".docx":
         doc = Document(file_path)
         return "\n".join([para.text for para in doc.paragraphs])
 
     elif ext == ".txt":
-        with open(file_path, "r", encoding="utf-8") as f:
-            return f.read()
+        # Lecture bornée : un moteur n'exploite pas plus de TEXT_MAX_CHARS caractères
+        return lire_texte(file_path)
 
     else:
         raise ValueError(f"Unsupported file type: {ext}. Supported formats are PDF, DOCX, and TXT.")
@@ -4,12 +4,14 @@ from spacy.matcher import PhraseMatcher
 
 from skillNer.general_params import SKILL_DB
 from skillNer.skill_extractor_class import SkillExtractor
+from utils.tracing import model_load
 
 
-# init params of skill extractor
-nlp = spacy.load("en_core_web_lg")
-# init skill extractor
-skill_extractor = SkillExtractor(nlp, SKILL_DB, PhraseMatcher)
+with model_load("skillner"):
+    # init params of skill extractor
+    nlp = spacy.load("en_core_web_lg")
+    # init skill extractor
+    skill_extractor = SkillExtractor(nlp, SKILL_DB, PhraseMatcher)
 
 
 
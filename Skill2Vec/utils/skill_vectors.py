@@ -0,0 +1,254 @@
+"""
+Table des vecteurs de compétences de Skill2Vec, exportée depuis le modèle Word2Vec.
+
+Skill2VecMatching chargeait le modèle Word2Vec complet (dont les poids
+syn1neg, inutiles hors entraînement) pour n'en lire que model.wv. L'export ne
+garde que les vecteurs : normalisés (float16 ou float32) dans un
+.npy, avec leurs normes et l'index du vocabulaire. Au chargement, le .npy est
+projeté en mémoire (mmap_mode="r") : lecture seule, partagée par les workers
+via le cache de pages, et chargée à la demande.
+
+SkillVectors expose le sous-ensemble de l'interface KeyedVectors utilisé par
+Skill2Vec (in, [], get_vector, vector_size) : vectors[mot] rend le vecteur
+d'origine (vecteur unitaire × norme), get_vector(mot, norm=True) le vecteur
+unitaire.
+
+Les noms de compétences de SKILL_DB absents du vocabulaire ("project
+management", "c++ (programming language)") reçoivent un vecteur composé à
+la construction : mot joint par des "_" s'il est dans le vocabulaire, sinon
+moyenne des vecteurs de ses mots connus. Ces vecteurs sont ajoutés à la table,
+sous le nom en minuscules (celui de Skill2VecMatching.process_skills) : une
+compétence se cherche comme un mot, en O(1).
+
+    python -m Skill2Vec.utils.skill_vectors --model-path <modele> --output skill2vec_vectors --dtype float16
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+VECTORS_FILE = "vectors.npy"
+NORMS_FILE = "norms.npy"
+VOCAB_FILE = "vocab.json"
+MANIFEST_FILE = "manifest.json"
+# Version du format de l'export (fichiers et leur contenu). 2 : vecteurs composés des
+# compétences de SKILL_DB en plusieurs mots ajoutés à la table
+VECTORS_FORMAT = 2
+# Part minimale des mots d'une compétence présents dans le vocabulaire pour composer sa moyenne
+PHRASE_MIN_COVERAGE = 0.5
+
+# Qualificatif entre parenthèses des noms SKILL_DB, ignoré pour la composition
+QUALIFICATIF = re.compile(r"\([^)]*\)")
+SEPARATEURS = re.compile(r"[\s/,]+")
+
+
+class SkillVectors:
+    def __init__(self, vectors, norms, index_to_key):
+        self.vectors = vectors
+        self.norms = norms
+        self.index_to_key = index_to_key
+        self.key_to_index = {key: i for i, key in enumerate(index_to_key)}
+        self.vector_size = vectors.shape[1]
+
+    @classmethod
+    def from_keyed_vectors(cls, keyed_vectors, skill_names=()):
+        """
+        Table en mémoire (sans export), vecteurs des compétences composés compris.
+        """
+        index_to_key, vectors, _ = skill_vector_table(keyed_vectors, skill_names)
+        units, norms = unit_vectors(vectors)
+        return cls(units, norms, index_to_key)
+
+    def __len__(self):
+        return len(self.index_to_key)
+
+    def __contains__(self, key):
+        return key in self.key_to_index
+
+    def __getitem__(self, key):
+        return self.get_vector(key)
+
+    def get_vector(self, key, norm=False):
+        """
+        Args:
+        - key (str): Mot du vocabulaire ou nom de compétence composé.
+        - norm (bool): Vecteur unitaire plutôt que le vecteur d'origine.
+
+        Returns:
+        - np.ndarray: Vecteur float32 (KeyError si absent de la table).
+        """
+        i = self.key_to_index[key]
+        if norm:
+            return self.vectors[i].astype(np.float32)
+        return np.multiply(self.vectors[i], self.norms[i], dtype=np.float32)
+
+
+def phrase_tokens(name):
+    return [token for token in SEPARATEURS.split(QUALIFICATIF.sub(" ", name)) if token]
+
+
+def compose_phrase_vectors(keyed_vectors, skill_names, min_coverage=PHRASE_MIN_COVERAGE):
+    """
+    Compose un vecteur pour chaque nom de compétence absent du vocabulaire.
+
+    Args:
+    - keyed_vectors (KeyedVectors): Vecteurs des mots du modèle.
+    - skill_names (iterable[str]): Noms des compétences (ex. skill_name de SKILL_DB).
+    - min_coverage (float): Part minimale des mots du nom présents dans le vocabulaire.
+
+    Returns:
+    - tuple[list[str], np.ndarray, dict]: Noms en minuscules, leurs vecteurs (float32)
+      et le nombre de noms par méthode (vocabulary, underscore, average, missing).
+    """
+    keys, rows = [], []
+    methods = {"vocabulary": 0, "underscore": 0, "average": 0, "missing": 0}
+    for name in sorted({name.lower() for name in skill_names}):
+        if name in keyed_vectors:
+            methods["vocabulary"] += 1
+            continue
+        tokens = phrase_tokens(name)
+        joined = "_".join(tokens)
+        known = [token for token in tokens if token in keyed_vectors]
+        if joined and joined in keyed_vectors:
+            rows.append(keyed_vectors[joined])
+            methods["underscore"] += 1
+        elif known and len(known) >= min_coverage * len(tokens):
+            rows.append(np.mean([keyed_vectors[token] for token in known], axis=0))
+            methods["average"] += 1
+        else:
+            methods["missing"] += 1
+            continue
+        keys.append(name)
+    return keys, np.array(rows, dtype=np.float32).reshape(len(rows), keyed_vectors.vector_size), methods
+
+
+def skill_vector_table(keyed_vectors, skill_names=()):
+    """
+    Returns:
+    - tuple[list[str], np.ndarray, dict]: Clés (mots puis compétences composées),
+      vecteurs float32 et nombre de compétences par méthode de composition.
+    """
+    keys, phrase_vectors, methods = compose_phrase_vectors(keyed_vectors, skill_names)
+    vectors = np.concatenate([np.asarray(keyed_vectors.vectors, dtype=np.float32), phrase_vectors])
+    return list(keyed_vectors.index_to_key) + keys, vectors, methods
+
+
+def unit_vectors(vectors):
+    norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+    # Vecteur nul : norme conservée à 0, vecteur unitaire nul
+    return vectors / np.where(norms == 0, 1, norms)[:, None], norms
+
+
+def export_skill_vectors(keyed_vectors, output_folder, dtype="float32", source=None, skill_names=()):
+    """
+    Exporte les vecteurs d'un modèle Word2Vec (model.wv) pour load_skill_vectors.
+
+    Args:
+    - keyed_vectors (KeyedVectors): Vecteurs des mots du modèle.
+    - output_folder (str): Dossier de l'export (créé si besoin).
+    - dtype (str): "float16" ou "float32", type des vecteurs unitaires stockés.
+    - source (str): Chemin du modèle d'origine, noté dans le manifeste.
+    - skill_names (iterable[str]): Noms des compétences à composer (ex. skill_name de SKILL_DB).
+
+    Returns:
+    - dict: Manifeste écrit.
+    """
+    if dtype not in ("float16", "float32"):
+        raise ValueError(f"Type {dtype} non pris en charge (float16 ou float32).")
+    os.makedirs(output_folder, exist_ok=True)
+    index_to_key, vectors, methods = skill_vector_table(keyed_vectors, skill_names)
+    units, norms = unit_vectors(vectors)
+
+    # Fichiers écrits sous un nom temporaire, puis renommés, manifeste en dernier :
+    # un export n'est visible qu'une fois complet
+    tmp = {filename: os.path.join(output_folder, f"tmp_{filename}")
+           for filename in (VECTORS_FILE, NORMS_FILE, VOCAB_FILE, MANIFEST_FILE)}
+    np.save(tmp[VECTORS_FILE], units.astype(dtype))
+    np.save(tmp[NORMS_FILE], norms)
+    with open(tmp[VOCAB_FILE], "w", encoding="utf-8") as f:
+        json.dump(index_to_key, f, ensure_ascii=False)
+    manifest = {
+        "format": VECTORS_FORMAT,
+        "dtype": dtype,
+        "count": len(index_to_key),
+        "vector_size": int(vectors.shape[1]),
+        "words": len(keyed_vectors.index_to_key),
+        "skills": methods,
+        "source": source,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(tmp[MANIFEST_FILE], "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    for filename, path in tmp.items():
+        os.replace(path, os.path.join(output_folder, filename))
+    return manifest
+
+
+def load_skill_vectors(folder, mmap_mode="r"):
+    """
+    Charge un export de export_skill_vectors s'il existe.
+
+    Args:
+    - folder (str): Dossier de l'export.
+    - mmap_mode (str): Mode de projection du .npy des vecteurs (None : chargement en mémoire).
+
+    Returns:
+    - SkillVectors | None: Vecteurs des mots, ou None si l'export est absent ou
+      antérieur aux vecteurs composés (format 1).
+    """
+    manifest_path = os.path.join(folder, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") == 1:
+        # Sans vecteurs composés, les compétences en plusieurs mots n'auraient plus de vecteur
+        print(f"Export {folder} au format 1 (sans vecteurs composés) ignoré : modèle complet chargé "
+              f"(à réexporter : python -m Skill2Vec.utils.skill_vectors --model-path <modele> --output {folder})")
+        return None
+    if manifest.get("format") != VECTORS_FORMAT:
+        raise ValueError(f"Format d'export {manifest.get('format')} non pris en charge (attendu : {VECTORS_FORMAT}).")
+    with open(os.path.join(folder, VOCAB_FILE), encoding="utf-8") as f:
+        index_to_key = json.load(f)
+    # Vue ndarray de la projection (sans copie) : l'indexation d'un np.memmap est plusieurs fois plus lente
+    vectors = np.asarray(np.load(os.path.join(folder, VECTORS_FILE), mmap_mode=mmap_mode))
+    norms = np.load(os.path.join(folder, NORMS_FILE))
+    if vectors.shape != (manifest["count"], manifest["vector_size"]) or len(index_to_key) != manifest["count"]:
+        raise ValueError(f"Export incomplet ou incohérent dans {folder}.")
+    return SkillVectors(vectors, norms, index_to_key)
+
+
+def load_skill_names(skill_db_path=None):
+    """
+    Noms des compétences de SKILL_DB, lu depuis skill_db_path ou chargé par SkillNER.
+    """
+    if skill_db_path:
+        with open(skill_db_path, encoding="utf-8") as f:
+            skill_db = json.load(f)
+    else:
+        from skillNer.general_params import SKILL_DB as skill_db
+    return [entry["skill_name"] for entry in skill_db.values()]
+
+
+def main():
+    from gensim.models import Word2Vec
+
+    parser = argparse.ArgumentParser(description="Exporte les vecteurs du modèle Skill2Vec pour un chargement mmap.")
+    parser.add_argument("--model-path", required=True, help="Modèle Word2Vec (fichier local ou URL).")
+    parser.add_argument("--output", default="skill2vec_vectors", help="Dossier de l'export.")
+    parser.add_argument("--dtype", default="float32", choices=["float16", "float32"])
+    parser.add_argument("--skill-db", help="SKILL_DB de SkillNER (JSON) ; chargé par SkillNER par défaut.")
+    parser.add_argument("--no-skills", action="store_true", help="N'exporte que les vecteurs des mots.")
+    args = parser.parse_args()
+
+    skill_names = () if args.no_skills else load_skill_names(args.skill_db)
+    manifest = export_skill_vectors(Word2Vec.load(args.model_path).wv, args.output, args.dtype, args.model_path,
+                                    skill_names)
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Service combiné : détection du domaine et matching dans un seul processus.
+
+Chaque CV téléversé n'est extrait qu'une fois ; son texte est mis en cache par
+hash du contenu (même cache que /match-profile), puis partagé par les deux
+moteurs. /analyze renvoie le domaine et le score en une requête. Les routes
+historiques /detect-domain et /match-profile restent disponibles.
+
+    gunicorn analyze_api:app
+"""
+import os
+import time
+import hashlib
+from flask import Flask, request, jsonify, Response, g
+from werkzeug.utils import secure_filename
+from Sbert.utils.convert_to_text import convert_to_text
+from utils.cv_cache import CVArtifactCache, pipeline_fingerprint
+from utils.pdf_text import PDF_EXTRACTOR
+from utils.text_stream import TEXT_MAX_CHARS
+from utils.nettoyage import nettoyer_texte
+from utils.tracing import span, record, registry
+from utils.profiling import profiled
+
+# 📂 Configuration
+UPLOAD_FOLDER = "uploads"
+ALLOWED_EXTENSIONS = {"pdf", "docx", "txt"}
+# Moteurs chargés dans ce processus (au moins un)
+ANALYZE_DOMAIN_ENABLED = os.environ.get("ANALYZE_DOMAIN_ENABLED", "1") == "1"
+ANALYZE_MATCHING_ENABLED = os.environ.get("ANALYZE_MATCHING_ENABLED", "1") == "1"
+
+if not (ANALYZE_DOMAIN_ENABLED or ANALYZE_MATCHING_ENABLED):
+    raise ValueError("ANALYZE_DOMAIN_ENABLED et ANALYZE_MATCHING_ENABLED sont tous deux désactivés.")
+
+# 🔁 Chargement des modèles : une seule copie par processus pour les deux services
+if ANALYZE_DOMAIN_ENABLED:
+    import domain_api
+if ANALYZE_MATCHING_ENABLED:
+    import matching_api
+    cv_cache = matching_api.cv_cache
+    cv_cache_fingerprint = matching_api.CV_CACHE_FINGERPRINT
+elif os.environ.get("CV_CACHE_ENABLED", "1") == "1":
+    cv_cache = CVArtifactCache(
+        os.environ.get("CV_CACHE_FOLDER", "cv_cache"),
+        max_bytes=int(os.environ.get("CV_CACHE_MAX_MB", "512")) * 1024 * 1024,
+        ttl_seconds=float(os.environ.get("CV_CACHE_TTL_HOURS", "168")) * 3600
+    )
+else:
+    cv_cache = None
+if not ANALYZE_MATCHING_ENABLED:
+    # Seul le texte extrait est mis en cache
+    cv_cache_fingerprint = pipeline_fingerprint(pdf_extractor=PDF_EXTRACTOR, text_max_chars=TEXT_MAX_CHARS)
+
+app = Flask(__name__)
+app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+
+# 📄 Vérifie l’extension
+def allowed_file(filename):
+    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+
+# ♻️ Artefacts du CV depuis le cache, sinon texte extrait une seule fois du fichier
+def get_cv_artifacts(cv_key, cv_bytes, filename):
+    """
+    Returns:
+    - tuple[dict, bool]: Artefacts du CV et True s'ils viennent du cache.
+    """
+    if cv_cache is not None:
+        with span("cache_get"):
+            cv_artifacts = cv_cache.get(cv_key)
+        if cv_artifacts is not None:
+            return cv_artifacts, True
+
+    path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+    with span("upload_write"):
+        os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(cv_bytes)
+    # Texte brut, comme /match-profile : le cache est partagé avec cette route
+    with span("document_parse"):
+        return {"text": convert_to_text(path)}, False
+
+# 🔎 Domaine depuis le texte brut : même nettoyage que domain_api.extraire_texte
+def predire_domaine_texte(texte):
+    with span("domain_prediction"):
+        return domain_api.predire_domaine(nettoyer_texte(texte))
+
+# 🚀 API : domaine et matching en une requête
+@app.route("/analyze", methods=["POST"])
+@profiled("analyze")
+def analyze():
+    file = request.files.get("cv_file") or request.files.get("cv_pdf")
+    if file is None:
+        return jsonify({"error": "Missing CV file"}), 400
+
+    if not allowed_file(file.filename):
+        return jsonify({"error": "Invalid file type"}), 400
+
+    debug = request.values.get("debug") == "1"
+    request_start = time.perf_counter()
+    cv_bytes = file.read()
+    cv_key = CVArtifactCache.key(cv_bytes, cv_cache_fingerprint)
+    cv_artifacts, cached = get_cv_artifacts(cv_key, cv_bytes, secure_filename(file.filename))
+    timings = {"parse_ms": round((time.perf_counter() - request_start) * 1000, 1)}
+    updates = {}
+    response = {}
+
+    if ANALYZE_DOMAIN_ENABLED:
+        start = time.perf_counter()
+        response["domaine"] = predire_domaine_texte(cv_artifacts["text"])
+        timings["domain_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    if ANALYZE_MATCHING_ENABLED:
+        job_text_raw = request.form.get("job_text", matching_api.get_default_offer())
+        with span("preprocess"):
+            job_text_original, job_requirements = matching_api.prepare_offer(job_text_raw)
+        # Requête profilée : moteurs dans le thread de la requête, seul suivi par cProfile
+        response["match"], engines = matching_api.score_cv(
+            cv_artifacts, job_text_original, job_requirements, sequential=g.get("profiling", False))
+        updates = engines["updates"]
+        timings.update({f"{name}_ms": round(seconds * 1000, 1) for name, seconds in engines["timings"].items()})
+
+    if cv_cache is not None and (updates or not cached):
+        with span("cache_set"):
+            cv_cache.set(cv_key, {**cv_artifacts, **updates})
+
+    timings["total_ms"] = round((time.perf_counter() - request_start) * 1000, 1)
+    if g.get("profiling"):
+        g.profile_document_hash = hashlib.sha256(cv_bytes).hexdigest()
+    g.profile_timings = timings
+    if debug:
+        response["timings"] = timings
+
+    record("request", time.perf_counter() - request_start)
+    return jsonify(response)
+
+# 🚀 Routes historiques, servies par le même processus
+if ANALYZE_DOMAIN_ENABLED:
+    app.add_url_rule("/detect-domain", view_func=domain_api.detect_domain, methods=["POST"])
+    app.add_url_rule("/detect-domain-batch", view_func=domain_api.detect_domain_batch, methods=["POST"])
+if ANALYZE_MATCHING_ENABLED:
+    app.add_url_rule("/match-profile", view_func=matching_api.match_profile, methods=["POST"])
+
+# 📊 API : métriques au format Prometheus (propres à chaque worker)
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    extra = matching_api.collect_metrics() if ANALYZE_MATCHING_ENABLED else []
+    return Response(registry.render(extra), mimetype="text/plain; version=0.0.4")
+
+if __name__ == "__main__":
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
@@ -0,0 +1,223 @@
+import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from quart import Quart, request, jsonify, Response
+from werkzeug.utils import secure_filename
+from Sbert.utils.convert_to_text import convert_to_text
+from utils.cv_cache import CVArtifactCache
+from utils.tracing import registry
+from utils.process_pool import process_pool
+import matching_api
+from matching_api import (
+    allowed_file,
+    get_default_offer,
+    prepare_offer,
+    translate_cv,
+    translate_offer,
+    score_sbert,
+    skill2vec_needed,
+    build_response,
+    format_timings,
+    collect_metrics
+)
+from engine_workers import init_worker, timed, run_skill2vec_engine, run_extraction_engine, detecter_domaine_fichier
+
+# 📂 Configuration
+UPLOAD_FOLDER = matching_api.UPLOAD_FOLDER
+# Contre-pression : requêtes traitées en parallèle, puis requêtes en attente avant de répondre 503
+ASYNC_MAX_CONCURRENT_REQUESTS = int(os.environ.get("ASYNC_MAX_CONCURRENT_REQUESTS", "16"))
+ASYNC_MAX_QUEUED_REQUESTS = int(os.environ.get("ASYNC_MAX_QUEUED_REQUESTS", "64"))
+# Pools : processus pour le parsing, SkillNER et les regex ; threads pour l'encodage, la traduction et les E/S
+ASYNC_PROCESS_WORKERS = int(os.environ.get("ASYNC_PROCESS_WORKERS", str(os.cpu_count() or 1)))
+ASYNC_THREAD_WORKERS = int(os.environ.get("ASYNC_THREAD_WORKERS", "8"))
+# /detect-domain nécessite les modèles joblib de domain_api
+ASYNC_DOMAIN_ENABLED = os.environ.get("ASYNC_DOMAIN_ENABLED", "1") == "1"
+
+if ASYNC_DOMAIN_ENABLED:
+    import domain_api
+
+app = Quart(__name__)
+app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+
+
+class Overloaded(Exception):
+    pass
+
+
+class RequestLimiter:
+    """
+    Limite le nombre de requêtes traitées simultanément ; au-delà de max_queued
+    requêtes en attente, les nouvelles sont refusées (Overloaded).
+    """
+
+    def __init__(self, max_concurrent, max_queued):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.max_queued = max_queued
+        self.waiting = 0
+
+    async def __aenter__(self):
+        if self.semaphore.locked() and self.waiting >= self.max_queued:
+            raise Overloaded()
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.semaphore.release()
+
+
+limiter = RequestLimiter(ASYNC_MAX_CONCURRENT_REQUESTS, ASYNC_MAX_QUEUED_REQUESTS)
+
+# ⚙️ Pools créés au premier appel, dans le processus worker (après le chargement des modèles).
+# Processus en forkserver (voir utils/process_pool.py) : ils n'importent qu'engine_workers
+# et Sbert.utils.convert_to_text, sans SBERT ni torch, et ne chargent que Skill2Vec
+executors = {}
+
+def get_executors():
+    if executors.get("pid") != os.getpid():
+        executors.clear()
+        executors["pid"] = os.getpid()
+        executors["thread"] = ThreadPoolExecutor(max_workers=ASYNC_THREAD_WORKERS, thread_name_prefix="asgi-io")
+        executors["process"] = process_pool(ASYNC_PROCESS_WORKERS, initializer=init_worker)
+    return executors["thread"], executors["process"]
+
+async def in_thread(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_executors()[0], fn, *args)
+
+async def in_process(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_executors()[1], fn, *args)
+
+
+@app.errorhandler(Overloaded)
+async def handle_overloaded(error):
+    return jsonify({"error": "Server overloaded, retry later"}), 503, {"Retry-After": "1"}
+
+
+# 🧩 Moteur SBERT : traductions en tâches concurrentes, puis encodage dans le pool de threads
+async def run_sbert_engine_async(cv_artifacts, job_text_original, job_requirements=None):
+    updates, job_text_translated = await asyncio.gather(
+        in_thread(translate_cv, cv_artifacts), in_thread(translate_offer, job_text_original, job_requirements))
+
+    sbert_result, sbert_updates = await in_thread(score_sbert, {**cv_artifacts, **updates}, job_text_translated)
+    return sbert_result, {**updates, **sbert_updates}
+
+
+# ⏱️ Durée d'un moteur exécuté en tâche asynchrone
+async def timed_async(awaitable):
+    start = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start
+
+
+# 🔀 Moteurs en tâches concurrentes, avec le même résultat que matching_api.score_cv
+# (cascade : Skill2Vec lancé seulement si le verdict dépend encore de son score)
+async def run_engines_async(cv_artifacts, job_text_original, job_requirements=None):
+    skill2vec_args = (cv_artifacts.get("skills"), cv_artifacts["text"], job_text_original)
+    tasks = [
+        timed_async(run_sbert_engine_async(cv_artifacts, job_text_original, job_requirements)),
+        in_process(timed, run_extraction_engine, cv_artifacts.get("structured"), cv_artifacts["text"], job_text_original)
+    ]
+    if not matching_api.CASCADE_MODE:
+        tasks.append(in_process(timed, run_skill2vec_engine, *skill2vec_args))
+    results = await asyncio.gather(*tasks)
+
+    ((sbert_result, sbert_updates), sbert_time), ((score_extraction, extraction_updates), extraction_time) = results[:2]
+    scores = {"sbert": sbert_result["score"], "skill2vec": None, "extraction": score_extraction}
+    updates = {**sbert_updates, **extraction_updates}
+    timings = {"sbert": sbert_time, "extraction": extraction_time}
+    skipped = ["skill2vec"]
+    if not matching_api.CASCADE_MODE or skill2vec_needed(scores["sbert"], scores["extraction"]):
+        skill2vec_result = results[2] if len(results) > 2 else await in_process(timed, run_skill2vec_engine,
+                                                                                   *skill2vec_args)
+        (scores["skill2vec"], skill2vec_updates), timings["skill2vec"] = skill2vec_result
+        updates.update(skill2vec_updates)
+        skipped = []
+
+    return {"scores": scores, "matches": sbert_result["matches"], "updates": updates, "timings": timings,
+            "skipped": skipped}
+
+
+# ♻️ Artefacts du CV depuis le cache, sinon texte extrait dans le pool de processus
+async def get_cv_artifacts_async(cv_key, file, filename):
+    cv_cache = matching_api.cv_cache
+    if cv_cache is not None:
+        cv_artifacts = await in_thread(cv_cache.get, cv_key)
+        if cv_artifacts is not None:
+            return cv_artifacts
+
+    path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+    file.stream.seek(0)
+    await file.save(path)
+    return {"text": await in_process(convert_to_text, path)}
+
+
+# 🚀 API : matching automatique (même contrat que matching_api : cascade, debug=1 ;
+# pas de profilage cProfile, qui ne suit pas les tâches asynchrones)
+@app.route("/match-profile", methods=["POST"])
+async def match_profile():
+    files = await request.files
+    form = await request.form
+    if "cv_file" not in files:
+        return jsonify({"error": "Missing CV file"}), 400
+
+    file = files["cv_file"]
+    job_text_raw = form.get("job_text", get_default_offer())
+    debug = (await request.values).get("debug") == "1"
+
+    if not allowed_file(file.filename):
+        return jsonify({"error": "Invalid file type"}), 400
+
+    async with limiter:
+        request_start = time.perf_counter()
+        filename = secure_filename(file.filename)
+        cv_key = await in_thread(CVArtifactCache.key, file.read(), matching_api.CV_CACHE_FINGERPRINT)
+        cv_artifacts, (job_text_original, job_requirements) = await asyncio.gather(
+            get_cv_artifacts_async(cv_key, file, filename),
+            in_thread(prepare_offer, job_text_raw)
+        )
+        parse_time = time.perf_counter() - request_start
+
+        engines = await run_engines_async(cv_artifacts, job_text_original, job_requirements)
+        if matching_api.cv_cache is not None and engines["updates"]:
+            await in_thread(matching_api.cv_cache.set, cv_key, {**cv_artifacts, **engines["updates"]})
+
+    response = build_response(engines)
+    if debug:
+        response["timings"] = format_timings(engines["timings"], parse_time, time.perf_counter() - request_start)
+    return jsonify(response)
+
+
+# 🚀 API : détection du domaine (même contrat que domain_api)
+@app.route("/detect-domain", methods=["POST"])
+async def detect_domain():
+    if not ASYNC_DOMAIN_ENABLED:
+        return jsonify({"error": "Domain detection disabled"}), 404
+
+    files = await request.files
+    file = files.get("cv_pdf") or files.get("cv_file")
+    if file is None:
+        return jsonify({"error": "No file uploaded"}), 400
+
+    if not domain_api.allowed_file(file.filename):
+        return jsonify({"error": "Invalid file type"}), 400
+
+    async with limiter:
+        filename = secure_filename(file.filename)
+        path = os.path.join(domain_api.UPLOAD_FOLDER, filename)
+        os.makedirs(domain_api.UPLOAD_FOLDER, exist_ok=True)
+        await file.save(path)
+        domaine = await in_process(detecter_domaine_fichier, path)
+
+    return jsonify({"domaine": domaine})
+
+
+# 📊 API : métriques au format Prometheus (étapes exécutées dans ce processus uniquement,
+# les moteurs du pool de processus n'y figurent pas)
+@app.route("/metrics", methods=["GET"])
+async def metrics():
+    return Response(registry.render(collect_metrics()), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,131 @@
+"""
+Benchmark des nettoyages de texte sur des CV longs : versions de référence
+(passes re.sub non compilées, telles qu'avant leur optimisation) contre
+utils.preprocess.preprocess, utils.nettoyage.nettoyer_texte et le Cleaner de
+SkillNER tel qu'utilisé par Text (deux variantes : abv et minuscules).
+
+Les sorties sont comparées à celles des références (le benchmark échoue si
+elles diffèrent). remove_punctuation est aussi mesuré avec str.translate, pour
+garder trace du choix des str.replace successifs.
+
+Usage :
+    python -m benchmarks.cleaning --count 4 --pages 1 5 20
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+import numpy as np
+
+from benchmarks.corpus import load_corpus
+from skillNer.cleaner import Cleaner, remove_punctuation
+from skillNer.general_params import LIST_PUNCTUATIONS
+from utils.nettoyage import nettoyer_texte
+from utils.preprocess import preprocess
+
+# Caractères d'une page de CV, environ
+PAGE_CHARS = 3000
+
+
+def preprocess_reference(text):
+    text = text.lower()
+    text = text.replace('\n', ' ').replace('\r', ' ')
+    text = re.sub(r'-\s+', '', text)
+    text = re.sub(r'[^\w\s\-\+#:/.,]', ' ', text)
+    text = re.sub(r'\b(page\s*\d+|confidentiel|curriculum vitae)\b', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def nettoyer_texte_reference(texte):
+    texte = re.sub(r"\s+", " ", texte)
+    texte = re.sub(r"[•▪●♦■▶→]", "", texte)
+    texte = re.sub(r"[^\w\s@.+]", "", texte)
+    texte = re.sub(r"(?<=[a-z])(?=[A-Z])", " ", texte)
+    return texte.strip()
+
+
+SKILLNER_CLEANER = Cleaner(include_cleaning_functions=["remove_punctuation", "remove_extra_space"], to_lowercase=False)
+
+
+def text_variants_reference(text):
+    # Text.__init__ avant : deux passes complètes du Cleaner
+    return SKILLNER_CLEANER(text), SKILLNER_CLEANER(text).lower()
+
+
+def text_variants(text):
+    abv_text = SKILLNER_CLEANER(text)
+    return abv_text, abv_text.lower()
+
+
+PUNCTUATION_TABLE = str.maketrans({punctuation: " " for punctuation in LIST_PUNCTUATIONS})
+
+
+def remove_punctuation_translate(text):
+    return text.translate(PUNCTUATION_TABLE).strip()
+
+
+# (nom, référence, version courante)
+CASES = [
+    ("preprocess", preprocess_reference, lambda text: preprocess(text, max_chars=0)),
+    ("nettoyer_texte", nettoyer_texte_reference, lambda text: nettoyer_texte(text, max_chars=0)),
+    ("skillner_text_variants", text_variants_reference, text_variants),
+    ("remove_punctuation_translate", remove_punctuation, remove_punctuation_translate),
+]
+
+
+def measure(function, texts, repeat):
+    durations = []
+    for text in texts:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(text)
+            durations.append(time.perf_counter() - start)
+    return float(np.percentile(durations, 50)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nettoyages de texte : références contre versions compilées.")
+    parser.add_argument("--corpus", default=os.path.join("benchmarks", "corpus"))
+    parser.add_argument("--count", type=int, default=4, help="CV par langue et par longueur.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pages", nargs="+", type=int, default=[1, 5, 20], help="Tailles de CV testées (pages).")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, count=args.count, seed=args.seed)
+    sources = []
+    for document in corpus["documents"]:
+        with open(os.path.join(args.corpus, document["files"]["txt"]), encoding="utf-8") as f:
+            sources.append(f.read())
+    pool = "\n".join(sources)
+
+    report = {}
+    for pages in args.pages:
+        size = pages * PAGE_CHARS
+        # CV de la taille voulue, découpés dans le corpus répété
+        repeated = pool * (size // len(pool) + 2)
+        texts = [repeated[offset:offset + size] for offset in range(0, len(pool), max(1, len(pool) // 8))][:8]
+        report[f"{pages}_pages"] = {}
+        for name, reference, current in CASES:
+            if any(reference(text) != current(text) for text in texts):
+                raise AssertionError(f"{name} : sortie différente de la référence")
+            reference_ms = measure(reference, texts, args.repeat)
+            current_ms = measure(current, texts, args.repeat)
+            report[f"{pages}_pages"][name] = {
+                "reference_p50_ms": round(reference_ms, 3),
+                "current_p50_ms": round(current_ms, 3),
+                "speedup": round(reference_ms / current_ms, 2),
+            }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
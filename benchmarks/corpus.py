@@ -0,0 +1,215 @@
+"""
+Générateur de corpus synthétique pour les benchmarks : CV et offres en
+français et en anglais, de longueurs variables, écrits en .txt, .docx et .pdf.
+
+Le contenu est assemblé à partir de listes de termes définies ici (aucune
+donnée réelle ni sous licence) ; le même seed produit toujours le même corpus.
+
+Usage :
+    python -m benchmarks.corpus --output benchmarks/corpus --count 12 --seed 0
+"""
+import argparse
+import json
+import os
+import random
+
+import fitz  # PyMuPDF
+from docx import Document
+
+FORMATS = ("txt", "docx", "pdf")
+LANGUAGES = ("fr", "en")
+# Nombre de blocs d'expérience par longueur de document
+LENGTHS = {"short": 1, "medium": 4, "long": 12}
+
+FIRST_NAMES = ["Alex", "Camille", "Sami", "Nora", "Yanis", "Lina", "Hugo", "Maya", "Adam", "Sara"]
+LAST_NAMES = ["Martin", "Benali", "Durand", "Haddad", "Moreau", "Rahmani", "Petit", "Lefebvre"]
+TECH_SKILLS = [
+    "Python", "SQL", "Java", "JavaScript", "TypeScript", "React", "Angular", "Docker", "Kubernetes",
+    "Git", "Linux", "Power BI", "Excel", "Tableau", "Spark", "Hadoop", "TensorFlow", "PyTorch",
+    "scikit-learn", "PostgreSQL", "MongoDB", "AWS", "Azure", "Jenkins", "Django", "Flask", "Spring Boot",
+]
+DOMAIN_SKILLS = {
+    "en": ["machine learning", "data analysis", "project management", "web development", "data visualization",
+           "cloud computing", "software testing", "network administration", "financial reporting"],
+    "fr": ["apprentissage automatique", "analyse de données", "gestion de projet", "développement web",
+           "visualisation de données", "informatique en nuage", "tests logiciels", "administration réseau",
+           "reporting financier"],
+}
+SOFT_SKILLS = {
+    "en": ["teamwork", "communication", "leadership", "time management", "problem solving", "adaptability"],
+    "fr": ["travail en équipe", "communication", "leadership", "gestion du temps", "résolution de problèmes",
+           "autonomie", "rigueur"],
+}
+SPOKEN_LANGUAGES = {
+    "en": ["English", "French", "Arabic", "Spanish", "German"],
+    "fr": ["Anglais", "Français", "Arabe", "Espagnol", "Allemand"],
+}
+LEVELS = {
+    "en": ["native", "fluent", "intermediate", "basic"],
+    "fr": ["langue maternelle", "courant", "intermédiaire", "notions"],
+}
+DEGREES = {
+    "en": ["Master in Computer Science", "Bachelor in Information Systems", "Engineering degree in Data Science"],
+    "fr": ["Master en informatique", "Licence professionnelle en systèmes d'information",
+           "Diplôme d'ingénieur en science des données"],
+}
+JOB_TITLES = {
+    "en": ["Data Analyst", "Software Engineer", "DevOps Engineer", "Web Developer", "Business Analyst"],
+    "fr": ["Analyste de données", "Ingénieur logiciel", "Ingénieur DevOps", "Développeur web", "Analyste métier"],
+}
+COMPANIES = ["Nordline", "Atlas Systems", "Bluepeak", "Datavera", "Orbitec", "Sunforge", "Kelvin Labs"]
+HEADINGS = {
+    "en": {"profile": "PROFILE", "experience": "PROFESSIONAL EXPERIENCE", "education": "EDUCATION",
+           "skills": "SKILLS", "soft_skills": "SOFT SKILLS", "languages": "LANGUAGES"},
+    "fr": {"profile": "PROFIL", "experience": "EXPÉRIENCE PROFESSIONNELLE", "education": "FORMATION",
+           "skills": "COMPÉTENCES", "soft_skills": "SAVOIR-ÊTRE", "languages": "LANGUES"},
+}
+EXPERIENCE_SENTENCES = {
+    "en": ["Designed and maintained {tech} pipelines for {domain}.",
+           "Led a team of {n} people on {domain} projects using {tech}.",
+           "Reduced processing time by {n}0% by migrating services to {tech}.",
+           "Built dashboards with {tech} to support {domain}."],
+    "fr": ["Conception et maintenance de pipelines {tech} pour {domain}.",
+           "Encadrement d'une équipe de {n} personnes sur des projets de {domain} avec {tech}.",
+           "Réduction du temps de traitement de {n}0 % par la migration des services vers {tech}.",
+           "Réalisation de tableaux de bord {tech} au service de {domain}."],
+}
+OFFER_INTRO = {
+    "en": "We are looking for a {title} to join our team at {company}.",
+    "fr": "Nous recherchons un(e) {title} pour rejoindre notre équipe chez {company}.",
+}
+OFFER_REQUIREMENT = {
+    "en": ["- Strong experience with {tech}", "- Knowledge of {domain}", "- Good {soft} skills",
+           "- {language} is required"],
+    "fr": ["- Solide expérience avec {tech}", "- Connaissance en {domain}", "- Qualités de {soft}",
+           "- Maîtrise de l'{language} exigée"],
+}
+
+
+def generate_cv(rng, language, blocks):
+    headings = HEADINGS[language]
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} - {rng.choice(JOB_TITLES[language])}", ""]
+    lines += [headings["profile"], rng.choice(EXPERIENCE_SENTENCES[language]).format(
+        tech=rng.choice(TECH_SKILLS), domain=rng.choice(DOMAIN_SKILLS[language]), n=rng.randint(2, 9)), ""]
+
+    lines.append(headings["experience"])
+    for _ in range(blocks):
+        start = rng.randint(2012, 2022)
+        lines.append(f"{rng.choice(JOB_TITLES[language])} - {rng.choice(COMPANIES)} ({start} - {start + rng.randint(1, 3)})")
+        for sentence in rng.sample(EXPERIENCE_SENTENCES[language], 3):
+            lines.append("• " + sentence.format(tech=rng.choice(TECH_SKILLS), domain=rng.choice(DOMAIN_SKILLS[language]),
+                                                n=rng.randint(2, 9)))
+    lines.append("")
+
+    start = rng.randint(2008, 2020)
+    lines += [headings["education"], f"{rng.choice(DEGREES[language])} ({start} - {start + 2})", ""]
+    lines += [headings["skills"], ", ".join(rng.sample(TECH_SKILLS, 6 + blocks)), ""]
+    lines += [headings["soft_skills"], ", ".join(rng.sample(SOFT_SKILLS[language], 3)), ""]
+    spoken = rng.sample(range(len(SPOKEN_LANGUAGES[language])), 2)
+    lines += [headings["languages"]] + [
+        f"{SPOKEN_LANGUAGES[language][i]} : {rng.choice(LEVELS[language])}" for i in spoken]
+    return "\n".join(lines) + "\n"
+
+
+def generate_offer(rng, language, blocks):
+    lines = [OFFER_INTRO[language].format(title=rng.choice(JOB_TITLES[language]).lower(), company=rng.choice(COMPANIES)), ""]
+    for _ in range(blocks + 2):
+        lines.append(rng.choice(OFFER_REQUIREMENT[language]).format(
+            tech=rng.choice(TECH_SKILLS), domain=rng.choice(DOMAIN_SKILLS[language]),
+            soft=rng.choice(SOFT_SKILLS[language]), language=rng.choice(SPOKEN_LANGUAGES[language]).lower()))
+    return "\n".join(lines) + "\n"
+
+
+def write_txt(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_docx(path, text):
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(path, text):
+    lines = text.splitlines()
+    with fitz.open() as document:
+        # 50 lignes par page A4 en Helvetica 10
+        for start in range(0, len(lines), 50):
+            page = document.new_page()
+            page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50),
+                                "\n".join(lines[start:start + 50]), fontsize=10, fontname="helv")
+        document.save(path)
+
+
+WRITERS = {"txt": write_txt, "docx": write_docx, "pdf": write_pdf}
+
+
+def generate_corpus(output, count=12, seed=0):
+    """
+    Génère count CV par couple (langue, longueur), chacun dans les trois formats,
+    et autant d'offres (texte brut, dans le manifeste).
+
+    Args:
+    - output (str): Dossier de sortie.
+    - count (int): Nombre de CV par langue et par longueur.
+    - seed (int): Graine du générateur aléatoire.
+
+    Returns:
+    - dict: Manifeste {"seed", "documents": [{"id", "language", "length", "files", "offer"}]},
+      aussi écrit dans output/manifest.json.
+    """
+    rng = random.Random(seed)
+    os.makedirs(output, exist_ok=True)
+    documents = []
+    for language in LANGUAGES:
+        for length, blocks in LENGTHS.items():
+            for index in range(count):
+                doc_id = f"cv_{language}_{length}_{index:03d}"
+                text = generate_cv(rng, language, blocks)
+                files = {}
+                for fmt in FORMATS:
+                    files[fmt] = f"{doc_id}.{fmt}"
+                    WRITERS[fmt](os.path.join(output, files[fmt]), text)
+                documents.append({
+                    "id": doc_id,
+                    "language": language,
+                    "length": length,
+                    "files": files,
+                    "offer": generate_offer(rng, language, blocks)
+                })
+
+    manifest = {"seed": seed, "count": count, "documents": documents}
+    with open(os.path.join(output, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def load_corpus(output, count=12, seed=0):
+    """
+    Charge le manifeste du corpus, en le (re)générant s'il manque ou si ses
+    paramètres diffèrent.
+    """
+    path = os.path.join(output, "manifest.json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("seed") == seed and manifest.get("count") == count:
+            return manifest
+    return generate_corpus(output, count=count, seed=seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un corpus synthétique de CV et d'offres (FR / EN).")
+    parser.add_argument("--output", default=os.path.join("benchmarks", "corpus"))
+    parser.add_argument("--count", type=int, default=12, help="CV par langue et par longueur.")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    manifest = generate_corpus(args.output, count=args.count, seed=args.seed)
+    print(f"{len(manifest['documents'])} CV x {len(FORMATS)} formats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Rapport précision / latence : knn_model (force brute scikit-learn) contre les
+index de utils/knn_index.py (exact "sparse", approché "svd").
+
+Pour chaque variante : accord avec knn_model, précision si un jeu étiqueté est
+fourni (JSONL {"text": ..., "label": nom de classe}), latence d'une prédiction
+unitaire (p50 / p95) et débit en lot.
+
+Usage :
+    python -m benchmarks.knn_index --model-folder . --labeled valid.jsonl
+    python -m benchmarks.knn_index --model-folder . --components 128 256
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+from joblib import load
+
+from benchmarks.corpus import load_corpus
+from utils.knn_index import build_knn_index
+
+
+def load_texts(args):
+    if args.labeled:
+        with open(args.labeled, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return [row["text"] for row in rows], [row["label"] for row in rows]
+    corpus = load_corpus(args.corpus, count=args.count)
+    texts = [document["offer"] for document in corpus["documents"]]
+    for document in corpus["documents"]:
+        with open(os.path.join(args.corpus, document["files"]["txt"]), encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts, None
+
+
+def measure(predictor, vect, runs):
+    single = []
+    for i in range(min(runs, vect.shape[0])):
+        start = time.perf_counter()
+        predictor.predict(vect[i])
+        single.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    predictions = predictor.predict(vect)
+    batch_time = time.perf_counter() - start
+    return predictions, {
+        "single_p50_ms": round(float(np.percentile(single, 50)) * 1000, 3),
+        "single_p95_ms": round(float(np.percentile(single, 95)) * 1000, 3),
+        "batch_docs_per_s": round(vect.shape[0] / batch_time, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Précision et latence des index KNN de domain_api.")
+    parser.add_argument("--model-folder", default=".")
+    parser.add_argument("--labeled", help="JSONL étiqueté {text, label} ; sinon corpus synthétique (accord seul).")
+    parser.add_argument("--corpus", default=os.path.join("benchmarks", "corpus"))
+    parser.add_argument("--count", type=int, default=4)
+    parser.add_argument("--components", nargs="+", type=int, default=[256], help="Dimensions SVD testées.")
+    parser.add_argument("--runs", type=int, default=200, help="Prédictions unitaires mesurées.")
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    knn_model = load(os.path.join(args.model_folder, "knn_model.joblib"))
+    vectorizer = load(os.path.join(args.model_folder, "tfidf_vectorizer.joblib"))
+    class_names = np.asarray(load(os.path.join(args.model_folder, "class_names.joblib")), dtype=object)
+    texts, labels = load_texts(args)
+    vect = vectorizer.transform(texts)
+
+    variants = [("knn_model", lambda: knn_model), ("sparse", lambda: build_knn_index(knn_model, "sparse"))]
+    variants += [(f"svd-{n}", lambda n=n: build_knn_index(knn_model, "svd", n_components=n)) for n in args.components]
+
+    reference = None
+    report = {"documents": vect.shape[0], "training_rows": knn_model._fit_X.shape[0], "variants": {}}
+    for name, build in variants:
+        start = time.perf_counter()
+        predictor = build()
+        build_time = time.perf_counter() - start
+        predictions, latency = measure(predictor, vect, args.runs)
+        if reference is None:
+            reference = predictions
+        result = {"build_s": round(build_time, 3), **latency,
+                  "agreement_with_knn_model": round(float(np.mean(predictions == reference)), 4)}
+        if labels is not None:
+            result["accuracy"] = round(float(np.mean(class_names[predictions] == np.asarray(labels, dtype=object))), 4)
+        report["variants"][name] = result
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
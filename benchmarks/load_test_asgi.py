@@ -0,0 +1,111 @@
+"""
+Comparaison de charge : Flask + gunicorn (workers sync) contre la variante
+ASGI (asgi_api:app servie par uvicorn), à nombre de workers égal.
+
+Pour chaque niveau de concurrence, le script mesure le débit (requêtes /
+seconde), les latences p50 / p95 et le nombre de réponses 503 renvoyées par
+la contre-pression de la variante ASGI.
+
+Usage :
+    python -m benchmarks.load_test_asgi --workers 2 --concurrency 4 16 64 --duration 30
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from benchmarks.load_test_workers import SAMPLE_CV, SAMPLE_OFFER, wait_for_port
+
+
+def server_command(server, workers, port):
+    if server == "gunicorn":
+        return [sys.executable, "-m", "gunicorn", "matching_api:app",
+                "--workers", str(workers), "--bind", f"127.0.0.1:{port}", "--timeout", "300"]
+    return [sys.executable, "-m", "uvicorn", "asgi_api:app",
+            "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)]
+
+
+def send_request(url):
+    start = time.perf_counter()
+    response = requests.post(
+        url,
+        files={"cv_file": ("cv.txt", SAMPLE_CV.encode("utf-8"), "text/plain")},
+        data={"job_text": SAMPLE_OFFER},
+        timeout=300
+    )
+    return response.status_code, time.perf_counter() - start
+
+
+def run_load(url, concurrency, duration):
+    deadline = time.time() + duration
+
+    def client(_):
+        results = []
+        while time.time() < deadline:
+            results.append(send_request(url))
+        return results
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = [result for client_results in executor.map(client, range(concurrency)) for result in client_results]
+    return results, time.perf_counter() - start
+
+
+def bench_server(server, args):
+    env = dict(os.environ)
+    env["WEB_CONCURRENCY"] = str(args.workers)
+    process = subprocess.Popen(server_command(server, args.workers, args.port), env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.port, args.startup_timeout)
+        url = f"http://127.0.0.1:{args.port}/match-profile"
+        for _ in range(args.workers * 2):
+            send_request(url)
+
+        reports = []
+        for concurrency in args.concurrency:
+            results, elapsed = run_load(url, concurrency, args.duration)
+            latencies = [latency for status, latency in results if status == 200]
+            reports.append({
+                "server": server,
+                "workers": args.workers,
+                "concurrency": concurrency,
+                "ok": len(latencies),
+                "rejected_503": sum(1 for status, _ in results if status == 503),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "latency_p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1) if latencies else None,
+                "latency_p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1) if latencies else None,
+            })
+        return reports
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Charge comparée : gunicorn sync contre la variante ASGI.")
+    parser.add_argument("--servers", nargs="+", default=["gunicorn", "uvicorn"], choices=["gunicorn", "uvicorn"])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[4, 16, 64])
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--startup-timeout", type=float, default=300)
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    results = [report for server in args.servers for report in bench_server(server, args)]
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Test de charge de /match-profile selon le nombre de workers gunicorn.
+
+Pour chaque nombre de workers (1, 2, 4, 8 par défaut), le script démarre
+gunicorn sur matching_api:app avec TORCH_NUM_THREADS = cœurs / workers, envoie
+des requêtes concurrentes pendant une durée fixe puis rapporte le débit
+(requêtes / seconde) et les latences p50 / p95.
+
+Les textes envoyés sont en anglais pour ne pas déclencher de traduction.
+
+Usage :
+    python -m benchmarks.load_test_workers --workers 1 2 4 8 --duration 30
+    python -m benchmarks.load_test_workers --threads 4 --inference-thread
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+SAMPLE_CV = """John Smith - Data Analyst
+Five years of experience in Python, SQL and data visualization with Power BI.
+Built machine learning models for customer churn prediction.
+Languages: English (fluent), French (intermediate).
+Soft skills: teamwork, communication, time management.
+"""
+
+SAMPLE_OFFER = """We are looking for a data analyst with strong Python and SQL skills.
+Experience with dashboards and machine learning is a plus.
+Good communication and teamwork are required. English is mandatory.
+"""
+
+
+def wait_for_port(port, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(("127.0.0.1", port)) == 0:
+                return
+        time.sleep(1)
+    raise TimeoutError(f"gunicorn n'écoute pas sur le port {port} après {timeout}s")
+
+
+def send_request(url):
+    start = time.perf_counter()
+    response = requests.post(
+        url,
+        files={"cv_file": ("cv.txt", SAMPLE_CV.encode("utf-8"), "text/plain")},
+        data={"job_text": SAMPLE_OFFER},
+        timeout=120
+    )
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+def run_load(url, concurrency, duration):
+    latencies = []
+    deadline = time.time() + duration
+
+    def client():
+        client_latencies = []
+        while time.time() < deadline:
+            client_latencies.append(send_request(url))
+        return client_latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for client_latencies in executor.map(lambda _: client(), range(concurrency)):
+            latencies.extend(client_latencies)
+    elapsed = time.perf_counter() - start
+    return latencies, elapsed
+
+
+def bench_workers(workers, args):
+    env = dict(os.environ)
+    env["WEB_CONCURRENCY"] = str(workers)
+    env["TORCH_NUM_THREADS"] = str(max(1, (os.cpu_count() or 1) // workers))
+    env["SBERT_INFERENCE_THREAD"] = "1" if args.inference_thread else "0"
+    command = [
+        sys.executable, "-m", "gunicorn", "matching_api:app",
+        "--workers", str(workers),
+        "--threads", str(args.threads),
+        "--bind", f"127.0.0.1:{args.port}",
+        "--timeout", "300",
+    ]
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_port(args.port, args.startup_timeout)
+        url = f"http://127.0.0.1:{args.port}/match-profile"
+        # Préchauffage : chaque worker charge ses modèles au premier appel
+        for _ in range(workers * 2):
+            send_request(url)
+
+        latencies, elapsed = run_load(url, args.concurrency, args.duration)
+        return {
+            "workers": workers,
+            "threads_per_worker": args.threads,
+            "torch_num_threads": int(env["TORCH_NUM_THREADS"]),
+            "inference_thread": args.inference_thread,
+            "requests": len(latencies),
+            "throughput_rps": round(len(latencies) / elapsed, 2),
+            "latency_p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 1),
+            "latency_p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 1),
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de /match-profile selon le nombre de workers gunicorn.")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--threads", type=int, default=1, help="Threads gunicorn par worker.")
+    parser.add_argument("--inference-thread", action="store_true", help="Active SBERT_INFERENCE_THREAD.")
+    parser.add_argument("--concurrency", type=int, default=16, help="Nombre de clients simultanés.")
+    parser.add_argument("--duration", type=float, default=30, help="Durée de mesure par configuration (s).")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--startup-timeout", type=float, default=300)
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    results = [bench_workers(workers, args) for workers in args.workers]
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+if __name__ == "__main__":
+    main()
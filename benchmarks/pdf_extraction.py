@@ -0,0 +1,135 @@
+"""
+Benchmark des extracteurs PDF : pdfminer (historique de SBERT et Skill2Vec)
+contre utils/pdf_text.py (blocs PyMuPDF, détection des colonnes).
+
+Les PDF du corpus synthétique (benchmarks/corpus.py) ont leur texte source en
+.txt ; une version deux colonnes de chaque CV est aussi générée (première
+moitié des lignes à gauche, seconde moitié à droite). Pour chaque extracteur :
+- débit (pages / s, documents / s) et latence p50 / p95 par document,
+- rappel des mots : part des mots du texte source retrouvés (multiensemble),
+- ordre de lecture : ratio difflib entre les suites de mots extraites et source.
+
+Usage :
+    python -m benchmarks.pdf_extraction --count 4 --output bench_pdf.json
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import textwrap
+import time
+from collections import Counter
+
+import fitz  # PyMuPDF
+import numpy as np
+
+from benchmarks.corpus import load_corpus
+
+
+def extract_pdfminer(path):
+    from pdfminer.high_level import extract_text
+
+    return extract_text(path)
+
+
+def extract_pymupdf(path):
+    from utils.pdf_text import lire_blocs_pdf, detecter_type_cv_blocs, assembler_texte
+
+    pages = lire_blocs_pdf(path)
+    return assembler_texte(pages, detecter_type_cv_blocs(pages))
+
+
+EXTRACTORS = {"pdfminer": extract_pdfminer, "pymupdf": extract_pymupdf}
+# Lignes par colonne des PDF deux colonnes
+COLUMN_LINES = 60
+
+
+def words(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def write_two_column_pdf(path, text):
+    """
+    Écrit le texte sur deux colonnes ; retourne le texte dans l'ordre de lecture attendu.
+    """
+    # Lignes coupées à la largeur d'une colonne : aucun débordement de cadre
+    lines = [wrapped for line in text.splitlines() for wrapped in textwrap.wrap(line, 42) or [""]]
+    with fitz.open() as document:
+        for start in range(0, len(lines), 2 * COLUMN_LINES):
+            left = lines[start:start + COLUMN_LINES]
+            right = lines[start + COLUMN_LINES:start + 2 * COLUMN_LINES]
+            page = document.new_page()
+            middle = page.rect.width / 2
+            # Marges de 2 cm : detecter_type_cv_blocs ignore les blocs à moins de 50 pt des bords
+            for rect, column in ((fitz.Rect(57, 50, middle - 10, page.rect.height - 40), left),
+                                 (fitz.Rect(middle + 10, 50, page.rect.width - 57, page.rect.height - 40), right)):
+                if page.insert_textbox(rect, "\n".join(column), fontsize=8, fontname="helv") < 0:
+                    raise ValueError(f"Colonne trop longue pour la page : {path}")
+        document.save(path)
+    return "\n".join(lines)
+
+
+def fidelity(extracted, source):
+    extracted_words, source_words = words(extracted), words(source)
+    overlap = sum((Counter(extracted_words) & Counter(source_words)).values())
+    return {
+        "word_recall": overlap / max(len(source_words), 1),
+        "reading_order": difflib.SequenceMatcher(None, extracted_words, source_words, autojunk=False).ratio(),
+    }
+
+
+def run(samples, extractor, repeat):
+    latencies, pages, recalls, orders = [], 0, [], []
+    for path, source in samples:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            text = extractor(path)
+            latencies.append(time.perf_counter() - start)
+        with fitz.open(path) as document:
+            pages += document.page_count * repeat
+        scores = fidelity(text, source)
+        recalls.append(scores["word_recall"])
+        orders.append(scores["reading_order"])
+    total = sum(latencies)
+    return {
+        "documents": len(samples),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+        "p95_ms": round(float(np.percentile(latencies, 95)) * 1000, 2),
+        "documents_per_s": round(len(latencies) / total, 1),
+        "pages_per_s": round(pages / total, 1),
+        "word_recall": round(float(np.mean(recalls)), 4),
+        "reading_order": round(float(np.mean(orders)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit et fidélité des extracteurs PDF.")
+    parser.add_argument("--corpus", default=os.path.join("benchmarks", "corpus"))
+    parser.add_argument("--count", type=int, default=4, help="CV par langue et par longueur.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Extractions mesurées par document.")
+    parser.add_argument("--extractors", nargs="+", default=list(EXTRACTORS), choices=list(EXTRACTORS))
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus, count=args.count, seed=args.seed)
+    layouts = {"1_colonne": [], "2_colonnes": []}
+    for document in corpus["documents"]:
+        with open(os.path.join(args.corpus, document["files"]["txt"]), encoding="utf-8") as f:
+            source = f.read()
+        layouts["1_colonne"].append((os.path.join(args.corpus, document["files"]["pdf"]), source))
+        two_column_path = os.path.join(args.corpus, f"{document['id']}.2col.pdf")
+        layouts["2_colonnes"].append((two_column_path, write_two_column_pdf(two_column_path, source)))
+
+    report = {layout: {name: run(samples, EXTRACTORS[name], args.repeat) for name in args.extractors}
+              for layout, samples in layouts.items()}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
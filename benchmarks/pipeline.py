@@ -0,0 +1,230 @@
+"""
+Benchmark reproductible du pipeline de matching, moteur par moteur.
+
+Le corpus synthétique (benchmarks/corpus.py) est généré ou relu à partir de
+son seed, puis chaque moteur est mesuré sur tous les documents :
+- parse : convert_to_text par format (txt, docx, pdf),
+- sbert : SBERTMatching.compute_similarity_from_texts,
+- skill2vec : Skill2VecMatching (annotation SkillNER des deux textes + similarité),
+- skillner : SkillExtractor.annotate,
+- extraction : extract_structured_elements,
+- domain_extraction / domain_prediction : domain_api.extraire_texte et predire_domaine,
+- end_to_end : POST /match-profile via le client de test Flask (cache des CV désactivé).
+
+La traduction est remplacée par un faux traducteur local (identité) : aucun
+appel réseau, et des mesures qui ne dépendent pas de Google Translate.
+
+Pour chaque moteur le rapport JSON donne le nombre de mesures, la moyenne, les
+latences p50 / p95 / p99 (ms) et le débit (documents / seconde), au global et
+par longueur de document, ainsi que la durée moyenne de chaque étape
+instrumentée (utils/tracing.py) pendant la passe end_to_end.
+
+Usage :
+    python -m benchmarks.pipeline --count 4 --output bench_pipeline.json
+    python -m benchmarks.pipeline --engines extraction skillner --baseline bench_pipeline.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+
+import numpy as np
+
+# Le cache des CV fausserait la passe end_to_end (un seul parsing par document)
+os.environ.setdefault("CV_CACHE_ENABLED", "0")
+
+import language_adapter
+from benchmarks.corpus import FORMATS, LENGTHS, load_corpus
+
+ENGINES = ["parse", "sbert", "skill2vec", "skillner", "extraction", "domain_extraction", "domain_prediction", "end_to_end"]
+
+
+class FakeTranslator:
+    """
+    Remplace deep_translator.GoogleTranslator : renvoie le texte inchangé.
+    """
+
+    def __init__(self, source="auto", target="en"):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        return text
+
+
+def install_fake_translator():
+    # language_adapter résout GoogleTranslator à chaque appel : le remplacer suffit
+    language_adapter.GoogleTranslator = FakeTranslator
+
+
+def summarize(latencies):
+    values = np.array(latencies)
+    return {
+        "count": len(values),
+        "mean_ms": round(float(values.mean()) * 1000, 3),
+        "p50_ms": round(float(np.percentile(values, 50)) * 1000, 3),
+        "p95_ms": round(float(np.percentile(values, 95)) * 1000, 3),
+        "p99_ms": round(float(np.percentile(values, 99)) * 1000, 3),
+        "throughput_per_s": round(len(values) / float(values.sum()), 2) if values.sum() > 0 else None,
+    }
+
+
+def measure(fn, cases, repeat):
+    """
+    Chronomètre fn(*args) pour chaque cas (longueur, args), après un appel de chauffe.
+
+    Returns:
+    - dict: Résumé global et par longueur de document.
+    """
+    if not cases:
+        return None
+    fn(*cases[0][1])
+    by_length = {}
+    for length, args in cases:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn(*args)
+            by_length.setdefault(length, []).append(time.perf_counter() - start)
+
+    report = summarize([latency for latencies in by_length.values() for latency in latencies])
+    report["by_length"] = {length: summarize(by_length[length]) for length in LENGTHS if length in by_length}
+    return report
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(args):
+    install_fake_translator()
+    corpus = load_corpus(args.corpus, count=args.count, seed=args.seed)
+    documents = corpus["documents"]
+
+    def path(document, fmt):
+        return os.path.join(args.corpus, document["files"][fmt])
+
+    from Sbert.utils.convert_to_text import convert_to_text
+    texts = {document["id"]: convert_to_text(path(document, "txt")) for document in documents}
+    results = {}
+
+    if "parse" in args.engines:
+        for fmt in FORMATS:
+            results[f"parse_{fmt}"] = measure(convert_to_text, [(d["length"], (path(d, fmt),)) for d in documents], args.repeat)
+
+    if "extraction" in args.engines:
+        from utils.extract_profile_elements import extract_structured_elements
+        results["extraction"] = measure(extract_structured_elements,
+                                        [(d["length"], (texts[d["id"]],)) for d in documents], args.repeat)
+
+    if "skillner" in args.engines:
+        from Skill2Vec.utils.extract_skills import skill_extractor
+        results["skillner"] = measure(skill_extractor.annotate, [(d["length"], (texts[d["id"]],)) for d in documents], args.repeat)
+
+    if {"sbert", "skill2vec", "end_to_end"} & set(args.engines):
+        import matching_api
+        from utils.tracing import registry
+
+        if "sbert" in args.engines:
+            results["sbert"] = measure(matching_api.sbert_matcher.compute_similarity_from_texts,
+                                       [(d["length"], (texts[d["id"]], d["offer"])) for d in documents], args.repeat)
+
+        if "skill2vec" in args.engines:
+            results["skill2vec"] = measure(matching_api.skill2vec_matcher.get_similarity_score,
+                                           [(d["length"], (texts[d["id"]], d["offer"])) for d in documents], args.repeat)
+
+        if "end_to_end" in args.engines:
+            client = matching_api.app.test_client()
+            uploads = {(d["id"], fmt): open(path(d, fmt), "rb").read() for d in documents for fmt in FORMATS}
+
+            def post(doc_id, fmt, offer):
+                response = client.post("/match-profile", data={
+                    "cv_file": (io.BytesIO(uploads[(doc_id, fmt)]), f"{doc_id}.{fmt}"),
+                    "job_text": offer
+                })
+                if response.status_code != 200:
+                    raise RuntimeError(f"/match-profile a répondu {response.status_code} pour {doc_id}.{fmt}")
+
+            with registry.lock:
+                registry.stages.clear()
+            results["end_to_end"] = measure(post, [(d["length"], (d["id"], fmt, d["offer"]))
+                                                   for d in documents for fmt in FORMATS], args.repeat)
+            with registry.lock:
+                results["end_to_end"]["stages"] = {
+                    stage: {"count": histogram.count, "mean_ms": round(histogram.sum / histogram.count * 1000, 3)}
+                    for stage, histogram in sorted(registry.stages.items()) if histogram.count
+                }
+
+    if {"domain_extraction", "domain_prediction"} & set(args.engines):
+        import domain_api
+
+        if "domain_extraction" in args.engines:
+            for fmt in FORMATS:
+                results[f"domain_extraction_{fmt}"] = measure(domain_api.extraire_texte,
+                                                              [(d["length"], (path(d, fmt),)) for d in documents], args.repeat)
+        if "domain_prediction" in args.engines:
+            results["domain_prediction"] = measure(domain_api.predire_domaine,
+                                                   [(d["length"], (texts[d["id"]],)) for d in documents], args.repeat)
+
+    return {
+        "metadata": {
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "documents": len(documents),
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results
+    }
+
+
+def compare(report, baseline):
+    """
+    Ratio des p50 / p95 entre le rapport courant et un rapport de référence
+    (> 1 : plus lent que la référence).
+    """
+    comparison = {}
+    for engine, current in report["results"].items():
+        previous = baseline.get("results", {}).get(engine)
+        if not current or not previous:
+            continue
+        comparison[engine] = {
+            f"{stat}_ratio": round(current[stat] / previous[stat], 3) if previous[stat] else None
+            for stat in ("p50_ms", "p95_ms")
+        }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reproductible du pipeline de matching, moteur par moteur.")
+    parser.add_argument("--corpus", default=os.path.join("benchmarks", "corpus"), help="Dossier du corpus synthétique.")
+    parser.add_argument("--count", type=int, default=4, help="CV par langue et par longueur.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Mesures par document.")
+    parser.add_argument("--engines", nargs="+", default=ENGINES, choices=ENGINES)
+    parser.add_argument("--baseline", help="Rapport JSON de référence à comparer.")
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark des backends d'inférence de SBERTMatching (torch, ONNX, ONNX int8).
+
+Chaque backend est mesuré dans un processus séparé afin que la mémoire (RSS)
+de l'un ne pollue pas celle de l'autre. Le script rapporte, par backend :
+- le temps de chargement du modèle,
+- la latence d'un encode unitaire (p50 / p95, en ms),
+- le débit d'un encode batché (textes / seconde),
+- le pic de mémoire résidente (Mo),
+- la similarité cosinus minimale avec les embeddings torch (tolérance documentée
+  dans Sbert/utils/onnx_backend.py).
+
+Les modèles ONNX absents de --onnx-path sont exportés avant les mesures.
+
+Usage :
+    python -m benchmarks.sbert_backends --model-path <modele> --onnx-path sbert_onnx
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKENDS = {
+    "torch": {"backend": "torch", "quantize": False},
+    "onnx": {"backend": "onnx", "quantize": False},
+    "onnx-int8": {"backend": "onnx", "quantize": True},
+}
+
+SAMPLE_TEXTS = [
+    "Data scientist with five years of experience in Python, SQL and machine learning.",
+    "Ingénieur logiciel spécialisé en Java, Spring Boot et architectures microservices.",
+    "We are looking for a project manager comfortable with agile methods and Jira.",
+    "Maîtrise des outils bureautiques, capacité d'analyse et aisance en communication.",
+    "Développement d'applications web avec React, Node.js et PostgreSQL.",
+    "Strong background in financial reporting, Excel modelling and budget planning.",
+    "Gestion d'équipe, relation client et suivi des indicateurs de performance.",
+    "Experience deploying deep learning models with Docker, Kubernetes and AWS.",
+]
+
+
+def percentile_ms(values, q):
+    return round(float(np.percentile(values, q)) * 1000, 2)
+
+
+def run_child(args):
+    from Sbert.SBERTMatching import SBERTMatching
+
+    config = BACKENDS[args.backend]
+    start = time.perf_counter()
+    matcher = SBERTMatching(
+        model_path=args.model_path,
+        backend=config["backend"],
+        onnx_path=args.onnx_path,
+        quantize=config["quantize"]
+    )
+    load_time = time.perf_counter() - start
+
+    # Préchauffage
+    matcher.model.encode(SAMPLE_TEXTS)
+
+    latencies = []
+    for i in range(args.runs):
+        text = SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]
+        start = time.perf_counter()
+        matcher.model.encode(text)
+        latencies.append(time.perf_counter() - start)
+
+    batch = SAMPLE_TEXTS * (args.batch_size // len(SAMPLE_TEXTS) + 1)
+    batch = batch[:args.batch_size]
+    start = time.perf_counter()
+    embeddings = matcher.model.encode(batch, batch_size=args.batch_size)
+    throughput = len(batch) / (time.perf_counter() - start)
+
+    np.save(args.embeddings_out, matcher.model.encode(SAMPLE_TEXTS, normalize_embeddings=True))
+
+    print(json.dumps({
+        "backend": args.backend,
+        "load_time_s": round(load_time, 3),
+        "latency_p50_ms": percentile_ms(latencies, 50),
+        "latency_p95_ms": percentile_ms(latencies, 95),
+        "throughput_texts_per_s": round(throughput, 2),
+        "batch_size": len(embeddings),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def run_parent(args):
+    from Sbert.utils.onnx_backend import ONNX_FP32_MIN_COSINE, ONNX_INT8_MIN_COSINE, export_onnx_model
+
+    if any(BACKENDS[backend]["backend"] == "onnx" for backend in args.backends):
+        export_onnx_model(args.model_path, args.onnx_path, quantize="onnx-int8" in args.backends)
+
+    results = []
+    embeddings = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend in args.backends:
+            embeddings_out = os.path.join(tmp_dir, f"{backend}.npy")
+            command = [
+                sys.executable, "-m", "benchmarks.sbert_backends", "--child",
+                "--backends", backend,
+                "--model-path", args.model_path,
+                "--onnx-path", args.onnx_path,
+                "--runs", str(args.runs),
+                "--batch-size", str(args.batch_size),
+                "--embeddings-out", embeddings_out,
+            ]
+            output = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+            embeddings[backend] = np.load(embeddings_out)
+
+    # Écart aux embeddings torch (vecteurs normalisés : le produit scalaire est le cosinus)
+    if "torch" in embeddings:
+        for result in results:
+            if result["backend"] == "torch":
+                continue
+            cosines = np.sum(embeddings["torch"] * embeddings[result["backend"]], axis=1)
+            min_cosine = float(cosines.min())
+            tolerance = ONNX_INT8_MIN_COSINE if result["backend"] == "onnx-int8" else ONNX_FP32_MIN_COSINE
+            result["min_cosine_vs_torch"] = round(min_cosine, 6)
+            result["within_tolerance"] = min_cosine >= tolerance
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des backends SBERT (torch / ONNX / ONNX int8).")
+    parser.add_argument("--model-path", required=True, help="Chemin du modèle Sentence-BERT fine-tuné.")
+    parser.add_argument("--onnx-path", default="sbert_onnx", help="Dossier du modèle exporté en ONNX.")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--runs", type=int, default=200, help="Nombre d'encodes unitaires mesurés.")
+    parser.add_argument("--batch-size", type=int, default=64, help="Taille du batch pour la mesure de débit.")
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--embeddings-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.backend = args.backends[0]
+        run_child(args)
+    else:
+        run_parent(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Couverture des compétences par les vecteurs Skill2Vec : vocabulaire seul du
+modèle Word2Vec (recherche historique skill in model.wv) contre table avec
+vecteurs composés des compétences en plusieurs mots
+(Skill2Vec/utils/skill_vectors.py).
+
+Le rapport donne :
+- pour les noms de SKILL_DB : part des compétences ayant un vecteur, et
+  méthode de composition (vocabulary, underscore, average, missing),
+- avec --corpus : les compétences extraites par SkillNER des CV du corpus
+  synthétique (benchmarks/corpus.py), distinctes et par occurrence, ayant un
+  vecteur avant / après, et les plus fréquentes restées sans vecteur.
+
+Usage :
+    python -m benchmarks.skill2vec_coverage --model-path <modele> --skill-db skill_db_relax_20.json --corpus benchmarks/corpus
+"""
+import argparse
+import json
+import os
+from collections import Counter
+
+from Skill2Vec.utils.skill_vectors import SkillVectors, load_skill_names, skill_vector_table, unit_vectors
+
+
+def coverage(names, keyed_vectors, table):
+    """
+    Args:
+    - names (list[str]): Noms de compétences en minuscules (avec répétitions éventuelles).
+
+    Returns:
+    - dict: Nombre de noms, part avec un vecteur dans le vocabulaire seul et dans la table.
+    """
+    return {
+        "count": len(names),
+        "vocabulary_only": round(sum(name in keyed_vectors for name in names) / max(len(names), 1), 4),
+        "with_phrases": round(sum(name in table for name in names) / max(len(names), 1), 4),
+    }
+
+
+def main():
+    from gensim.models import Word2Vec
+
+    parser = argparse.ArgumentParser(description="Couverture des compétences par les vecteurs Skill2Vec.")
+    parser.add_argument("--model-path", required=True, help="Modèle Word2Vec de Skill2Vec.")
+    parser.add_argument("--skill-db", help="SKILL_DB de SkillNER (JSON) ; chargé par SkillNER par défaut.")
+    parser.add_argument("--corpus", help="Corpus synthétique dont les CV sont passés à SkillNER.")
+    parser.add_argument("--count", type=int, default=4, help="CV par langue et par longueur.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    keyed_vectors = Word2Vec.load(args.model_path).wv
+    skill_names = load_skill_names(args.skill_db)
+    index_to_key, vectors, methods = skill_vector_table(keyed_vectors, skill_names)
+    table = SkillVectors(*unit_vectors(vectors), index_to_key)
+    distinct_names = sorted({name.lower() for name in skill_names})
+    report = {"skill_db": {**coverage(distinct_names, keyed_vectors, table), "methods": methods}}
+
+    if args.corpus:
+        from benchmarks.corpus import load_corpus
+        from Skill2Vec.utils.extract_skills import extract_skills
+
+        corpus = load_corpus(args.corpus, count=args.count, seed=args.seed)
+        mentions = []
+        for document in corpus["documents"]:
+            with open(os.path.join(args.corpus, document["files"]["txt"]), encoding="utf-8") as f:
+                # Une occurrence par compétence et par CV, comme Skill2VecMatching.process_skills
+                mentions.extend({skill["skill_name"].lower() for skill in extract_skills(f.read())})
+        missing = Counter(name for name in mentions if name not in table)
+        report["extracted"] = {
+            "documents": len(corpus["documents"]),
+            "distinct": coverage(sorted(set(mentions)), keyed_vectors, table),
+            "mentions": coverage(mentions, keyed_vectors, table),
+            "top_missing": missing.most_common(20),
+        }
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark du chargement des vecteurs Skill2Vec : modèle Word2Vec complet contre
+export projeté en mémoire (Skill2Vec/utils/skill_vectors.py, float32 / float16).
+
+Chaque variante est mesurée dans un processus séparé afin que la mémoire (RSS)
+de l'une ne pollue pas celle de l'autre. Le script rapporte, par variante :
+- le temps de chargement,
+- le débit des recherches de vecteurs (mots / seconde),
+- le pic de mémoire résidente (Mo),
+- l'écart maximal des scores skillset_similarity avec ceux du modèle complet.
+
+Les exports sont créés dans --vectors-path s'ils n'existent pas.
+
+Usage :
+    python -m benchmarks.skill_vectors --model-path <modele> --vectors-path skill2vec_vectors
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+VARIANTS = ["model", "float32", "float16"]
+
+
+def load_vectors(variant, model_path, vectors_path):
+    if variant == "model":
+        from gensim.models import Word2Vec
+
+        return Word2Vec.load(model_path).wv
+    from Skill2Vec.utils.skill_vectors import load_skill_vectors
+
+    return load_skill_vectors(os.path.join(vectors_path, variant))
+
+
+def word_count(variant, vectors, vectors_path):
+    # Mots du modèle en tête de l'export, avant les compétences composées
+    if variant == "model":
+        return len(vectors.index_to_key)
+    from Skill2Vec.utils.skill_vectors import MANIFEST_FILE
+
+    with open(os.path.join(vectors_path, variant, MANIFEST_FILE), encoding="utf-8") as f:
+        return json.load(f).get("words", len(vectors.index_to_key))
+
+
+def run_child(args):
+    from Skill2Vec.utils.skill2vec_matching import get_skill_vector, skillset_similarity
+
+    start = time.perf_counter()
+    vectors = load_vectors(args.variant, args.model_path, args.vectors_path)
+    load_time = time.perf_counter() - start
+
+    # Mêmes mots dans chaque processus : vocabulaire du modèle tiré avec une graine fixe
+    rng = np.random.default_rng(args.seed)
+    vocabulary = list(vectors.index_to_key[:word_count(args.variant, vectors, args.vectors_path)])
+    words = [vocabulary[i] for i in rng.integers(0, len(vocabulary), args.lookups)]
+    start = time.perf_counter()
+    for word in words:
+        get_skill_vector(word, vectors)
+    lookups_per_s = len(words) / (time.perf_counter() - start)
+
+    skillsets = [[vocabulary[i] for i in rng.integers(0, len(vocabulary), 10)] for _ in range(args.pairs + 1)]
+    scores = [skillset_similarity(a, b, vectors) for a, b in zip(skillsets, skillsets[1:])]
+    np.save(args.scores_out, np.array(scores, dtype=np.float64))
+
+    print(json.dumps({
+        "variant": args.variant,
+        "load_time_s": round(load_time, 3),
+        "lookups_per_s": round(lookups_per_s),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def run_parent(args):
+    from Skill2Vec.utils.skill_vectors import MANIFEST_FILE
+
+    # Exports manquants créés par la CLI, dans un processus séparé : le pic de mémoire
+    # (ru_maxrss) du parent est hérité par les processus de mesure
+    for variant in args.variants:
+        if variant != "model" and not os.path.exists(os.path.join(args.vectors_path, variant, MANIFEST_FILE)):
+            subprocess.run([sys.executable, "-m", "Skill2Vec.utils.skill_vectors", "--model-path", args.model_path,
+                            "--output", os.path.join(args.vectors_path, variant), "--dtype", variant],
+                           check=True, stdout=subprocess.DEVNULL)
+
+    results = []
+    scores = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for variant in args.variants:
+            scores_out = os.path.join(tmp_dir, f"{variant}.npy")
+            command = [
+                sys.executable, "-m", "benchmarks.skill_vectors", "--child",
+                "--variants", variant,
+                "--model-path", args.model_path,
+                "--vectors-path", args.vectors_path,
+                "--lookups", str(args.lookups),
+                "--pairs", str(args.pairs),
+                "--seed", str(args.seed),
+                "--scores-out", scores_out,
+            ]
+            output = subprocess.run(command, check=True, stdout=subprocess.PIPE, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+            scores[variant] = np.load(scores_out)
+
+    if "model" in scores:
+        for result in results:
+            result["max_score_diff_vs_model"] = float(np.abs(scores[result["variant"]] - scores["model"]).max())
+
+    report = json.dumps(results, indent=2)
+    print(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chargement des vecteurs Skill2Vec : modèle complet contre export mmap.")
+    parser.add_argument("--model-path", required=True, help="Modèle Word2Vec de Skill2Vec.")
+    parser.add_argument("--vectors-path", default="skill2vec_vectors", help="Dossier des exports, un sous-dossier par type.")
+    parser.add_argument("--variants", nargs="+", default=VARIANTS, choices=VARIANTS)
+    parser.add_argument("--lookups", type=int, default=100000, help="Recherches de vecteurs mesurées.")
+    parser.add_argument("--pairs", type=int, default=500, help="Paires d'ensembles de compétences comparées.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--scores-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        args.variant = args.variants[0]
+        run_child(args)
+    else:
+        run_parent(args)
+
+
+if __name__ == "__main__":
+    main()
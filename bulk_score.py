@@ -0,0 +1,374 @@
+"""
+Scoring hors ligne de paires (CV, offre) en masse, sans passer par l'API Flask.
+
+Les paires viennent :
+- d'un fichier JSONL : une paire par ligne, {"id": ..., "cv": ..., "offer": ...}
+  où "cv" et "offer" sont un chemin de fichier (.pdf, .docx, .txt) ou du texte brut
+  ("id" est facultatif : numéro de ligne par défaut) ;
+- ou de deux dossiers (--cv-dir, --offer-dir) : toutes les combinaisons CV × offre.
+
+Chaque document unique est extrait, traduit, annoté et encodé une seule fois
+par shard ; les scores reprennent les moteurs et la pondération de
+matching_api (SBERT en mode document).
+
+Un document illisible (fichier corrompu, échec d'un moteur) n'arrête pas le
+shard : chacune de ses paires donne une ligne {"id", "error"}, journalisée
+comme les autres, et le reste du lot est scoré.
+
+Les paires sont réparties entre --shards processus selon le CV (un CV n'est
+traité que par un shard). Chaque shard écrit ses résultats au fil de l'eau
+(JSONL, ou Parquet par lots) et journalise les paires terminées : relancer la
+même commande reprend là où le traitement s'était arrêté. Une paire écrite
+juste avant un arrêt brutal peut être réécrite à la reprise (dédoublonner
+sur "id").
+
+Usage :
+    python bulk_score.py --pairs paires.jsonl --output resultats/ --shards 4
+    python bulk_score.py --cv-dir cvs/ --offer-dir offres/ --output resultats/ --format parquet
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import sys
+import time
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from utils.extract_profile_elements import extract_structured_elements
+from utils.extraction_score import compute_extraction_scores
+from utils.fusion import fuse_scores, VERDICTS
+from utils.process_pool import mark_pool_worker
+
+DOCUMENT_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+
+# 📥 Lecture des paires
+def list_documents(directory):
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(DOCUMENT_EXTENSIONS):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+
+def iter_pairs(args):
+    """
+    Produit les paires (id, référence du CV, référence de l'offre).
+    """
+    if args.pairs:
+        with open(args.pairs, encoding="utf-8") as f:
+            for line_number, line in enumerate(f):
+                if not line.strip():
+                    continue
+                pair = json.loads(line)
+                yield str(pair.get("id", line_number)), pair["cv"], pair["offer"]
+    else:
+        offers = list_documents(args.offer_dir)
+        for cv_path in list_documents(args.cv_dir):
+            cv_name = os.path.relpath(cv_path, args.cv_dir)
+            for offer_path in offers:
+                yield f"{cv_name}::{os.path.relpath(offer_path, args.offer_dir)}", cv_path, offer_path
+
+
+def shard_of(cv_ref, shards):
+    # crc32 plutôt que hash() : stable d'un processus à l'autre
+    return zlib.crc32(cv_ref.encode("utf-8")) % shards
+
+
+# 🧠 Artefacts des documents uniques (texte, traduction, compétences, éléments, embedding)
+class DocumentStore:
+    """
+    Artefacts des documents déjà traités, bornés à max_documents (LRU).
+    """
+
+    def __init__(self, matching_api, max_documents=100000, batch_size=64):
+        self.api = matching_api
+        self.max_documents = max_documents
+        self.batch_size = batch_size
+        self.documents = OrderedDict()
+        self.processed = 0
+
+    def load_text(self, ref, kind):
+        is_file = os.path.isfile(ref) and ref.lower().endswith(DOCUMENT_EXTENSIONS)
+        text = self.api.sbert_matcher.process_input(ref) if is_file else ref
+        # Même traitement que la route : seule l'offre est prétraitée
+        return self.api.preprocess(text) if kind == "offer" else text
+
+    def prepare(self, refs):
+        """
+        Calcule les artefacts des documents absents ; refs : liste de (clé, référence, type).
+        Les embeddings SBERT sont calculés en un appel batché. Un document en échec
+        est gardé sous la forme {"error": ...}.
+        """
+        missing = {}
+        for key, ref, kind in refs:
+            if key in self.documents:
+                self.documents.move_to_end(key)
+            else:
+                missing.setdefault(key, (ref, kind))
+        if not missing:
+            return
+
+        artifacts = []
+        for key, (ref, kind) in missing.items():
+            try:
+                text = self.load_text(ref, kind)
+                language, translated = self.api.translate_text(text)
+                artifacts.append((key, {
+                    "language": language,
+                    "translated_text": translated,
+                    "skills": self.api.skill2vec_matcher.extract_skills_from_text(text),
+                    "structured": extract_structured_elements(text)
+                }))
+            except Exception as e:
+                self.documents[key] = {"error": describe_error(e)}
+
+        embeddings = self.encode([document["translated_text"] for _, document in artifacts])
+        for (key, document), embedding in zip(artifacts, embeddings):
+            if isinstance(embedding, Exception):
+                document = {"error": describe_error(embedding)}
+            else:
+                document["sbert_embedding"] = embedding
+            self.documents[key] = document
+        self.processed += len(missing)
+
+    def encode(self, texts):
+        """
+        Embeddings SBERT des textes ; si l'appel batché échoue, texte par texte,
+        l'exception tenant lieu d'embedding pour les textes en échec.
+        """
+        if not texts:
+            return []
+        try:
+            return list(self.api.sbert_matcher.encode(texts, batch_size=self.batch_size).cpu().numpy())
+        except Exception:
+            embeddings = []
+            for text in texts:
+                try:
+                    embeddings.append(self.api.sbert_matcher.encode([text]).cpu().numpy()[0])
+                except Exception as e:
+                    embeddings.append(e)
+            return embeddings
+
+    def trim(self):
+        # Appelé après le scoring du lot : ses documents restent disponibles jusque-là
+        while len(self.documents) > self.max_documents:
+            self.documents.popitem(last=False)
+
+    def __getitem__(self, key):
+        return self.documents[key]
+
+
+def describe_error(error):
+    return f"{type(error).__name__}: {error}"
+
+
+def pair_error(cv, offer):
+    if "error" in cv:
+        return f"cv: {cv['error']}"
+    if "error" in offer:
+        return f"offer: {offer['error']}"
+    return None
+
+
+def engine_scores(api, cv, offer):
+    return (
+        api.sbert_matcher.compute_similarity_from_embeddings(cv["sbert_embedding"], offer["sbert_embedding"]),
+        float(api.skill2vec_matcher.calculate_similarity(cv["skills"], offer["skills"]))
+    )
+
+
+def extraction_scores(batch, scored):
+    """
+    Scores d'extraction des paires scorées, par offre : les clés de chaque offre
+    ne sont calculées qu'une fois pour tous ses CV du lot.
+    """
+    by_offer = {}
+    for index, (position, _, _) in enumerate(scored):
+        by_offer.setdefault(batch[position][2], []).append(index)
+    scores = np.empty(len(scored))
+    for indices in by_offer.values():
+        offer = scored[indices[0]][2]
+        scores[indices] = compute_extraction_scores([scored[i][1]["structured"] for i in indices], offer["structured"])
+    return scores
+
+
+def score_batch(api, store, batch):
+    """
+    Scores SBERT et Skill2Vec paire par paire, scores d'extraction par offre, puis
+    fusion vectorisée sur tout le lot. Une paire dont un document est en échec
+    donne une ligne {"id", "error"}.
+    """
+    rows = []
+    scored = []
+    for pair_id, cv_ref, offer_ref in batch:
+        cv, offer = store[f"cv:{cv_ref}"], store[f"offer:{offer_ref}"]
+        error = pair_error(cv, offer)
+        rows.append({"id": pair_id, "error": error} if error else None)
+        if not error:
+            scored.append((len(rows) - 1, cv, offer))
+
+    scores = np.column_stack([
+        np.array([engine_scores(api, cv, offer) for _, cv, offer in scored], dtype=np.float64).reshape(-1, 2),
+        extraction_scores(batch, scored)
+    ])
+    finals, verdicts = fuse_scores(scores[:, 0], scores[:, 1], scores[:, 2])
+    for (position, _, _), final, verdict, (sbert, skill2vec, extraction) in zip(
+            scored, finals.tolist(), verdicts.tolist(), scores.tolist()):
+        rows[position] = {
+            "id": batch[position][0],
+            "score": int(final * 100),
+            "verdict": VERDICTS[verdict],
+            "score_sbert": round(sbert, 4),
+            "score_skill2vec": round(skill2vec, 4),
+            "score_extraction": extraction
+        }
+    return rows
+
+
+# 💾 Écriture incrémentale des résultats
+class ResultWriter:
+    def __init__(self, output, shard, output_format):
+        self.output_format = output_format
+        self.prefix = os.path.join(output, f"shard-{shard:03d}")
+        if output_format == "parquet":
+            import pandas  # noqa: F401  (pyarrow requis pour to_parquet)
+            self.part = len([name for name in os.listdir(output)
+                             if name.startswith(f"shard-{shard:03d}-part-") and name.endswith(".parquet")])
+        else:
+            self.file = open(f"{self.prefix}.jsonl", "a", encoding="utf-8")
+
+    def write(self, rows):
+        if self.output_format == "parquet":
+            import pandas
+            path = f"{self.prefix}-part-{self.part:05d}.parquet"
+            pandas.DataFrame(rows).to_parquet(f"{path}.tmp", index=False)
+            os.replace(f"{path}.tmp", path)
+            self.part += 1
+        else:
+            for row in rows:
+                self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+            self.file.flush()
+
+    def close(self):
+        if self.output_format != "parquet":
+            self.file.close()
+
+
+def read_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+# ⚙️ Traitement d'un shard
+def run_shard(shard, args, progress=None):
+    if progress is not None:
+        # Shard lancé dans son propre processus : PDF extraits sans pool imbriqué
+        mark_pool_worker()
+    import matching_api
+
+    checkpoint_path = os.path.join(args.output, f"shard-{shard:03d}.done")
+    done = read_checkpoint(checkpoint_path)
+    store = DocumentStore(matching_api, max_documents=args.max_documents, batch_size=args.encode_batch_size)
+    writer = ResultWriter(args.output, shard, args.format)
+    scored = 0
+
+    def flush(batch):
+        nonlocal scored
+        store.prepare([(f"cv:{cv_ref}", cv_ref, "cv") for _, cv_ref, _ in batch] +
+                      [(f"offer:{offer_ref}", offer_ref, "offer") for _, _, offer_ref in batch])
+        rows = score_batch(matching_api, store, batch)
+        store.trim()
+        writer.write(rows)
+        # Journal écrit après les résultats : au pire une paire est réécrite à la reprise
+        with open(checkpoint_path, "a", encoding="utf-8") as log:
+            log.write("".join(f"{pair_id}\n" for pair_id, _, _ in batch))
+        scored += len(batch)
+        if progress is not None:
+            progress.put((shard, scored, store.processed))
+
+    batch = []
+    for pair_id, cv_ref, offer_ref in iter_pairs(args):
+        if shard_of(cv_ref, args.shards) != shard or pair_id in done:
+            continue
+        batch.append((pair_id, cv_ref, offer_ref))
+        if len(batch) >= args.batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    writer.close()
+    if progress is not None:
+        progress.put((shard, scored, store.processed))
+    return scored, store.processed
+
+
+def report(start, shard_progress):
+    pairs = sum(scored for scored, _ in shard_progress.values())
+    documents = sum(processed for _, processed in shard_progress.values())
+    elapsed = time.perf_counter() - start
+    print(f"{pairs} paires, {documents} documents traités, {pairs / elapsed:.1f} paires/s ({elapsed:.0f}s)",
+          file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring hors ligne de paires (CV, offre).")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--pairs", help="Fichier JSONL des paires.")
+    source.add_argument("--cv-dir", help="Dossier des CV (combiné avec --offer-dir).")
+    parser.add_argument("--offer-dir", help="Dossier des offres.")
+    parser.add_argument("--output", required=True, help="Dossier des résultats et des journaux de reprise.")
+    parser.add_argument("--format", default="jsonl", choices=["jsonl", "parquet"])
+    parser.add_argument("--shards", type=int, default=1, help="Nombre de processus.")
+    parser.add_argument("--batch-size", type=int, default=256, help="Paires par lot écrit.")
+    parser.add_argument("--encode-batch-size", type=int, default=64, help="Textes par appel SBERT.")
+    parser.add_argument("--max-documents", type=int, default=100000, help="Documents gardés en mémoire par shard.")
+    parser.add_argument("--report-every", type=float, default=10.0, help="Secondes entre deux rapports de débit.")
+    args = parser.parse_args()
+    if args.cv_dir and not args.offer_dir:
+        parser.error("--cv-dir nécessite --offer-dir")
+
+    os.makedirs(args.output, exist_ok=True)
+    start = time.perf_counter()
+
+    if args.shards == 1:
+        scored, processed = run_shard(0, args)
+        report(start, {0: (scored, processed)})
+        return
+
+    # spawn : chaque shard charge ses propres modèles (pas de fork après torch)
+    context = multiprocessing.get_context("spawn")
+    progress = context.Queue()
+    workers = [context.Process(target=run_shard, args=(shard, args, progress)) for shard in range(args.shards)]
+    for worker in workers:
+        worker.start()
+
+    shard_progress = {shard: (0, 0) for shard in range(args.shards)}
+    last_report = time.perf_counter()
+    while any(worker.is_alive() for worker in workers) or not progress.empty():
+        try:
+            shard, scored, processed = progress.get(timeout=1)
+            shard_progress[shard] = (scored, processed)
+        except queue.Empty:
+            pass
+        if time.perf_counter() - last_report >= args.report_every:
+            report(start, shard_progress)
+            last_report = time.perf_counter()
+
+    for worker in workers:
+        worker.join()
+    report(start, shard_progress)
+    failed = [shard for shard, worker in enumerate(workers) if worker.exitcode != 0]
+    if failed:
+        sys.exit(f"Shards en échec : {failed} (relancer la commande pour reprendre)")
+
+
+if __name__ == "__main__":
+    main()
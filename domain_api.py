@@ -1,39 +1,40 @@
 import os
-from flask import Flask, request, jsonify
+import time
+import hashlib
+from flask import Flask, request, jsonify, g
 from werkzeug.utils import secure_filename
-from joblib import load
-import fitz  # PyMuPDF
-from utils import nettoyer_texte
-from collections import Counter
-
-# 📂 Configuration
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
-MODEL_FOLDER = BASE_DIR  # Tous les modèles sont dans Detect_Domain
-ALLOWED_EXTENSIONS = {"pdf"}
-
-# 🔁 Chargement des modèlesimport os
-from flask import Flask, request, jsonify
-from werkzeug.utils import secure_filename
-from joblib import load
-import fitz  # PyMuPDF
 from docx import Document
-from utils import nettoyer_texte
-from collections import Counter
+from utils.nettoyage import nettoyer_texte, nettoyer_fichier
+from utils import pdf_text
+from utils.profiling import profiled
+from utils.domain_models import load_domain_bundle, load_model_files
+import numpy as np
 
 # 📂 Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
-MODEL_FOLDER = BASE_DIR
+MODEL_FOLDER = BASE_DIR  # Tous les modèles sont dans Detect_Domain
 ALLOWED_EXTENSIONS = {"pdf", "docx", "txt"}
-
-# 🔁 Chargement des modèles
-svm_model = load(os.path.join(MODEL_FOLDER, "https://drive.google.com/uc?export=download&id=11JYM7STbtJ3yJUSI-qfnH0huPUkckuLF"))
-knn_model = load(os.path.join(MODEL_FOLDER, "https://drive.google.com/uc?export=download&id=1RBGlw_7FOVQbYBnrzyJZzekvzdUUbpVE"))
-rf_model = load(os.path.join(MODEL_FOLDER, "https://drive.google.com/uc?export=download&id=11RKWrxTjsOh-S8qKDDZJhqXEJB3k6g6O"))
-dt_model = load(os.path.join(MODEL_FOLDER, "https://drive.google.com/uc?export=download&id=1t-hEyCez5u-3C9PaKIhX_tHFvAbqBf87"))
-vectorizer = load(os.path.join(MODEL_FOLDER, "https://drive.google.com/uc?export=download&id=1AHyGNsnPg-awgl4oszXM1eGJtJ1pcvxa"))
-class_names = load(os.path.join(MODEL_FOLDER, "https://drive.google.com/uc?export=download&id=1JY_EVrCEr0qlmLXNTh8-XOxX1yTtbpdA"))
+# Nombre maximal de pages lues par PDF (0 : toutes)
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", "0"))
+# Nombre maximal de fichiers par requête /detect-domain-batch
+DOMAIN_BATCH_MAX_FILES = int(os.environ.get("DOMAIN_BATCH_MAX_FILES", "100"))
+# Index de voisins (knn_index.joblib, voir utils/knn_index.py) à la place de knn_model s'il existe
+DOMAIN_KNN_INDEX = os.environ.get("DOMAIN_KNN_INDEX", "1") == "1"
+# Projection mémoire des tableaux du paquet de modèles ("r" : partagés entre workers, "" : copie)
+DOMAIN_MODELS_MMAP = os.environ.get("DOMAIN_MODELS_MMAP", "r")
+
+# 🔁 Chargement des modèles : artefact unique (utils/domain_models.py) s'il existe,
+# sinon les fichiers joblib séparés
+bundle = load_domain_bundle(MODEL_FOLDER, mmap_mode=DOMAIN_MODELS_MMAP or None)
+models, models_manifest = bundle if bundle is not None else (load_model_files(MODEL_FOLDER), None)
+svm_model = models["svm_model"]
+knn_model = models["knn_model"]
+rf_model = models["rf_model"]
+dt_model = models["dt_model"]
+vectorizer = models["vectorizer"]
+class_names = models["class_names"]
+knn_predictor = (models["knn_index"] if DOMAIN_KNN_INDEX else None) or knn_model
 
 app = Flask(__name__)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
@@ -42,42 +43,17 @@ app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# 📄 Lecture unique du PDF : blocs de texte et largeur de chaque page (utils/pdf_text.py)
+def lire_blocs_pdf(filepath, max_pages=None):
+    return pdf_text.lire_blocs_pdf(filepath, PDF_MAX_PAGES if max_pages is None else max_pages)
+
 # 🔍 Détection du type de mise en page PDF
 def detecter_type_cv(filepath):
-    with fitz.open(filepath) as doc:
-        for page in doc:
-            blocs = page.get_text("blocks", sort=True)
-            positions_x = [bloc[0] for bloc in blocs]
-            largeur_page = page.rect.width
-            positions_x_filtrees = [x for x in positions_x if 50 < x < largeur_page - 50]
-            if not positions_x_filtrees:
-                continue
-            ecarts_x = [abs(positions_x_filtrees[i+1] - positions_x_filtrees[i]) for i in range(len(positions_x_filtrees)-1)]
-            if ecarts_x and max(ecarts_x) > largeur_page / 2.5:
-                return "2_colonnes"
-    return "1_colonne"
+    return pdf_text.detecter_type_cv_blocs(lire_blocs_pdf(filepath))
 
 # 📄 Extraction depuis PDF
-def extraire_depuis_pdf(filepath):
-    type_cv = detecter_type_cv(filepath)
-    texte = ""
-    with fitz.open(filepath) as doc:
-        for page in doc:
-            blocs = page.get_text("blocks", sort=True)
-            largeur_page = page.rect.width
-            if type_cv == "2_colonnes":
-                blocs_gauche = []
-                blocs_droite = []
-                for bloc in blocs:
-                    x0 = bloc[0]
-                    if x0 < largeur_page / 2:
-                        blocs_gauche.append(bloc[4])
-                    else:
-                        blocs_droite.append(bloc[4])
-                texte += '\n'.join(blocs_gauche + blocs_droite) + "\n"
-            else:
-                for bloc in blocs:
-                    texte += bloc[4] + "\n"
+def extraire_depuis_pdf(filepath, max_pages=None):
+    texte = pdf_text.extraire_texte_pdf(filepath, PDF_MAX_PAGES if max_pages is None else max_pages)
     return nettoyer_texte(texte)
 
 # 📄 Extraction depuis DOCX
@@ -86,11 +62,9 @@ def extraire_depuis_docx(filepath):
     texte = "\n".join([para.text for para in doc.paragraphs])
     return nettoyer_texte(texte)
 
-# 📄 Extraction depuis TXT
+# 📄 Extraction depuis TXT : lecture et nettoyage par morceaux, bornés à TEXT_MAX_CHARS
 def extraire_depuis_txt(filepath):
-    with open(filepath, "r", encoding="utf-8") as f:
-        texte = f.read()
-    return nettoyer_texte(texte)
+    return nettoyer_fichier(filepath)
 
 # 🧠 Extraction du texte selon le type
 def extraire_texte(filepath):
@@ -104,13 +78,46 @@ def extraire_texte(filepath):
     else:
         return ""
 
+# 🔎 Prédiction des domaines d'un lot de textes : une matrice TF-IDF, un predict par modèle
+def predire_domaines(textes):
+    vect = vectorizer.transform(textes)
+    noms = np.asarray(class_names, dtype=object)
+
+    # Votants dans l'ordre SVM, KNN, RandomForest, DecisionTree (ordre du départage)
+    predictions = np.stack([
+        noms[svm_model.predict(vect)],
+        noms[knn_predictor.predict(vect)],
+        noms[rf_model.predict(vect)],
+        noms[dt_model.predict(vect)]
+    ])
+
+    # 🧠 Consensus ou fallback, vectorisé : voix de chaque votant, puis premier votant
+    # ayant le maximum de voix (même départage que Counter.most_common)
+    _, codes = np.unique(predictions, return_inverse=True)
+    codes = codes.reshape(predictions.shape)
+    voix = (codes[:, None, :] == codes[None, :, :]).sum(axis=1)
+    voix_max = voix.max(axis=0)
+    gagnant = np.argmax(voix == voix_max, axis=0)
+    colonnes = np.arange(predictions.shape[1])
+
+    return [
+        predictions[gagnant[i], i] if voix_max[i] >= 2 else f"{predictions[2, i]} / {predictions[1, i]}"
+        for i in colonnes
+    ]
+
+# 🔎 Prédiction du domaine : vote des quatre modèles, repli RF / KNN sans majorité
+def predire_domaine(texte_global):
+    return predire_domaines([texte_global])[0]
+
 # 🚀 API : détection du domaine
 @app.route("/detect-domain", methods=["POST"])
+@profiled("detect-domain")
 def detect_domain():
-    if "cv_file" not in request.files:
+    # "cv_pdf" : nom historique du champ, "cv_file" : même nom que /match-profile
+    file = request.files.get("cv_pdf") or request.files.get("cv_file")
+    if file is None:
         return jsonify({"error": "No file uploaded"}), 400
 
-    file = request.files["cv_file"]
     if not allowed_file(file.filename):
         return jsonify({"error": "Invalid file type"}), 400
 
@@ -119,117 +126,54 @@ def detect_domain():
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
     file.save(path)
 
+    start = time.perf_counter()
     texte_global = extraire_texte(path)
-    vect = vectorizer.transform([texte_global])
-
-    predictions = {
-        "SVM": class_names[svm_model.predict(vect)[0]],
-        "KNN": class_names[knn_model.predict(vect)[0]],
-        "RandomForest": class_names[rf_model.predict(vect)[0]],
-        "DecisionTree": class_names[dt_model.predict(vect)[0]]
-    }
-
-    counts = Counter(predictions.values())
-    if counts.most_common(1)[0][1] >= 2:
-        domaine_final = counts.most_common(1)[0][0]
-    else:
-        rf = predictions["RandomForest"]
-        knn = predictions["KNN"]
-        domaine_final = f"{rf} / {knn}"
-
-    return jsonify({"domaine": domaine_final})
-
-if __name__ == "__main__":
-    app.run(debug=True)
-
-svm_model = load(os.path.join(MODEL_FOLDER, "svm_model.joblib"))
-knn_model = load(os.path.join(MODEL_FOLDER, "knn_model.joblib"))
-rf_model = load(os.path.join(MODEL_FOLDER, "random_forest_model.joblib"))
-dt_model = load(os.path.join(MODEL_FOLDER, "decision_tree_model.joblib"))
-vectorizer = load(os.path.join(MODEL_FOLDER, "tfidf_vectorizer.joblib"))
-class_names = load(os.path.join(MODEL_FOLDER, "class_names.joblib"))
-
-app = Flask(__name__)
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
-
-# 📄 Vérifie l’extension
-def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
-
-# 🔍 Détection du type de mise en page
-def detecter_type_cv(filepath):
-    with fitz.open(filepath) as doc:
-        for page in doc:
-            blocs = page.get_text("blocks", sort=True)
-            positions_x = [bloc[0] for bloc in blocs]
-            largeur_page = page.rect.width
-            positions_x_filtrees = [x for x in positions_x if 50 < x < largeur_page - 50]
-            if not positions_x_filtrees:
-                continue
-            ecarts_x = [abs(positions_x_filtrees[i+1] - positions_x_filtrees[i]) for i in range(len(positions_x_filtrees)-1)]
-            if ecarts_x and max(ecarts_x) > largeur_page / 2.5:
-                return "2_colonnes"
-    return "1_colonne"
-
-# 🧠 Extraction du texte
-def extraire_texte(filepath):
-    type_cv = detecter_type_cv(filepath)
-    texte = ""
-    with fitz.open(filepath) as doc:
-        for page in doc:
-            blocs = page.get_text("blocks", sort=True)
-            largeur_page = page.rect.width
-            if type_cv == "2_colonnes":
-                blocs_gauche = []
-                blocs_droite = []
-                for bloc in blocs:
-                    x0 = bloc[0]
-                    if x0 < largeur_page / 2:
-                        blocs_gauche.append(bloc[4])
-                    else:
-                        blocs_droite.append(bloc[4])
-                texte += '\n'.join(blocs_gauche + blocs_droite) + "\n"
-            else:
-                for bloc in blocs:
-                    texte += bloc[4] + "\n"
-    return nettoyer_texte(texte)
-
-# 🚀 API : détection du domaine
-@app.route("/detect-domain", methods=["POST"])
-def detect_domain():
-    if "cv_pdf" not in request.files:
+    extraction_time = time.perf_counter() - start
+    domaine = predire_domaine(texte_global)
+
+    if g.get("profiling"):
+        with open(path, "rb") as f:
+            g.profile_document_hash = hashlib.sha256(f.read()).hexdigest()
+        g.profile_timings = {
+            "extraction_ms": round(extraction_time * 1000, 1),
+            "prediction_ms": round((time.perf_counter() - start - extraction_time) * 1000, 1)
+        }
+    return jsonify({"domaine": domaine})
+
+# 🚀 API : détection du domaine pour plusieurs CV (champ "cv_files", répété)
+@app.route("/detect-domain-batch", methods=["POST"])
+def detect_domain_batch():
+    files = request.files.getlist("cv_files")
+    if not files:
         return jsonify({"error": "No file uploaded"}), 400
+    if len(files) > DOMAIN_BATCH_MAX_FILES:
+        return jsonify({"error": f"Too many files (max {DOMAIN_BATCH_MAX_FILES})"}), 400
 
-    file = request.files["cv_pdf"]
-    if not allowed_file(file.filename):
-        return jsonify({"error": "Invalid file type"}), 400
-
-    filename = secure_filename(file.filename)
-    path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
     os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
-    file.save(path)
-
-    texte_global = extraire_texte(path)
-    vect = vectorizer.transform([texte_global])
-
-    # 🔎 Prédictions
-    predictions = {
-        "SVM": class_names[svm_model.predict(vect)[0]],
-        "KNN": class_names[knn_model.predict(vect)[0]],
-        "RandomForest": class_names[rf_model.predict(vect)[0]],
-        "DecisionTree": class_names[dt_model.predict(vect)[0]]
-    }
-
-    # 🧠 Consensus ou fallback
-    counts = Counter(predictions.values())
-    if counts.most_common(1)[0][1] >= 2:
-        domaine_final = counts.most_common(1)[0][0]
-    else:
-        rf = predictions["RandomForest"]
-        knn = predictions["KNN"]
-        domaine_final = f"{rf} / {knn}"
-
-    return jsonify({"domaine": domaine_final})
+    resultats = []
+    textes = []
+    for index, file in enumerate(files):
+        if not allowed_file(file.filename):
+            resultats.append({"filename": file.filename, "error": "Invalid file type"})
+            continue
+        # Préfixe : deux fichiers du lot peuvent porter le même nom
+        path = os.path.join(app.config["UPLOAD_FOLDER"], f"{index}_{secure_filename(file.filename)}")
+        file.save(path)
+        try:
+            texte = extraire_texte(path)
+        except Exception as e:
+            # Fichier illisible (PDF corrompu, docx invalide...) : erreur pour ce fichier seulement
+            resultats.append({"filename": file.filename, "error": f"Text extraction failed ({type(e).__name__})"})
+            continue
+        resultats.append({"filename": file.filename})
+        textes.append((len(resultats) - 1, texte))
+
+    if textes:
+        domaines = predire_domaines([texte for _, texte in textes])
+        for (position, _), domaine in zip(textes, domaines):
+            resultats[position]["domaine"] = domaine
+
+    return jsonify({"results": resultats})
 
 if __name__ == "__main__":
     app.run(debug=True)
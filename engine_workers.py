@@ -0,0 +1,71 @@
+"""
+Moteurs CPU (SkillNER / Skill2Vec, regex, détection du domaine) exécutés dans
+les pools de processus de matching_api (ENGINE_EXECUTOR=process) et d'asgi_api.
+
+Ces pools démarrent en "forkserver" (voir utils/process_pool.py) : un processus
+du pool désérialise les fonctions qu'on lui soumet en important leur module.
+Les fonctions sont donc ici, et non dans matching_api ou asgi_api qui chargent
+le modèle SBERT et torch à l'import : un processus du pool n'importe que ce
+module et init_worker n'y charge que Skill2Vec.
+"""
+import os
+import time
+
+from Skill2Vec.Skill2VecMatching import Skill2VecMatching
+from utils.extract_profile_elements import extract_structured_elements
+from utils.extraction_score import compute_extraction_score
+from utils.tracing import span, model_load
+
+# Vecteurs Skill2Vec exportés (python -m Skill2Vec.utils.skill_vectors), projetés en mémoire ;
+# modèle Word2Vec complet si le dossier est absent
+SKILL2VEC_VECTORS_PATH = os.environ.get("SKILL2VEC_VECTORS_PATH", "skill2vec_vectors")
+SKILL2VEC_MODEL_PATH = "https://drive.google.com/uc?export=download&id=1Orr6HYjK6fAIhSM32iRAv5qpnqLwsvoh"
+
+# 🔁 Modèle Skill2Vec du processus, chargé au premier appel
+skill2vec_matchers = {}
+
+def get_skill2vec_matcher():
+    if "matcher" not in skill2vec_matchers:
+        with model_load("skill2vec"):
+            skill2vec_matchers["matcher"] = Skill2VecMatching(model_path=SKILL2VEC_MODEL_PATH,
+                                                              vectors_path=SKILL2VEC_VECTORS_PATH)
+    return skill2vec_matchers["matcher"]
+
+# ⚙️ Initialisation d'un processus du pool : Skill2Vec chargé avant la première requête
+def init_worker():
+    get_skill2vec_matcher()
+
+# ⏱️ Exécution chronométrée d'un moteur (fonction de module : sérialisable pour un pool de processus)
+def timed(engine, *args):
+    start = time.perf_counter()
+    result = engine(*args)
+    return result, time.perf_counter() - start
+
+# 🧩 Moteur Skill2Vec : annotation SkillNER et similarité des compétences
+def run_skill2vec_engine(cv_skills, cv_text, job_text_original):
+    with span("engine_skill2vec"):
+        skill2vec_matcher = get_skill2vec_matcher()
+        updates = {}
+        if cv_skills is None:
+            cv_skills = skill2vec_matcher.extract_skills_from_text(cv_text)
+            updates["skills"] = cv_skills
+        job_skills = skill2vec_matcher.extract_skills_from_text(job_text_original)
+        return float(skill2vec_matcher.calculate_similarity(cv_skills, job_skills)), updates
+
+# 🧩 Moteur d'extraction : éléments structurés (compétences, soft skills, langues)
+def run_extraction_engine(cv_structured, cv_text, job_text_original):
+    with span("engine_extraction"):
+        updates = {}
+        if cv_structured is None:
+            with span("regex_extraction"):
+                cv_structured = extract_structured_elements(cv_text)
+            updates["structured"] = cv_structured
+        with span("regex_extraction"):
+            job_structured = extract_structured_elements(job_text_original)
+        return compute_extraction_score(cv_structured, job_structured), updates
+
+# 🔎 Extraction puis prédiction du domaine (modèles de domain_api chargés au premier appel)
+def detecter_domaine_fichier(path):
+    import domain_api
+
+    return domain_api.predire_domaine(domain_api.extraire_texte(path))
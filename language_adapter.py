@@ -1,10 +1,12 @@
 from langdetect import detect
 from deep_translator import GoogleTranslator
+from utils.tracing import span
 
 # 🔍 Détection de la langue
 def detect_language(text):
     try:
-        return detect(text)
+        with span("langdetect"):
+            return detect(text)
     except:
         return "unknown"
 
@@ -23,10 +25,11 @@ def split_text(text, max_length=5000):
 # 🌐 Traduction segmentée
 def translate_long_text(text, source_lang='fr', target_lang='en'):
     segments = split_text(text)
-    translated_segments = [
-        GoogleTranslator(source=source_lang, target=target_lang).translate(seg)
-        for seg in segments
-    ]
+    with span("translation"):
+        translated_segments = [
+            GoogleTranslator(source=source_lang, target=target_lang).translate(seg)
+            for seg in segments
+        ]
     return ' '.join(translated_segments)
 
 # 🔁 Traduction conditionnelle
@@ -35,6 +38,40 @@ def translate_to_english(text, source_lang):
         return translate_long_text(text, source_lang, "en")
     return text  # No translation needed
 
+# 📦 Lots de lignes consécutives, chacun traduit en un appel (< max_length caractères)
+def group_lines(lines, max_length=5000):
+    batches = []
+    batch, length = [], 0
+    for line in lines:
+        if batch and length + len(line) + 1 > max_length:
+            batches.append(batch)
+            batch, length = [], 0
+        batch.append(line)
+        length += len(line) + 1
+    if batch:
+        batches.append(batch)
+    return batches
+
+# 🧾 Traduction ligne à ligne (exigences d'une offre, blocs d'un CV) : découpage conservé.
+# Les lignes sont jointes par des retours à la ligne et traduites par lots ; un lot dont
+# la traduction ne garde pas ses lignes est retraduit ligne par ligne
+def translate_lines(lines, source_lang):
+    if source_lang != "fr":
+        return list(lines)
+    lines = [" ".join(line.split()) for line in lines]
+    translator = GoogleTranslator(source="fr", target="en")
+    translated_lines = []
+    with span("translation"):
+        for batch in group_lines(lines):
+            if len(batch) == 1:
+                translated_lines.append(" ".join(translator.translate(seg) for seg in split_text(batch[0])))
+                continue
+            translated = (translator.translate("\n".join(batch)) or "").split("\n")
+            if len(translated) != len(batch):
+                translated = [translator.translate(line) for line in batch]
+            translated_lines.extend(line.strip() for line in translated)
+    return translated_lines
+
 # 🧩 Traduction ciblée des compétences extraites
 def translate_skills_to_english(skills_list, source_lang):
     if source_lang == "fr":
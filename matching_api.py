@@ -1,21 +1,92 @@
 import os
-from flask import Flask, request, jsonify
+import time
+import hashlib
+import threading
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from flask import Flask, request, jsonify, Response, g
 from werkzeug.utils import secure_filename
 from Sbert.SBERTMatching import SBERTMatching
-from Skill2Vec.Skill2VecMatching import Skill2VecMatching
+from Sbert.utils.torch_runtime import configure_torch_threads
 from utils.preprocess import preprocess
-from utils.extract_profile_elements import extract_structured_elements
-from language_adapter import adapt_texts
+from utils.fusion import fuse_scores, verdict_is_decided, final_score_bounds as fusion_bounds, score_response, VERDICTS
+from utils.cv_cache import CVArtifactCache, pipeline_fingerprint
+from utils.pdf_text import PDF_EXTRACTOR
+from utils.text_stream import TEXT_MAX_CHARS
+from utils.tracing import Histogram, span, record, model_load, registry
+from utils.profiling import profiled
+from utils.process_pool import process_pool
+from Sbert.utils.split_text import split_into_chunks, split_requirements
+from language_adapter import detect_language, translate_to_english, translate_lines
+from engine_workers import get_skill2vec_matcher, init_worker, timed, run_skill2vec_engine, run_extraction_engine
 
 # 📂 Configuration
 UPLOAD_FOLDER = "uploads"
 ALLOWED_EXTENSIONS = {"pdf", "docx", "txt"}
+# "document" : cosinus entre documents entiers / "chunks" : meilleur bloc du CV par exigence
+SBERT_SCORING_MODE = os.environ.get("SBERT_SCORING_MODE", "document")
+# Backend d'inférence SBERT : "torch" ou "onnx" (ONNX Runtime, optionnellement quantifié int8),
+# modèle exporté avant le démarrage : python -m Sbert.utils.onnx_backend
+SBERT_BACKEND = os.environ.get("SBERT_BACKEND", "torch")
+SBERT_ONNX_PATH = os.environ.get("SBERT_ONNX_PATH", "sbert_onnx")
+SBERT_ONNX_QUANTIZE = os.environ.get("SBERT_ONNX_QUANTIZE", "0") == "1"
+# Threads torch par worker (0 : cœurs / WEB_CONCURRENCY si défini, sinon défaut de torch)
+TORCH_NUM_THREADS = int(os.environ.get("TORCH_NUM_THREADS", "0"))
+TORCH_NUM_INTEROP_THREADS = int(os.environ.get("TORCH_NUM_INTEROP_THREADS", "0"))
+# Thread d'inférence dédié : micro-batching des encodes des requêtes concurrentes (gunicorn --threads)
+SBERT_INFERENCE_THREAD = os.environ.get("SBERT_INFERENCE_THREAD", "0") == "1"
+# Micro-batching : textes max par passe et attente max (ms) pour compléter un batch
+SBERT_MAX_BATCH_SIZE = int(os.environ.get("SBERT_MAX_BATCH_SIZE", "64"))
+SBERT_MAX_WAIT_MS = float(os.environ.get("SBERT_MAX_WAIT_MS", "5"))
+# Bornes de l'histogramme des tailles de batch exporté sur /metrics : puissances de 2 jusqu'à SBERT_MAX_BATCH_SIZE
+SBERT_BATCH_SIZE_BUCKETS = tuple(sorted({2 ** i for i in range(SBERT_MAX_BATCH_SIZE.bit_length())} | {SBERT_MAX_BATCH_SIZE}))
+# Cache disque des artefacts de CV, indexé par SHA-256 du fichier (LRU + TTL)
+CV_CACHE_ENABLED = os.environ.get("CV_CACHE_ENABLED", "1") == "1"
+CV_CACHE_FOLDER = os.environ.get("CV_CACHE_FOLDER", "cv_cache")
+CV_CACHE_MAX_MB = int(os.environ.get("CV_CACHE_MAX_MB", "512"))
+CV_CACHE_TTL_HOURS = float(os.environ.get("CV_CACHE_TTL_HOURS", "168"))
+# Offres traduites gardées en mémoire (une même offre est comparée à de nombreux CV)
+OFFER_TRANSLATION_CACHE_SIZE = int(os.environ.get("OFFER_TRANSLATION_CACHE_SIZE", "256"))
+# Exécution des moteurs : "thread" (défaut), "process" (SkillNER/regex en processus) ou "sequential"
+ENGINE_EXECUTOR = os.environ.get("ENGINE_EXECUTOR", "thread")
+ENGINE_EXECUTOR_WORKERS = int(os.environ.get("ENGINE_EXECUTOR_WORKERS", "2"))
+# Cascade : SBERT et extraction, puis Skill2Vec seulement si le verdict peut encore changer
+CASCADE_MODE = os.environ.get("CASCADE_MODE", "0") == "1"
+# Plage du score Skill2Vec inconnu pour borner le score final : scores observés (cosinus des
+# vecteurs moyens de compétences), à élargir si un score hors plage apparaît (bulk_score)
+CASCADE_SKILL2VEC_RANGE = tuple(float(x) for x in os.environ.get("CASCADE_SKILL2VEC_RANGE", "0,1").split(","))
 
 # 🔁 Chargement des modèles
+configure_torch_threads(TORCH_NUM_THREADS, TORCH_NUM_INTEROP_THREADS)
 sbert_model_path = "https://drive.google.com/uc?export=download&id=1KPuaQuwp4gEQZv6HwpVm8CHtJm3qr03Z"
-skill2vec_model_path = "https://drive.google.com/uc?export=download&id=1Orr6HYjK6fAIhSM32iRAv5qpnqLwsvoh"
-sbert_matcher = SBERTMatching(model_path=sbert_model_path)
-skill2vec_matcher = Skill2VecMatching(model_path=skill2vec_model_path)
+with model_load("sbert"):
+    sbert_matcher = SBERTMatching(
+        model_path=sbert_model_path,
+        backend=SBERT_BACKEND,
+        onnx_path=SBERT_ONNX_PATH,
+        quantize=SBERT_ONNX_QUANTIZE,
+        inference_thread=SBERT_INFERENCE_THREAD,
+        max_batch_size=SBERT_MAX_BATCH_SIZE,
+        max_wait_ms=SBERT_MAX_WAIT_MS
+    )
+# Skill2Vec (SKILL2VEC_VECTORS_PATH) : chargé par engine_workers, partagé avec les moteurs CPU
+skill2vec_matcher = get_skill2vec_matcher()
+cv_cache = None
+if CV_CACHE_ENABLED:
+    cv_cache = CVArtifactCache(
+        CV_CACHE_FOLDER,
+        max_bytes=CV_CACHE_MAX_MB * 1024 * 1024,
+        ttl_seconds=CV_CACHE_TTL_HOURS * 3600
+    )
+# Réglages dont dépendent les artefacts mis en cache, inclus dans la clé
+CV_CACHE_FINGERPRINT = pipeline_fingerprint(
+    pdf_extractor=PDF_EXTRACTOR,
+    text_max_chars=TEXT_MAX_CHARS,
+    sbert_model=sbert_model_path,
+    sbert_backend=SBERT_BACKEND,
+    sbert_onnx_quantize=SBERT_ONNX_QUANTIZE,
+    sbert_scoring_mode=SBERT_SCORING_MODE
+)
 
 app = Flask(__name__)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
@@ -31,93 +102,309 @@ def get_default_offer():
     capacité d’analyse, et aisance en communication. Une expérience en environnement agile est un plus.
     """
 
-# 🔍 Calcul du score d’extraction
-def compute_extraction_score(cv_data, job_data):
-    def coverage_ratio(cv_list, job_list):
-        if not job_list:
-            return None
-        if not cv_list:
-            return 0.0
-        matched = [item for item in job_list if item.lower() in [c.lower() for c in cv_list]]
-        return len(matched) / len(job_list)
-
-    skill_score = coverage_ratio(cv_data["competences"], job_data["competences"])
-    soft_score = coverage_ratio(cv_data["soft_skills"], job_data["soft_skills"])
-    lang_score = coverage_ratio(cv_data["languages"], job_data["languages"])
-
-    weights = {"skills": 0.6 if skill_score is not None else 0.0,
-               "soft": 0.3 if soft_score is not None else 0.0,
-               "lang": 0.1 if lang_score is not None else 0.0}
-    total_weight = sum(weights.values())
-
-    score = 0.0
-    if skill_score is not None:
-        score += weights["skills"] * skill_score
-    if soft_score is not None:
-        score += weights["soft"] * soft_score
-    if lang_score is not None:
-        score += weights["lang"] * lang_score
-
-    return round(score / total_weight if total_weight > 0 else 1.0, 4)
+# 🧾 Offre prétraitée pour les moteurs et, en mode "chunks", ses exigences : découpées
+# sur le texte brut (preprocess supprime lignes et puces), puis prétraitées une à une
+def prepare_offer(job_text_raw):
+    job_text_original = preprocess(job_text_raw)
+    if SBERT_SCORING_MODE != "chunks":
+        return job_text_original, None
+    with span("sbert_split"):
+        requirements = [preprocess(requirement) for requirement in split_requirements(job_text_raw)]
+    return job_text_original, [requirement for requirement in requirements if requirement]
+
+# 🌐 Offre traduite pour SBERT : texte entier, ou exigences par lots en mode "chunks"
+@lru_cache(maxsize=OFFER_TRANSLATION_CACHE_SIZE)
+def translate_offer_cached(job_text_original, job_requirements):
+    language = detect_language(job_text_original)
+    if SBERT_SCORING_MODE == "chunks":
+        return tuple(translate_lines(job_requirements, language))
+    return translate_to_english(job_text_original, language)
+
+def translate_offer(job_text_original, job_requirements=None):
+    if SBERT_SCORING_MODE != "chunks":
+        return translate_offer_cached(job_text_original, None)
+    if job_requirements is None:
+        job_requirements = split_requirements(job_text_original)
+    return list(translate_offer_cached(job_text_original, tuple(job_requirements)))
+
+# ⚖️ Score final : pondération adaptative des trois moteurs et verdict (voir utils/fusion.py)
+def compute_final_score(score_sbert, score_skill2vec, score_extraction):
+    score_final, verdict = fuse_scores(score_sbert, score_skill2vec, score_extraction)
+    return float(score_final), VERDICTS[int(verdict)]
+
+# 📏 Bornes du score final lorsque certains scores sont encore inconnus (None)
+def final_score_bounds(score_sbert=None, score_skill2vec=None, score_extraction=None):
+    return fusion_bounds(score_sbert, score_skill2vec, score_extraction,
+                         skill2vec_range=CASCADE_SKILL2VEC_RANGE)
+
+# 🧠 Embedding SBERT du CV pour le mode de scoring courant
+def compute_sbert_artifacts(cv_artifacts):
+    """
+    Calcule l'embedding SBERT du CV requis par SBERT_SCORING_MODE s'il manque
+    (nouveau CV ou entrée de cache créée sous un autre mode).
+    Retourne les champs à ajouter aux artefacts (dict vide s'il ne manque rien).
+    """
+    if SBERT_SCORING_MODE == "chunks":
+        if "sbert_chunks" in cv_artifacts:
+            return {}
+        # Blocs découpés sur le texte extrait, lignes et puces intactes, puis traduits par lots
+        with span("sbert_split"):
+            chunks = split_into_chunks(cv_artifacts["text"])
+        chunks = translate_lines(chunks, cv_artifacts["language"])
+        return {
+            "sbert_chunks": chunks,
+            "sbert_chunk_embeddings": sbert_matcher.encode(chunks).cpu().numpy() if chunks else None
+        }
+    if "sbert_embedding" in cv_artifacts:
+        return {}
+    return {"sbert_embedding": sbert_matcher.encode(cv_artifacts["translated_text"]).cpu().numpy()}
+
+# 🌐 Détection de langue puis traduction en anglais si nécessaire
+def translate_text(text):
+    language = detect_language(text)
+    return language, translate_to_english(text, language)
+
+# 🌐 Langue du CV, et traduction du texte entier en mode "document" (les blocs sont traduits à part)
+def translate_cv(cv_artifacts):
+    if SBERT_SCORING_MODE == "chunks":
+        return {} if "language" in cv_artifacts else {"language": detect_language(cv_artifacts["text"])}
+    if "translated_text" in cv_artifacts:
+        return {}
+    language, translated_text = translate_text(cv_artifacts["text"])
+    return {"language": language, "translated_text": translated_text}
+
+# 🧮 Similarité SBERT entre un CV (artefacts) et une offre déjà traduite
+# (texte, ou liste d'exigences en mode "chunks")
+def score_sbert(cv_artifacts, job_text_translated):
+    updates = compute_sbert_artifacts(cv_artifacts)
+    cv_artifacts = {**cv_artifacts, **updates}
+
+    if SBERT_SCORING_MODE == "chunks":
+        sbert_result = sbert_matcher.compute_chunk_similarity_from_embeddings(
+            cv_artifacts["sbert_chunks"], cv_artifacts["sbert_chunk_embeddings"], job_text_translated)
+        return {"score": sbert_result["score"], "matches": sbert_result["matches"]}, updates
+
+    job_embedding = sbert_matcher.encode(job_text_translated)
+    score = sbert_matcher.compute_similarity_from_embeddings(cv_artifacts["sbert_embedding"], job_embedding)
+    return {"score": score, "matches": None}, updates
+
+# 🧩 Moteur SBERT : traduction, encodage et similarité sémantique
+def run_sbert_engine(cv_artifacts, job_text_original, job_requirements=None):
+    with span("engine_sbert"):
+        updates = translate_cv(cv_artifacts)
+        job_text_translated = translate_offer(job_text_original, job_requirements)
+        sbert_result, sbert_updates = score_sbert({**cv_artifacts, **updates}, job_text_translated)
+        return sbert_result, {**updates, **sbert_updates}
+
+# ⚙️ Exécuteurs du worker : SBERT dans un pool de threads (torch libère le GIL),
+# SkillNER et les regex dans un pool de threads ou de processus selon ENGINE_EXECUTOR.
+# Le pool de processus (forkserver, voir utils/process_pool.py) n'exécute que les
+# moteurs d'engine_workers, sans SBERT ni torch ; le verrou évite que deux requêtes
+# simultanées créent chacune leurs pools
+engine_executors = {}
+engine_executors_lock = threading.Lock()
+
+def get_engine_executors():
+    with engine_executors_lock:
+        if engine_executors.get("pid") != os.getpid():
+            engine_executors.clear()
+            engine_executors["pid"] = os.getpid()
+            if ENGINE_EXECUTOR == "sequential":
+                return None, None
+            engine_executors["sbert"] = ThreadPoolExecutor(max_workers=ENGINE_EXECUTOR_WORKERS, thread_name_prefix="sbert-engine")
+            if ENGINE_EXECUTOR == "process":
+                engine_executors["cpu"] = process_pool(ENGINE_EXECUTOR_WORKERS, initializer=init_worker)
+            else:
+                engine_executors["cpu"] = ThreadPoolExecutor(max_workers=ENGINE_EXECUTOR_WORKERS, thread_name_prefix="cpu-engine")
+        return engine_executors.get("sbert"), engine_executors.get("cpu")
+
+def submit_engine(executor, engine, *args):
+    if executor is None:
+        future = Future()
+        future.set_result(timed(engine, *args))
+        return future
+    return executor.submit(timed, engine, *args)
+
+# 🔀 Exécution parallèle des trois moteurs (indépendants une fois les textes disponibles)
+def run_engines_parallel(cv_artifacts, job_text_original, job_requirements=None, sequential=False):
+    sbert_executor, cpu_executor = (None, None) if sequential else get_engine_executors()
+    sbert_future = submit_engine(sbert_executor, run_sbert_engine, cv_artifacts, job_text_original, job_requirements)
+    skill2vec_future = submit_engine(cpu_executor, run_skill2vec_engine,
+                                     cv_artifacts.get("skills"), cv_artifacts["text"], job_text_original)
+    extraction_future = submit_engine(cpu_executor, run_extraction_engine,
+                                      cv_artifacts.get("structured"), cv_artifacts["text"], job_text_original)
+
+    (sbert_result, sbert_updates), sbert_time = sbert_future.result()
+    (score_skill2vec, skill2vec_updates), skill2vec_time = skill2vec_future.result()
+    (score_extraction, extraction_updates), extraction_time = extraction_future.result()
+    return {
+        "scores": {"sbert": sbert_result["score"], "skill2vec": score_skill2vec, "extraction": score_extraction},
+        "matches": sbert_result["matches"],
+        "updates": {**sbert_updates, **skill2vec_updates, **extraction_updates},
+        "timings": {"sbert": sbert_time, "skill2vec": skill2vec_time, "extraction": extraction_time},
+        "skipped": []
+    }
+
+# 🪜 Vrai si le verdict dépend encore du score Skill2Vec (partagé avec asgi_api)
+def skill2vec_needed(score_sbert, score_extraction):
+    return not verdict_is_decided(*final_score_bounds(score_sbert, None, score_extraction))
+
+# 🪜 Cascade : extraction et SBERT en parallèle, puis Skill2Vec seulement si le verdict
+# peut encore changer. Skill2Vec seul ne décide jamais (SBERT pèse trop dans le score
+# final) : c'est le seul moteur que la cascade peut éviter, sans sérialiser les autres.
+def run_engines_cascade(cv_artifacts, job_text_original, job_requirements=None, sequential=False):
+    sbert_executor, cpu_executor = (None, None) if sequential else get_engine_executors()
+    sbert_future = submit_engine(sbert_executor, run_sbert_engine, cv_artifacts, job_text_original, job_requirements)
+    extraction_future = submit_engine(cpu_executor, run_extraction_engine,
+                                      cv_artifacts.get("structured"), cv_artifacts["text"], job_text_original)
+    (sbert_result, sbert_updates), sbert_time = sbert_future.result()
+    (score_extraction, extraction_updates), extraction_time = extraction_future.result()
+
+    scores = {"sbert": sbert_result["score"], "skill2vec": None, "extraction": score_extraction}
+    updates = {**sbert_updates, **extraction_updates}
+    timings = {"sbert": sbert_time, "extraction": extraction_time}
+    skipped = ["skill2vec"]
+    if skill2vec_needed(scores["sbert"], scores["extraction"]):
+        (scores["skill2vec"], skill2vec_updates), timings["skill2vec"] = timed(
+            run_skill2vec_engine, cv_artifacts.get("skills"), cv_artifacts["text"], job_text_original)
+        updates.update(skill2vec_updates)
+        skipped = []
+
+    return {"scores": scores, "matches": sbert_result["matches"], "updates": updates, "timings": timings,
+            "skipped": skipped}
+
+# 🧮 Moteurs puis fusion pour un CV déjà extrait (partagé avec analyze_api)
+def score_cv(cv_artifacts, job_text_original, job_requirements=None, sequential=False):
+    """
+    Exécute les moteurs sur le CV et l'offre prétraitée, puis calcule le score final.
+
+    Args:
+    - cv_artifacts (dict): Artefacts du CV (au moins "text").
+    - job_text_original (str): Offre prétraitée.
+    - job_requirements (list[str]): Exigences de l'offre (voir prepare_offer), mode "chunks".
+    - sequential (bool): Moteurs dans le thread appelant (requête profilée).
+
+    Returns:
+    - tuple[dict, dict]: Réponse (score ou score_range, verdict, matches...) et résultat des moteurs
+      (artefacts à mettre en cache dans "updates", durées dans "timings").
+    """
+    if CASCADE_MODE:
+        engines = run_engines_cascade(cv_artifacts, job_text_original, job_requirements, sequential=sequential)
+    else:
+        engines = run_engines_parallel(cv_artifacts, job_text_original, job_requirements, sequential=sequential)
+
+    return build_response(engines), engines
+
+# 🧾 Réponse de /match-profile à partir du résultat des moteurs (partagée avec asgi_api)
+def build_response(engines):
+    scores = engines["scores"]
+    with span("scoring"):
+        # Skill2Vec évité : verdict acquis, plage du score au lieu du score
+        response = score_response(scores["sbert"], scores["skill2vec"], scores["extraction"],
+                                  skill2vec_range=CASCADE_SKILL2VEC_RANGE)
+    if engines["matches"] is not None:
+        response["matches"] = engines["matches"]
+    if CASCADE_MODE:
+        response["skipped_engines"] = engines["skipped"]
+    return response
+
+# ⏱️ Durées par moteur et par étape (ms), renvoyées en mode debug et jointes au profil
+def format_timings(engine_timings, parse_seconds, total_seconds):
+    timings = {f"{name}_ms": round(seconds * 1000, 1) for name, seconds in engine_timings.items()}
+    timings["parse_ms"] = round(parse_seconds * 1000, 1)
+    timings["total_ms"] = round(total_seconds * 1000, 1)
+    return timings
+
+# ♻️ Artefacts du CV depuis le cache, sinon texte extrait du fichier téléversé
+def get_cv_artifacts(cv_key, cv_bytes, filename):
+    if cv_cache is not None:
+        with span("cache_get"):
+            cv_artifacts = cv_cache.get(cv_key)
+        if cv_artifacts is not None:
+            return cv_artifacts
+
+    path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
+    with span("upload_write"):
+        os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(cv_bytes)
+    return {"text": sbert_matcher.process_input(path)}
 
 # 🚀 API : matching automatique
 @app.route("/match-profile", methods=["POST"])
+@profiled("match-profile")
 def match_profile():
     if "cv_file" not in request.files:
         return jsonify({"error": "Missing CV file"}), 400
 
     file = request.files["cv_file"]
     job_text_raw = request.form.get("job_text", get_default_offer())
+    debug = request.values.get("debug") == "1"
 
     if not allowed_file(file.filename):
         return jsonify({"error": "Invalid file type"}), 400
 
+    request_start = time.perf_counter()
     filename = secure_filename(file.filename)
-    path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+    cv_bytes = file.read()
+    cv_key = CVArtifactCache.key(cv_bytes, CV_CACHE_FINGERPRINT)
+    cv_artifacts = get_cv_artifacts(cv_key, cv_bytes, filename)
+    with span("preprocess"):
+        job_text_original, job_requirements = prepare_offer(job_text_raw)
+    parse_time = time.perf_counter() - request_start
 
-    with open(path, "wb") as f:
-        f.write(file.read())
+    # Requête profilée : moteurs dans le thread de la requête, seul suivi par cProfile
+    response, engines = score_cv(cv_artifacts, job_text_original, job_requirements,
+                                 sequential=g.get("profiling", False))
 
-    job_text_original = preprocess(job_text_raw)
-    cv_text_original = sbert_matcher.process_input(path)
-    cv_text_translated, job_text_translated = adapt_texts(cv_text_original, job_text_original)
-
-    score_sbert = sbert_matcher.compute_similarity_from_texts(cv_text_translated, job_text_translated)
-    score_skill2vec = skill2vec_matcher.get_similarity_score(cv_input=path, job_input=job_text_original)
-
-    cv_structured = extract_structured_elements(cv_text_original)
-    job_structured = extract_structured_elements(job_text_original)
-    score_extraction = compute_extraction_score(cv_structured, job_structured)
-
-    # Pondération adaptative
-    if score_sbert > 0.75 and score_skill2vec > 0.80:
-        alpha, beta, gamma = 0.6, 0.4, 0.0
-    elif score_sbert > 0.75:
-        alpha, beta, gamma = 0.8, 0.2, 0.0
-    elif score_skill2vec > 0.75 and score_extraction > 0.75 and score_sbert < 0.75:
-        alpha, beta, gamma = 0.4, 0.4, 0.2
-    elif score_skill2vec >= 0.75 and score_sbert >= 0.60:
-        alpha, beta, gamma = 0.2, 0.8, 0.0
-    else:
-        alpha = 0.6
-        beta = 0.35 if score_extraction < 0.5 else 0.3
-        gamma = 0.05 if score_extraction < 0.5 else 0.1
+    if cv_cache is not None and engines["updates"]:
+        with span("cache_set"):
+            cv_cache.set(cv_key, {**cv_artifacts, **engines["updates"]})
 
-    score_final = round(alpha * score_sbert + beta * score_skill2vec + gamma * score_extraction, 4)
-    score_percent = int(score_final * 100)
+    timings = format_timings(engines["timings"], parse_time, time.perf_counter() - request_start)
+    if g.get("profiling"):
+        # SHA-256 du fichier téléversé, comme /detect-domain (la clé du cache dépend aussi du pipeline)
+        g.profile_document_hash = hashlib.sha256(cv_bytes).hexdigest()
+    g.profile_timings = timings
+    if debug:
+        response["timings"] = timings
 
-    if score_final > 0.75:
-        verdict = "Très bon match"
-    elif score_final > 0.5:
-        verdict = "Match partiel"
-    else:
-        verdict = "Faible compatibilité"
+    record("request", time.perf_counter() - request_start)
+    return jsonify(response)
+
+# 📊 Métriques calculées à la collecte : cache des CV et micro-batching SBERT
+def collect_metrics():
+    metrics = []
+    if cv_cache is not None:
+        lookups = cv_cache.hits + cv_cache.misses
+        metrics += [
+            ("matching_cv_cache_hits_total", "counter", "Artefacts de CV trouvés dans le cache.", {}, cv_cache.hits),
+            ("matching_cv_cache_misses_total", "counter", "Artefacts de CV absents ou expirés.", {}, cv_cache.misses),
+            ("matching_cv_cache_hit_ratio", "gauge", "Taux de succès du cache des CV.", {},
+             cv_cache.hits / lookups if lookups else 0.0),
+        ]
+    if sbert_matcher.inference_worker is not None:
+        worker_metrics = sbert_matcher.inference_worker.metrics()
+        metrics.append(("matching_sbert_batches_total", "counter", "Batches encodés par le thread d'inférence.", {},
+                        worker_metrics["batches"]))
+        for name, help_text, distribution in (
+                ("matching_sbert_batch_size", "Textes par batch du thread d'inférence.",
+                 worker_metrics["batch_size_distribution"]),
+                ("matching_sbert_batch_requests", "Requêtes fusionnées par batch du thread d'inférence.",
+                 worker_metrics["requests_per_batch_distribution"])):
+            histogram = Histogram(SBERT_BATCH_SIZE_BUCKETS)
+            for size, count in distribution.items():
+                histogram.observe(size, count)
+            metrics += histogram.samples(name, help_text)
+        for stat in ("mean", "p50", "p95", "max"):
+            metrics.append(("matching_sbert_queue_wait_ms", "gauge", "Attente en file du thread d'inférence (ms).",
+                            {"stat": stat}, worker_metrics["queue_wait_ms"][stat]))
+    return metrics
 
-    return jsonify({
-        "score": score_percent,
-        "verdict": verdict
-    })
+# 📊 API : métriques au format Prometheus (propres à chaque worker)
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(registry.render(collect_metrics()), mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=int(os.environ.get("PORT", 5000)))
@@ -260,6 +260,15 @@ class Cleaner:
         self.exclude_cleaning_functions = exclude_cleaning_function
         self.to_lowercase = to_lowercase
 
+        # resolve the pipeline once, in registry order
+        # if exclude_cleaning_functions was provided then include-cleaning_functions will be ignoned
+        if len(self.exclude_cleaning_functions):
+            self.pipeline = [function for name, function in dict_cleaning_functions.items()
+                             if name not in self.exclude_cleaning_functions]
+        else:
+            self.pipeline = [function for name, function in dict_cleaning_functions.items()
+                             if name in self.include_cleaning_functions]
+
     def __call__(
         self,
         text: str
@@ -292,15 +301,8 @@ class Cleaner:
         if(self.to_lowercase):
             text = text.lower()
 
-        # perform cleaning while ignoring exclude_cleaning_functions
-        if len(self.exclude_cleaning_functions):
-            for cleaning_name in dict_cleaning_functions.keys():
-                if cleaning_name not in self.exclude_cleaning_functions:
-                    text = dict_cleaning_functions[cleaning_name](text)
-        # if exclude_cleaning_functions was provided then include-cleaning_functions will be ignoned
-        else:
-            for cleaning_name in dict_cleaning_functions.keys():
-                if cleaning_name in self.include_cleaning_functions:
-                    text = dict_cleaning_functions[cleaning_name](text)
+        # perform the cleaning pipeline resolved in __init__
+        for cleaning_function in self.pipeline:
+            text = cleaning_function(text)
 
         return text
@@ -2,6 +2,11 @@
 #
 # installed packs
 from spacy import displacy
+try:
+    from utils.tracing import span
+except ImportError:
+    # skillNer utilisé hors de l'application : pas de chronométrage
+    from contextlib import nullcontext as span
 # my packs
 from skillNer.text_class import Text
 from skillNer.matcher_class import Matchers, SkillsGetter
@@ -113,28 +118,35 @@ class SkillExtractor:
             text = self.tranlsator_func(text)
 
         # create text object
-        text_obj = Text(text, self.nlp)
+        with span("skillner_text"):
+            text_obj = Text(text, self.nlp)
         # get matches
-        skills_full, text_obj = self.skill_getters.get_full_match_skills(
-            text_obj, self.matchers['full_matcher'])
+        with span("skillner_full_match"):
+            skills_full, text_obj = self.skill_getters.get_full_match_skills(
+                text_obj, self.matchers['full_matcher'])
 
         # tests
 
-        skills_abv, text_obj = self.skill_getters.get_abv_match_skills(
-            text_obj, self.matchers['abv_matcher'])
+        with span("skillner_abv_match"):
+            skills_abv, text_obj = self.skill_getters.get_abv_match_skills(
+                text_obj, self.matchers['abv_matcher'])
 
-        skills_uni_full, text_obj = self.skill_getters.get_full_uni_match_skills(
-            text_obj, self.matchers['full_uni_matcher'])
+        with span("skillner_full_uni_match"):
+            skills_uni_full, text_obj = self.skill_getters.get_full_uni_match_skills(
+                text_obj, self.matchers['full_uni_matcher'])
 
-        skills_low_form, text_obj = self.skill_getters.get_low_match_skills(
-            text_obj, self.matchers['low_form_matcher'])
+        with span("skillner_low_form_match"):
+            skills_low_form, text_obj = self.skill_getters.get_low_match_skills(
+                text_obj, self.matchers['low_form_matcher'])
 
-        skills_on_token = self.skill_getters.get_token_match_skills(
-            text_obj, self.matchers['token_matcher'])
+        with span("skillner_token_match"):
+            skills_on_token = self.skill_getters.get_token_match_skills(
+                text_obj, self.matchers['token_matcher'])
         full_sk = skills_full + skills_abv
         # process pseudo submatchers output conflicts
         to_process = skills_on_token + skills_low_form + skills_uni_full
-        process_n_gram = self.utils.process_n_gram(to_process, text_obj)
+        with span("skillner_ngram_scoring"):
+            process_n_gram = self.utils.process_n_gram(to_process, text_obj)
 
         return {
             'text': text_obj.transformed_text,
@@ -145,9 +145,9 @@ class Text:
             to_lowercase=False
         )
 
-        self.transformed_text = cleaner(text).lower()
-        # abv version
+        # abv version (case kept); one cleaning pass gives both versions
         self.abv_text = cleaner(text)
+        self.transformed_text = self.abv_text.lower()
 
         # list that holds all words within text
         self.list_words = []
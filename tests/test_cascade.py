@@ -0,0 +1,56 @@
+import numpy as np
+
+from utils.fusion import VERDICTS, final_score_bounds, fuse_scores, score_response, verdict_codes, verdict_is_decided
+
+
+def test_skill2vec_skipped_when_sbert_and_extraction_decide():
+    # SBERT faible, extraction ≤ 0.75 : score final < 0.5 quel que soit Skill2Vec
+    low, high = final_score_bounds(0.2, None, 0.5)
+    assert verdict_is_decided(low, high)
+    finals, verdicts = fuse_scores(0.2, np.linspace(-1, 1, 2001), 0.5)
+    assert low <= finals.min() and finals.max() <= high
+    assert set(verdicts.tolist()) == {int(verdict_codes(low))}
+
+
+def test_skill2vec_needed_near_thresholds():
+    assert not verdict_is_decided(*final_score_bounds(0.7, None, 0.8))
+
+
+def test_skipped_verdicts_match_full_fusion():
+    skill2vec_scores = np.linspace(-1, 1, 401)
+    skipped = 0
+    for sbert in np.linspace(-0.2, 1, 61):
+        for extraction in np.linspace(0, 1, 21):
+            low, high = final_score_bounds(sbert, None, extraction)
+            if not verdict_is_decided(low, high):
+                continue
+            skipped += 1
+            _, verdicts = fuse_scores(sbert, skill2vec_scores, extraction)
+            assert set(verdicts.tolist()) == {int(verdict_codes(low))}
+    # Plage par défaut [-1, 1] : une part réelle des requêtes évite Skill2Vec
+    assert skipped > 0.2 * 61 * 21
+
+
+def test_sbert_unknown_never_decides():
+    # Raison de l'ordre de la cascade : sans SBERT, aucun verdict n'est acquis
+    for skill2vec in np.linspace(-1, 1, 21):
+        for extraction in np.linspace(0, 1, 11):
+            assert not verdict_is_decided(*final_score_bounds(None, skill2vec, extraction))
+
+
+def test_skipped_response_gives_verdict_and_range_only():
+    # SBERT 0.2, extraction 0.5 : verdict acquis, Skill2Vec évité
+    response = score_response(0.2, None, 0.5)
+    assert "score" not in response
+    assert response["verdict"] == VERDICTS[0]
+    low, high = response["score_range"]
+    assert 0 <= low <= high <= 100
+    for skill2vec in np.linspace(0, 1, 101):
+        full = score_response(0.2, skill2vec, 0.5)
+        assert full["verdict"] == response["verdict"]
+        assert low <= full["score"] <= high
+
+
+def test_full_response_matches_fusion():
+    final, verdict = fuse_scores(0.8, 0.85, 0.6)
+    assert score_response(0.8, 0.85, 0.6) == {"score": int(float(final) * 100), "verdict": VERDICTS[int(verdict)]}
@@ -0,0 +1,25 @@
+import pytest
+
+from utils.preprocess import preprocess, preprocess_morceau
+from utils.text_stream import CHUNK_CHARS
+
+
+def texte_coupe(avant, apres):
+    # Le premier morceau lu se termine exactement par `avant` : sa dernière frontière candidate
+    remplissage = "mot " * ((CHUNK_CHARS - len(avant)) // 4)
+    remplissage += " " * (CHUNK_CHARS - len(avant) - len(remplissage))
+    texte = remplissage + avant + apres + " fin" * 10
+    assert texte[:CHUNK_CHARS].endswith(avant)
+    return texte
+
+
+@pytest.mark.parametrize("avant, apres", [
+    ("...pa-\nge ", "3 suite"),
+    ("Curri-\nculum ", "vitae Python"),
+    ("Curri- \n culum ", "vitae Python"),
+    ("déve-\nloppeur ", "Python"),
+])
+def test_mot_coupe_par_tiret_a_la_coupure(avant, apres):
+    texte = texte_coupe(avant, apres)
+    assert len(texte) > CHUNK_CHARS
+    assert preprocess(texte, 0) == preprocess_morceau(texte).strip()
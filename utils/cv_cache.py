@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from typing import Dict, Optional
+
+# Version du contenu des entrées : à incrémenter quand le calcul d'un artefact change
+CACHE_FORMAT_VERSION = 1
+
+
+def pipeline_fingerprint(**settings) -> str:
+    """
+    Empreinte des réglages dont dépendent les artefacts d'un CV (extracteur PDF,
+    limite de texte, backend et modèle SBERT, mode de scoring...).
+
+    Args:
+    - settings: Réglages du pipeline, sérialisables en JSON.
+
+    Returns:
+    - str: Empreinte à passer à CVArtifactCache.key.
+    """
+    return json.dumps({"format": CACHE_FORMAT_VERSION, **settings}, sort_keys=True)
+
+
+class CVArtifactCache:
+    """
+    Cache disque des artefacts d'un CV (texte extrait, langue, traduction,
+    embedding SBERT, compétences SkillNER, éléments structurés), indexé par le
+    SHA-256 du fichier téléversé et de l'empreinte du pipeline : changer un
+    réglage ou le format des entrées ne sert jamais d'artefacts périmés, les
+    anciennes entrées sortent du cache par LRU / TTL.
+
+    Le cache est borné en taille (éviction LRU, l'accès rafraîchit la date de
+    modification du fichier) et chaque entrée expire après ttl_seconds.
+    Les écritures sont atomiques, le dossier peut donc être partagé entre workers.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024, ttl_seconds: float = 7 * 24 * 3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(data: bytes, fingerprint: str = "") -> str:
+        digest = hashlib.sha256(fingerprint.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(data)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Retourne les artefacts du CV, ou None si absents ou expirés.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return None
+
+        if time.time() - entry["created_at"] > self.ttl_seconds:
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        # LRU : la date de modification sert de date de dernier accès
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["artifacts"]
+
+    def set(self, key: str, artifacts: Dict) -> None:
+        """
+        Enregistre les artefacts du CV puis applique les limites du cache.
+        """
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        entry = {"created_at": time.time(), "artifacts": artifacts}
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Supprime les entrées expirées puis les moins récemment utilisées
+        jusqu'à repasser sous max_bytes.
+        """
+        now = time.time()
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pkl"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            # L'accès ne fait que rafraîchir mtime : une entrée non lue depuis
+            # plus que le TTL est forcément expirée.
+            if now - stat.st_mtime > self.ttl_seconds:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,187 @@
+"""
+Artefact unique et versionné des modèles de détection de domaine.
+
+domain_api chargeait six fichiers joblib (vectoriseur, noms de classes, SVM,
+KNN, RandomForest, DecisionTree) et chaque worker désérialisait sa propre
+copie. Le paquet les regroupe, avec l'index KNN s'il existe, dans un seul
+fichier joblib non compressé : chargé avec mmap_mode="r", ses tableaux NumPy
+sont projetés en mémoire en lecture seule et partagés par les workers via le
+cache de pages. L'index hnswlib d'un index KNN "svd", qui ne se pickle pas,
+est écrit dans un fichier à part et rattaché au chargement.
+
+Un manifeste JSON (version, fichiers, sha256, versions des bibliothèques)
+l'accompagne ; les sommes de contrôle sont vérifiées au chargement. Les
+fichiers du paquet sont nommés d'après leur contenu et le manifeste est
+remplacé en dernier : un worker qui démarre pendant une reconstruction lit
+soit l'ancienne version complète, soit la nouvelle, jamais un mélange.
+
+    python -m utils.domain_models --model-folder . --version 2024-06
+"""
+import argparse
+import json
+import os
+import time
+
+from joblib import dump, load
+
+from utils.knn_index import attach_hnsw, file_sha256, load_knn_index
+
+# Nom fixe des paquets antérieurs aux fichiers versionnés (manifeste sans clé "bundle")
+DOMAIN_BUNDLE_FILE = "domain_models.joblib"
+DOMAIN_MANIFEST_FILE = "domain_models.json"
+# Préfixe des fichiers versionnés : domain_models-<sha256[:16]>.joblib / .hnsw
+DOMAIN_FILE_PREFIX = "domain_models-"
+# Version du format du paquet (clés du dictionnaire), pas des modèles
+BUNDLE_FORMAT = 1
+
+MODEL_FILES = {
+    "svm_model": "svm_model.joblib",
+    "knn_model": "knn_model.joblib",
+    "rf_model": "random_forest_model.joblib",
+    "dt_model": "decision_tree_model.joblib",
+    "vectorizer": "tfidf_vectorizer.joblib",
+    "class_names": "class_names.joblib",
+}
+
+
+def write_versioned(output_folder, tmp_path, extension):
+    """
+    Renomme un fichier temporaire d'après sa somme de contrôle.
+
+    Returns:
+    - tuple[str, str]: Nom du fichier dans output_folder et son sha256.
+    """
+    sha256 = file_sha256(tmp_path)
+    filename = f"{DOMAIN_FILE_PREFIX}{sha256[:16]}{extension}"
+    os.replace(tmp_path, os.path.join(output_folder, filename))
+    return filename, sha256
+
+
+def read_manifest(model_folder):
+    try:
+        with open(os.path.join(model_folder, DOMAIN_MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def manifest_files(manifest):
+    if manifest is None:
+        return set()
+    return {manifest.get("bundle", DOMAIN_BUNDLE_FILE), manifest.get("hnsw_index")} - {None}
+
+
+def remove_stale_files(output_folder, keep):
+    # Versions antérieures à la précédente : plus aucun worker ne peut les lire
+    for name in os.listdir(output_folder):
+        if (name.startswith(DOMAIN_FILE_PREFIX) or name == DOMAIN_BUNDLE_FILE) and name not in keep:
+            try:
+                os.remove(os.path.join(output_folder, name))
+            except OSError:
+                pass
+
+
+def load_model_files(model_folder):
+    """
+    Charge les modèles depuis leurs fichiers joblib séparés (format historique).
+
+    Returns:
+    - dict: Modèles par nom (clés de MODEL_FILES, plus "knn_index" ou None).
+    """
+    models = {name: load(os.path.join(model_folder, filename)) for name, filename in MODEL_FILES.items()}
+    models["knn_index"] = load_knn_index(model_folder)
+    return models
+
+
+def build_domain_bundle(model_folder, output_folder=None, version=None):
+    """
+    Regroupe les modèles de model_folder dans un seul artefact et écrit son manifeste.
+
+    Args:
+    - model_folder (str): Dossier des fichiers joblib séparés.
+    - output_folder (str): Dossier de sortie (model_folder par défaut).
+    - version (str): Version des modèles (date du jour par défaut).
+
+    Returns:
+    - dict: Manifeste écrit.
+    """
+    import sklearn
+
+    output_folder = output_folder or model_folder
+    models = load_model_files(model_folder)
+    previous = read_manifest(output_folder)
+
+    # Pas de compression : mmap_mode ne s'applique qu'aux fichiers non compressés
+    tmp_path = os.path.join(output_folder, f"{DOMAIN_BUNDLE_FILE}.tmp")
+    dump({"format": BUNDLE_FORMAT, **models}, tmp_path, compress=0)
+    bundle_file, bundle_sha256 = write_versioned(output_folder, tmp_path, ".joblib")
+    hnsw_file, hnsw_sha256 = None, None
+    if getattr(models["knn_index"], "hnsw", None) is not None:
+        tmp_path = os.path.join(output_folder, f"{DOMAIN_FILE_PREFIX}hnsw.tmp")
+        models["knn_index"].hnsw.save_index(tmp_path)
+        hnsw_file, hnsw_sha256 = write_versioned(output_folder, tmp_path, ".hnsw")
+
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "version": version or time.strftime("%Y-%m-%d"),
+        "bundle": bundle_file,
+        "sha256": bundle_sha256,
+        "hnsw_index": hnsw_file,
+        "hnsw_sha256": hnsw_sha256,
+        "sklearn_version": sklearn.__version__,
+        "knn_index": models["knn_index"] is not None,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    # Le manifeste, remplacé en dernier, bascule seul vers la nouvelle version
+    manifest_path = os.path.join(output_folder, DOMAIN_MANIFEST_FILE)
+    with open(f"{manifest_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+    remove_stale_files(output_folder, manifest_files(manifest) | manifest_files(previous))
+    return manifest
+
+
+def load_domain_bundle(model_folder, mmap_mode="r", verify=True):
+    """
+    Charge l'artefact unique s'il existe.
+
+    Args:
+    - model_folder (str): Dossier du paquet et de son manifeste.
+    - mmap_mode (str): Mode de projection des tableaux NumPy (None : chargement en mémoire).
+    - verify (bool): Vérifie la somme de contrôle du manifeste avant le chargement.
+
+    Returns:
+    - tuple[dict, dict] | None: (modèles, manifeste), ou None si le paquet est absent.
+    """
+    manifest = read_manifest(model_folder)
+    if manifest is None:
+        return None
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Format de paquet {manifest.get('format')} non pris en charge (attendu : {BUNDLE_FORMAT}).")
+    bundle_path = os.path.join(model_folder, manifest.get("bundle", DOMAIN_BUNDLE_FILE))
+    if verify and file_sha256(bundle_path) != manifest["sha256"]:
+        raise ValueError(f"Somme de contrôle invalide pour {bundle_path} : paquet corrompu ou remplacé.")
+    models = load(bundle_path, mmap_mode=mmap_mode)
+    models.pop("format", None)
+
+    if manifest.get("hnsw_index") and models.get("knn_index") is not None:
+        hnsw_path = os.path.join(model_folder, manifest["hnsw_index"])
+        if verify and file_sha256(hnsw_path) != manifest["hnsw_sha256"]:
+            raise ValueError(f"Somme de contrôle invalide pour {hnsw_path} : index corrompu ou remplacé.")
+        attach_hnsw(models["knn_index"], hnsw_path)
+    return models, manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regroupe les modèles de domain_api en un artefact versionné.")
+    parser.add_argument("--model-folder", default=".", help="Dossier des fichiers joblib séparés.")
+    parser.add_argument("--output-folder", help="Dossier du paquet (model-folder par défaut).")
+    parser.add_argument("--version", help="Version des modèles (date du jour par défaut).")
+    args = parser.parse_args()
+
+    manifest = build_domain_bundle(args.model_folder, args.output_folder, args.version)
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
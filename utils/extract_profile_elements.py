@@ -1,6 +1,6 @@
 from datetime import datetime
 import re
-from typing import List, Dict
+from typing import List, Dict, FrozenSet, Iterable
 
 # === Chargement du dictionnaire depuis skills_list.txt ===
 def load_skill_dictionary(path: str = "utils/skills_list.txt") -> List[str]:
@@ -448,12 +448,27 @@ def normalize_languages(raw_langs: List[str]) -> List[str]:
     return sorted(normalized)
 
 
+# === Clés de comparaison : éléments en minuscules (casefold), sans doublons ===
+KEY_FIELDS = ("competences", "soft_skills", "languages")
+
+def normalize_keys(items: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(item.casefold() for item in items)
+
+def structured_keys(elements: Dict) -> Dict[str, FrozenSet[str]]:
+    # Éléments extraits avant l'ajout de "keys" (ex. entrées de cache) : calculées à la volée
+    if "keys" in elements:
+        return elements["keys"]
+    return {field: normalize_keys(elements[field]) for field in KEY_FIELDS}
+
+
 # === Structuration complète ===
 def extract_structured_elements(text: str, skill_dict_path: str = "utils/skills_list.txt") -> Dict:
     is_offer = "job title" in text.lower() or "requirements" in text.lower() or "exigences" in text.lower()
-    return {
+    elements = {
         "formation": extract_formation(text),
         "competences": extract_technical_terms(text, skill_dict_path),
         "soft_skills": extract_soft_skills(text),
         "languages": extract_languages(text)
     }
+    elements["keys"] = structured_keys(elements)
+    return elements
@@ -0,0 +1,79 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.extract_profile_elements import structured_keys
+from utils.fusion import round_half_even
+
+# Poids des éléments structurés ; un élément absent de l'offre est ignoré
+EXTRACTION_WEIGHTS = {"competences": 0.6, "soft_skills": 0.3, "languages": 0.1}
+
+
+def coverage_ratio(cv_keys: frozenset, job_keys: frozenset) -> Optional[float]:
+    """
+    Part des éléments de l'offre présents dans le CV (None si l'offre n'en demande aucun).
+    """
+    if not job_keys:
+        return None
+    if not cv_keys:
+        return 0.0
+    return len(job_keys & cv_keys) / len(job_keys)
+
+
+def compute_extraction_score(cv_data: Dict, job_data: Dict) -> float:
+    """
+    Score de couverture pondéré des compétences, soft skills et langues de l'offre.
+
+    Args:
+    - cv_data (dict): Éléments structurés du CV (extract_structured_elements).
+    - job_data (dict): Éléments structurés de l'offre.
+
+    Returns:
+    - float: Score arrondi à 4 décimales (1.0 si l'offre ne demande rien).
+    """
+    cv_keys = structured_keys(cv_data)
+    job_keys = structured_keys(job_data)
+
+    score = 0.0
+    total_weight = 0.0
+    for field, weight in EXTRACTION_WEIGHTS.items():
+        ratio = coverage_ratio(cv_keys[field], job_keys[field])
+        if ratio is not None:
+            score += weight * ratio
+            total_weight += weight
+
+    return round(score / total_weight if total_weight > 0 else 1.0, 4)
+
+
+def compute_extraction_scores(cv_data_list: List[Dict], job_data: Dict) -> np.ndarray:
+    """
+    Variante batchée de compute_extraction_score : une offre contre plusieurs CV.
+
+    Les clés et les poids de l'offre sont calculés une seule fois ; les poids ne
+    dépendant que de l'offre, le cumul se fait sur des tableaux. Les scores sont
+    identiques, au bit près, à ceux de compute_extraction_score.
+
+    Args:
+    - cv_data_list (list[dict]): Éléments structurés des CV.
+    - job_data (dict): Éléments structurés de l'offre.
+
+    Returns:
+    - np.ndarray: Scores (float64) dans l'ordre de cv_data_list.
+    """
+    job_keys = structured_keys(job_data)
+    cv_keys_list = [structured_keys(cv_data) for cv_data in cv_data_list]
+
+    score = np.zeros(len(cv_keys_list))
+    total_weight = 0.0
+    for field, weight in EXTRACTION_WEIGHTS.items():
+        job_field = job_keys[field]
+        if not job_field:
+            continue
+        matched = np.fromiter((len(job_field & cv_keys[field]) for cv_keys in cv_keys_list),
+                              dtype=np.float64, count=len(cv_keys_list))
+        score += weight * (matched / len(job_field))
+        total_weight += weight
+
+    if total_weight == 0:
+        return np.ones(len(cv_keys_list))
+    return round_half_even(score / total_weight)
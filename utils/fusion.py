@@ -0,0 +1,140 @@
+import numpy as np
+
+# Codes de verdict renvoyés par fuse_scores, indices de VERDICTS
+VERDICTS = ("Faible compatibilité", "Match partiel", "Très bon match")
+
+
+def round_half_even(values, decimals=4):
+    """
+    Équivalent vectorisé de round(x, decimals) de Python, au bit près.
+
+    np.round arrondit x * 10**decimals, déjà entaché d'une erreur d'arrondi ;
+    le résultat ne peut différer de round() que si ce produit tombe à
+    quelques ulp d'un demi-entier : ces éléments sont recalculés avec round().
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10.0 ** decimals
+    scaled = values * scale
+    rounded = (np.rint(scaled) / scale).reshape(-1)
+    ambiguous = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    flat_values = values.reshape(-1)
+    for index in np.flatnonzero(ambiguous):
+        rounded[index] = round(float(flat_values[index]), decimals)
+    return rounded.reshape(values.shape)
+
+
+def fuse_scores(score_sbert, score_skill2vec, score_extraction):
+    """
+    Pondération adaptative des trois moteurs et verdict, sur des tableaux de scores.
+
+    Args:
+    - score_sbert (array-like): Similarités SBERT.
+    - score_skill2vec (array-like): Similarités Skill2Vec.
+    - score_extraction (array-like): Scores de couverture des éléments structurés.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: Scores finaux (float64, arrondis à 4 décimales)
+      et codes de verdict (indices de VERDICTS).
+    """
+    s, k, e = np.broadcast_arrays(
+        np.asarray(score_sbert, dtype=np.float64),
+        np.asarray(score_skill2vec, dtype=np.float64),
+        np.asarray(score_extraction, dtype=np.float64)
+    )
+
+    # Mêmes règles, dans le même ordre de priorité, que le if / elif historique
+    conditions = [
+        (s > 0.75) & (k > 0.80),
+        s > 0.75,
+        (k > 0.75) & (e > 0.75) & (s < 0.75),
+        (k >= 0.75) & (s >= 0.60),
+    ]
+    low_extraction = e < 0.5
+    alpha = np.select(conditions, [0.6, 0.8, 0.4, 0.2], default=0.6)
+    beta = np.select(conditions, [0.4, 0.2, 0.4, 0.8], default=np.where(low_extraction, 0.35, 0.3))
+    gamma = np.select(conditions, [0.0, 0.0, 0.2, 0.0], default=np.where(low_extraction, 0.05, 0.1))
+
+    score_final = round_half_even(alpha * s + beta * k + gamma * e)
+    return score_final, verdict_codes(score_final)
+
+
+def verdict_codes(score_final):
+    """
+    Codes de verdict (indices de VERDICTS) : > 0.75 très bon match, > 0.5 match partiel.
+    """
+    score_final = np.asarray(score_final, dtype=np.float64)
+    return np.select([score_final > 0.75, score_final > 0.5], [2, 1], default=0).astype(np.int8)
+
+
+# Seuils de fuse_scores par moteur : le score final est linéaire entre ces seuils
+SCORE_THRESHOLDS = {"sbert": (0.6, 0.75), "skill2vec": (0.75, 0.80), "extraction": (0.5, 0.75)}
+
+
+def final_score_bounds(score_sbert=None, score_skill2vec=None, score_extraction=None,
+                       sbert_range=(-1.0, 1.0), skill2vec_range=(-1.0, 1.0)):
+    """
+    Bornes du score final lorsque certains scores sont encore inconnus (None).
+
+    Le score final est linéaire par morceaux, avec des régions délimitées par les
+    seuils de chaque score : ses extrema sont atteints aux bornes des plages ou
+    de part et d'autre des seuils.
+
+    Args:
+    - score_sbert, score_skill2vec, score_extraction (float | None): Scores connus.
+    - sbert_range, skill2vec_range (tuple[float, float]): Plages supposées des scores inconnus.
+
+    Returns:
+    - tuple[float, float]: (min, max) du score final.
+    """
+    def candidates(score, name, score_range):
+        if score is not None:
+            return [score]
+        low, high = score_range
+        values = {low, high}
+        for threshold in SCORE_THRESHOLDS[name]:
+            for value in (threshold - 1e-6, threshold, threshold + 1e-6):
+                if low <= value <= high:
+                    values.add(value)
+        return sorted(values)
+
+    grid = np.meshgrid(
+        candidates(score_sbert, "sbert", sbert_range),
+        candidates(score_skill2vec, "skill2vec", skill2vec_range),
+        candidates(score_extraction, "extraction", (0.0, 1.0))
+    )
+    finals, _ = fuse_scores(*grid)
+    return float(finals.min()), float(finals.max())
+
+
+def verdict_is_decided(score_low, score_high):
+    """
+    Vrai si les deux bornes du score final donnent le même verdict.
+    """
+    return int(verdict_codes(score_low)) == int(verdict_codes(score_high))
+
+
+def score_response(score_sbert, score_skill2vec, score_extraction, skill2vec_range=(0.0, 1.0)):
+    """
+    Score et verdict renvoyés par /match-profile.
+
+    Si le score Skill2Vec est inconnu (None, moteur évité par la cascade), seul
+    le verdict est acquis : la réponse donne la plage du score final au lieu
+    d'un score.
+
+    Args:
+    - score_sbert, score_extraction (float): Scores des moteurs.
+    - score_skill2vec (float | None): Score Skill2Vec, None s'il n'a pas été calculé.
+    - skill2vec_range (tuple[float, float]): Plage du score Skill2Vec inconnu.
+
+    Returns:
+    - dict: {"score", "verdict"}, ou {"verdict", "score_range"} (en pourcentages).
+    """
+    if score_skill2vec is None:
+        score_low, score_high = final_score_bounds(score_sbert, None, score_extraction,
+                                                   skill2vec_range=skill2vec_range)
+        return {
+            "verdict": VERDICTS[int(verdict_codes(score_low))],
+            "score_range": [int(score_low * 100), int(score_high * 100)]
+        }
+    score_final, verdict = fuse_scores(score_sbert, score_skill2vec, score_extraction)
+    return {"score": int(float(score_final) * 100), "verdict": VERDICTS[int(verdict)]}
@@ -0,0 +1,243 @@
+"""
+Index de voisins pour remplacer knn_model (KNeighborsClassifier en force brute)
+dans domain_api, sans changer le vote des k plus proches voisins.
+
+- "sparse" (exact) : matrice d'entraînement normalisée gardée en CSR, similarités
+  par produits creux × creux par blocs de requêtes, top-k par argpartition.
+  Sur des vecteurs TF-IDF normalisés (norm="l2"), la distance euclidienne est
+  une fonction décroissante du produit scalaire : mêmes voisins que le modèle.
+- "svd" (approché) : vecteurs réduits par TruncatedSVD puis renormalisés ;
+  recherche par hnswlib si installé, sinon produit dense exact sur les vecteurs
+  réduits.
+
+L'index est sauvegardé à côté des modèles joblib (knn_index.joblib, plus
+knn_index.hnsw pour hnswlib), avec le sha256 du knn_model.joblib dont il est
+tiré : un index construit depuis un autre modèle est ignoré au chargement.
+    python -m utils.knn_index --model-folder . --kind sparse
+    python -m utils.knn_index --model-folder . --kind svd --components 256
+"""
+import argparse
+import hashlib
+import os
+
+import numpy as np
+from joblib import dump, load
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+KNN_INDEX_FILE = "knn_index.joblib"
+HNSW_INDEX_FILE = "knn_index.hnsw"
+KNN_MODEL_FILE = "knn_model.joblib"
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _check_estimator(knn_model):
+    metric = knn_model.effective_metric_
+    if metric not in ("euclidean", "cosine"):
+        raise ValueError(f"Métrique KNN non prise en charge : {metric} (euclidean ou cosine).")
+    if knn_model.weights not in ("uniform", "distance"):
+        raise ValueError("Pondération KNN non prise en charge : seules 'uniform' et 'distance' le sont.")
+    if np.ndim(knn_model._y) != 1:
+        raise ValueError("KNN multi-sorties non pris en charge.")
+
+
+class _KNNVote:
+    """
+    Vote des voisins identique à KNeighborsClassifier.predict : majorité (ou
+    somme des inverses des distances), égalités tranchées vers la plus petite classe.
+    """
+
+    def __init__(self, knn_model):
+        _check_estimator(knn_model)
+        self.metric = knn_model.effective_metric_
+        self.weights = knn_model.weights
+        self.n_neighbors = knn_model.n_neighbors
+        self.classes_ = knn_model.classes_
+        self.labels = np.asarray(knn_model._y)
+
+    def distances(self, similarities):
+        if self.metric == "cosine":
+            return 1.0 - similarities
+        # Vecteurs unitaires : ||a - b||² = 2 - 2 a·b
+        return np.sqrt(np.maximum(2.0 - 2.0 * similarities, 0.0))
+
+    def vote(self, neighbors, similarities):
+        n_queries = neighbors.shape[0]
+        if self.weights == "uniform":
+            weights = np.ones(neighbors.shape)
+        else:
+            distances = self.distances(similarities)
+            with np.errstate(divide="ignore"):
+                weights = 1.0 / distances
+            # Comme scikit-learn : un voisin à distance nulle l'emporte sur les autres
+            exact = np.isinf(weights)
+            weights[exact.any(axis=1)] = exact[exact.any(axis=1)].astype(float)
+
+        scores = np.zeros((n_queries, len(self.classes_)))
+        np.add.at(scores, (np.arange(n_queries)[:, None], self.labels[neighbors]), weights)
+        return self.classes_[scores.argmax(axis=1)]
+
+
+class SparseKNNIndex(_KNNVote):
+    """
+    Recherche exacte : produits creux par blocs de block_size requêtes.
+    """
+
+    kind = "sparse"
+
+    def __init__(self, knn_model, block_size=256):
+        super().__init__(knn_model)
+        self.block_size = block_size
+        train = sparse.csr_matrix(knn_model._fit_X, dtype=np.float64)
+        if self.metric == "euclidean":
+            norms = np.sqrt(np.asarray(train.multiply(train).sum(axis=1)).ravel())
+            if not np.allclose(norms[norms > 0], 1.0, atol=1e-6):
+                raise ValueError("Distance euclidienne sur des vecteurs non normalisés : index exact impossible.")
+        self.train = normalize(train).T.tocsr()
+
+    def kneighbors(self, queries):
+        queries = normalize(sparse.csr_matrix(queries, dtype=np.float64))
+        k = min(self.n_neighbors, self.train.shape[1])
+        neighbors = np.empty((queries.shape[0], k), dtype=np.int64)
+        similarities = np.empty((queries.shape[0], k))
+        for start in range(0, queries.shape[0], self.block_size):
+            block = (queries[start:start + self.block_size] @ self.train).toarray()
+            # En cas d'égalité exacte (ex. document sans aucun terme du vocabulaire),
+            # l'ordre de scikit-learn dépend des arrondis : le voisin retenu peut différer
+            top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            top_sim = np.take_along_axis(block, top, axis=1)
+            order = np.argsort(-top_sim, axis=1, kind="stable")
+            neighbors[start:start + len(block)] = np.take_along_axis(top, order, axis=1)
+            similarities[start:start + len(block)] = np.take_along_axis(top_sim, order, axis=1)
+        return neighbors, similarities
+
+    def predict(self, queries):
+        return self.vote(*self.kneighbors(queries))
+
+
+class SVDKNNIndex(_KNNVote):
+    """
+    Recherche approchée sur vecteurs réduits (TruncatedSVD), via hnswlib si
+    disponible, sinon par produit dense exact sur les vecteurs réduits.
+    """
+
+    kind = "svd"
+
+    def __init__(self, knn_model, n_components=256, random_state=0):
+        from sklearn.decomposition import TruncatedSVD
+
+        super().__init__(knn_model)
+        train = normalize(sparse.csr_matrix(knn_model._fit_X, dtype=np.float64))
+        n_components = min(n_components, train.shape[1] - 1, train.shape[0] - 1)
+        self.svd = TruncatedSVD(n_components=n_components, random_state=random_state).fit(train)
+        self.train = normalize(self.svd.transform(train)).astype(np.float32)
+        self.hnsw = None
+
+    def build_hnsw(self, ef_construction=200, m=16):
+        import hnswlib
+
+        self.hnsw = hnswlib.Index(space="ip", dim=self.train.shape[1])
+        self.hnsw.init_index(max_elements=self.train.shape[0], ef_construction=ef_construction, M=m)
+        self.hnsw.add_items(self.train, np.arange(self.train.shape[0]))
+        self.hnsw.set_ef(max(50, self.n_neighbors * 4))
+
+    def kneighbors(self, queries):
+        reduced = normalize(self.svd.transform(normalize(sparse.csr_matrix(queries, dtype=np.float64)))).astype(np.float32)
+        k = min(self.n_neighbors, self.train.shape[0])
+        if self.hnsw is not None:
+            neighbors, distances = self.hnsw.knn_query(reduced, k=k)
+            # Espace "ip" : distance = 1 - produit scalaire
+            return neighbors.astype(np.int64), 1.0 - distances.astype(np.float64)
+        similarities = reduced @ self.train.T
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_sim = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_sim, axis=1, kind="stable")
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_sim, order, axis=1).astype(np.float64)
+
+    def predict(self, queries):
+        return self.vote(*self.kneighbors(queries))
+
+    def __getstate__(self):
+        # L'index hnswlib est sauvegardé dans son propre fichier
+        state = dict(self.__dict__)
+        state["hnsw"] = None
+        return state
+
+
+def save_knn_index(index, model_folder):
+    # Empreinte du modèle source, vérifiée par load_knn_index
+    index.source_sha256 = file_sha256(os.path.join(model_folder, KNN_MODEL_FILE))
+    dump(index, os.path.join(model_folder, KNN_INDEX_FILE))
+    if getattr(index, "hnsw", None) is not None:
+        index.hnsw.save_index(os.path.join(model_folder, HNSW_INDEX_FILE))
+
+
+def load_knn_index(model_folder):
+    """
+    Charge l'index sauvegardé à côté des modèles, ou None s'il n'existe pas ou
+    s'il n'a pas été construit depuis le knn_model.joblib actuel.
+    """
+    path = os.path.join(model_folder, KNN_INDEX_FILE)
+    if not os.path.exists(path):
+        return None
+    index = load(path)
+    if getattr(index, "source_sha256", None) != file_sha256(os.path.join(model_folder, KNN_MODEL_FILE)):
+        print(f"{KNN_INDEX_FILE} ignoré : construit depuis un autre {KNN_MODEL_FILE} "
+              f"(à reconstruire : python -m utils.knn_index --model-folder {model_folder})")
+        return None
+    hnsw_path = os.path.join(model_folder, HNSW_INDEX_FILE)
+    if isinstance(index, SVDKNNIndex) and os.path.exists(hnsw_path):
+        attach_hnsw(index, hnsw_path)
+    return index
+
+
+def attach_hnsw(index, hnsw_path):
+    """
+    Rattache à un SVDKNNIndex désérialisé son index hnswlib, exclu du pickle (voir __getstate__).
+    """
+    import hnswlib
+
+    index.hnsw = hnswlib.Index(space="ip", dim=index.train.shape[1])
+    index.hnsw.load_index(hnsw_path, max_elements=index.train.shape[0])
+    index.hnsw.set_ef(max(50, index.n_neighbors * 4))
+    return index
+
+
+def build_knn_index(knn_model, kind="sparse", n_components=256, use_hnsw=True):
+    if kind == "sparse":
+        return SparseKNNIndex(knn_model)
+    index = SVDKNNIndex(knn_model, n_components=n_components)
+    if use_hnsw:
+        try:
+            index.build_hnsw()
+        except ImportError:
+            print("hnswlib absent : recherche exacte sur les vecteurs réduits")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit l'index de voisins qui remplace knn_model.")
+    parser.add_argument("--model-folder", default=".", help="Dossier de knn_model.joblib ; l'index y est écrit.")
+    parser.add_argument("--kind", default="sparse", choices=["sparse", "svd"])
+    parser.add_argument("--components", type=int, default=256, help="Dimensions SVD (kind=svd).")
+    parser.add_argument("--no-hnsw", action="store_true", help="Ne pas construire d'index hnswlib (kind=svd).")
+    args = parser.parse_args()
+
+    # Via le module importable : lancé avec -m, les classes seraient picklées sous __main__
+    from utils.knn_index import build_knn_index, save_knn_index
+
+    knn_model = load(os.path.join(args.model_folder, KNN_MODEL_FILE))
+    index = build_knn_index(knn_model, kind=args.kind, n_components=args.components, use_hnsw=not args.no_hnsw)
+    save_knn_index(index, args.model_folder)
+    print(f"Index {args.kind} écrit dans {os.path.join(args.model_folder, KNN_INDEX_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
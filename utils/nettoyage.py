@@ -0,0 +1,30 @@
+import re
+from utils.text_stream import TEXT_MAX_CHARS, CHUNK_CHARS, morceaux_fichier, morceaux_texte, nettoyer_par_morceaux
+
+# Motifs compilés une fois. ESPACES ne remplace que les blancs à modifier (suites de
+# plusieurs blancs, blanc autre qu'une espace) : même résultat que \s+, sans réécrire
+# chaque espace simple. Les puces (•▪●♦■▶→) font partie de la ponctuation supprimée.
+ESPACES = re.compile(r"[^\S ]\s*| \s+")
+PONCTUATION = re.compile(r"[^\w\s@.+]")
+MOTS_COLLES = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+def nettoyer_morceau(texte):
+    # Supprimer les espaces multiples
+    texte = ESPACES.sub(" ", texte)
+
+    # Supprimer les caractères spéciaux inutiles et les ponctuations isolées
+    texte = PONCTUATION.sub("", texte)
+
+    # Séparer les mots collés par majuscules (ex : STAGEEN → STAGE EN)
+    return MOTS_COLLES.sub(" ", texte)
+
+def nettoyer_texte(texte, max_chars=TEXT_MAX_CHARS):
+    # Texte long : nettoyé par morceaux, sans copies complètes, et borné à max_chars
+    if len(texte) > CHUNK_CHARS:
+        return nettoyer_par_morceaux(morceaux_texte(texte), nettoyer_morceau, max_chars)
+    texte = nettoyer_morceau(texte).strip()
+    return texte[:max_chars].rstrip() if max_chars and len(texte) > max_chars else texte
+
+# 📄 Fichier texte lu et nettoyé par morceaux
+def nettoyer_fichier(filepath, max_chars=TEXT_MAX_CHARS):
+    return nettoyer_par_morceaux(morceaux_fichier(filepath), nettoyer_morceau, max_chars)
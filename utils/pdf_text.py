@@ -0,0 +1,146 @@
+"""
+Extraction du texte des PDF, partagée par domain_api, SBERT et Skill2Vec.
+
+PyMuPDF lit les blocs de texte de chaque page (une seule ouverture du
+fichier) ; la mise en page est détectée sur ces blocs (1 ou 2 colonnes) et,
+pour un CV en deux colonnes, la colonne de gauche est lue avant celle de
+droite au lieu d'entrelacer les lignes. Plusieurs fois plus rapide que
+pdfminer, qui reste disponible avec PDF_EXTRACTOR=pdfminer.
+
+Au-delà de PDF_PARALLEL_MIN_PAGES pages, les pages sont réparties par plages
+contiguës entre les processus d'un pool : chaque worker ouvre lui-même le
+fichier (partagé via le cache de pages du système, aucune copie du PDF dans
+les échanges avec le pool) et renvoie ses pages, réassemblées dans l'ordre.
+Dans un processus de pool (pools d'asgi_api ou de matching_api, shards de
+bulk_score), l'extraction reste séquentielle : pas de pool imbriqué, ni de
+processus multipliés par le nombre de processus du pool parent.
+
+Comparaison des extracteurs (débit, fidélité au texte source) :
+    python -m benchmarks.pdf_extraction --count 4
+"""
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+import fitz  # PyMuPDF
+
+from utils.process_pool import process_pool, in_pool_worker
+
+# "pymupdf" (blocs, colonnes) ou "pdfminer" (extracteur historique de SBERT et Skill2Vec)
+PDF_EXTRACTOR = os.environ.get("PDF_EXTRACTOR", "pymupdf")
+# Extraction parallèle par plages de pages à partir de ce nombre de pages (0 : désactivée)
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("PDF_PARALLEL_MIN_PAGES", "20"))
+PDF_PARALLEL_WORKERS = int(os.environ.get("PDF_PARALLEL_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# ⚙️ Pool de processus du worker, créé au premier PDF volumineux (forkserver, comme les
+# autres pools de l'API : les processus n'importent que ce module). Le verrou évite que
+# deux requêtes simultanées créent chacune leur pool
+pdf_executors = {}
+pdf_executors_lock = threading.Lock()
+
+def get_pdf_executor():
+    with pdf_executors_lock:
+        if pdf_executors.get("pid") != os.getpid():
+            pdf_executors.clear()
+            pdf_executors["pid"] = os.getpid()
+            pdf_executors["pool"] = process_pool(PDF_PARALLEL_WORKERS)
+        return pdf_executors["pool"]
+
+
+def compter_pages(filepath, max_pages=0):
+    with fitz.open(filepath) as doc:
+        return min(doc.page_count, max_pages) if max_pages else doc.page_count
+
+
+def extraction_parallele(nb_pages):
+    # Processus de pool : extraction séquentielle, sans pool imbriqué
+    if in_pool_worker():
+        return False
+    return PDF_PARALLEL_MIN_PAGES > 0 and PDF_PARALLEL_WORKERS > 1 and nb_pages >= PDF_PARALLEL_MIN_PAGES
+
+
+def par_plages(fonction, filepath, nb_pages):
+    """
+    Applique fonction(filepath, début, fin) à des plages contiguës de pages, une
+    par processus du pool, et renvoie les résultats dans l'ordre des pages.
+    Si le pool est cassé (worker tué), la lecture se fait dans ce processus.
+    """
+    taille = -(-nb_pages // PDF_PARALLEL_WORKERS)
+    plages = [(debut, min(debut + taille, nb_pages)) for debut in range(0, nb_pages, taille)]
+    try:
+        futures = [get_pdf_executor().submit(fonction, filepath, debut, fin) for debut, fin in plages]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        pdf_executors.clear()
+        return [fonction(filepath, 0, nb_pages)]
+
+
+def blocs_pages(doc, debut, fin):
+    return [(page.rect.width, page.get_text("blocks", sort=True)) for page in doc.pages(debut, fin)]
+
+
+# 📄 Blocs de texte et largeur des pages [debut, fin) (exécuté dans le pool)
+def lire_blocs_pages(filepath, debut, fin):
+    with fitz.open(filepath) as doc:
+        return blocs_pages(doc, debut, fin)
+
+
+# 📄 Lecture du PDF : blocs de texte et largeur de chaque page, en une ouverture
+# du fichier sous le seuil, par plages dans le pool au-delà
+def lire_blocs_pdf(filepath, max_pages=0):
+    with fitz.open(filepath) as doc:
+        nb_pages = min(doc.page_count, max_pages) if max_pages else doc.page_count
+        if not extraction_parallele(nb_pages):
+            return blocs_pages(doc, 0, nb_pages)
+    return [page for plage in par_plages(lire_blocs_pages, filepath, nb_pages) for page in plage]
+
+
+# 📄 Texte pdfminer des pages [debut, fin)
+def extraire_pages_pdfminer(filepath, debut, fin):
+    from pdfminer.high_level import extract_text
+
+    return extract_text(filepath, page_numbers=range(debut, fin))
+
+
+# 🔍 Détection du type de mise en page à partir des blocs déjà extraits
+def detecter_type_cv_blocs(pages):
+    for largeur_page, blocs in pages:
+        positions_x_filtrees = [bloc[0] for bloc in blocs if 50 < bloc[0] < largeur_page - 50]
+        ecart_max = max((abs(b - a) for a, b in zip(positions_x_filtrees, positions_x_filtrees[1:])), default=0)
+        if ecart_max > largeur_page / 2.5:
+            return "2_colonnes"
+    return "1_colonne"
+
+
+# 🧩 Texte des pages dans l'ordre de lecture de la mise en page
+def assembler_texte(pages, type_cv):
+    morceaux = []
+    for largeur_page, blocs in pages:
+        if type_cv == "2_colonnes":
+            blocs_gauche = [bloc[4] for bloc in blocs if bloc[0] < largeur_page / 2]
+            blocs_droite = [bloc[4] for bloc in blocs if bloc[0] >= largeur_page / 2]
+            morceaux.append('\n'.join(blocs_gauche + blocs_droite) + "\n")
+        else:
+            morceaux.extend(bloc[4] + "\n" for bloc in blocs)
+    return "".join(morceaux)
+
+
+def extraire_texte_pdf(filepath, max_pages=0):
+    """
+    Extrait le texte brut (non nettoyé) d'un PDF.
+
+    Args:
+    - filepath (str): Chemin du PDF.
+    - max_pages (int): Nombre maximal de pages lues (0 : toutes).
+
+    Returns:
+    - str: Texte du document, colonnes lues l'une après l'autre.
+    """
+    if PDF_EXTRACTOR == "pdfminer":
+        nb_pages = compter_pages(filepath, max_pages)
+        if not extraction_parallele(nb_pages):
+            return extraire_pages_pdfminer(filepath, 0, nb_pages)
+        return "".join(par_plages(extraire_pages_pdfminer, filepath, nb_pages))
+    pages = lire_blocs_pdf(filepath, max_pages)
+    return assembler_texte(pages, detecter_type_cv_blocs(pages))
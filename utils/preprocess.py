@@ -1,19 +1,35 @@
 import re
+from utils.text_stream import TEXT_MAX_CHARS, CHUNK_CHARS, morceaux_texte, nettoyer_par_morceaux
 
-def preprocess(text):
-    text = text.lower()
-    text = text.replace('\n', ' ').replace('\r', ' ')
+# Mots que les en-têtes supprimés prolongent au-delà d'un blanc ("page 2", "curriculum vitae")
+MOTS_PROTEGES = ("page", "curriculum")
+
+# Motifs compilés une fois ; ESPACES : même résultat que \s+ (voir utils/nettoyage.py)
+MOTS_COUPES = re.compile(r'-\s+')
+NON_TECHNIQUES = re.compile(r'[^\w\s\-\+#:/.,]')
+EN_TETES = re.compile(r'\b(page\s*\d+|confidentiel|curriculum vitae)\b')
+ESPACES = re.compile(r'[^\S ]\s*| \s+')
+
+def preprocess_morceau(text):
+    text = text.lower().replace('\n', ' ').replace('\r', ' ')
     
     # Supprimer les mots coupés par des tirets (ex: "déve-\nloppeur")
-    text = re.sub(r'-\s+', '', text)
+    text = MOTS_COUPES.sub('', text)
     
     # Garder certains caractères techniques utiles
-    text = re.sub(r'[^\w\s\-\+#:/.,]', ' ', text)
+    text = NON_TECHNIQUES.sub(' ', text)
     
-    # Supprimer les headers/footers répétitifs (ex: "page 1", "confidentiel", etc.)
-    text = re.sub(r'\b(page\s*\d+|confidentiel|curriculum vitae)\b', '', text)
+    # Supprimer les headers/footers répétitifs (ex: "page 1", "confidentiel", etc.),
+    # recherche littérale d'abord : la regex n'est lancée que si un en-tête est possible
+    if 'page' in text or 'confidentiel' in text or 'curriculum vitae' in text:
+        text = EN_TETES.sub('', text)
     
     # Réduire les espaces
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
\ No newline at end of file
+    return ESPACES.sub(' ', text)
+
+def preprocess(text, max_chars=TEXT_MAX_CHARS):
+    # Texte long : traité par morceaux, sans copies complètes, et borné à max_chars
+    if len(text) > CHUNK_CHARS:
+        return nettoyer_par_morceaux(morceaux_texte(text), preprocess_morceau, max_chars, MOTS_PROTEGES)
+    text = preprocess_morceau(text).strip()
+    return text[:max_chars].rstrip() if max_chars and len(text) > max_chars else text
@@ -0,0 +1,54 @@
+"""
+Pools de processus des API, démarrés en "forkserver".
+
+Un fork du worker après le chargement de torch copie un processus dont d'autres
+threads (intra-op de torch, pools de threads, thread d'inférence SBERT) peuvent
+tenir un verrou au moment du fork : le processus enfant peut se bloquer sur ce
+verrou, qu'aucun thread ne libérera. Le serveur "forkserver" est lancé par un
+nouvel interpréteur, sans modèle ni thread, et chaque processus du pool en est
+un fork : il n'importe que les modules des fonctions qu'on lui soumet, puis
+exécute initializer.
+
+in_pool_worker() indique si le processus courant est un processus de pool
+(ou un shard de bulk_score) : un tel processus ne crée pas de pool imbriqué.
+multiprocessing.parent_process() ne suffit pas : les workers d'uvicorn
+(--workers) sont eux aussi des processus multiprocessing.
+
+Le serveur ne précharge pas __main__ : sous gunicorn ou uvicorn, c'est leur
+script de lancement. Une API lancée directement (python matching_api.py) serait
+en revanche réimportée, modèles compris, par chaque processus du pool.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# Vrai dans un processus de pool (process_pool) ou un shard de bulk_score
+pool_worker = {"active": False}
+
+
+def mark_pool_worker():
+    pool_worker["active"] = True
+
+
+def in_pool_worker():
+    return pool_worker["active"]
+
+
+def _init_pool_worker(initializer, initargs):
+    mark_pool_worker()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def process_pool(max_workers, initializer=None, initargs=()):
+    """
+    Args:
+    - max_workers (int): Nombre de processus du pool.
+    - initializer (callable): Exécuté au démarrage de chaque processus (chargement des modèles utiles).
+
+    Returns:
+    - ProcessPoolExecutor: Pool dont les processus sont des forks du serveur "forkserver".
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([])
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context,
+                               initializer=_init_pool_worker, initargs=(initializer, initargs))
@@ -0,0 +1,180 @@
+"""
+Profilage cProfile à la demande des requêtes de production.
+
+Une requête est profilée si PROFILING_ENABLED est actif et qu'elle porte l'en-tête
+PROFILE_HEADER (valeur "1") ou qu'elle est tirée au sort (PROFILE_SAMPLE_RATE).
+Le profil est écrit dans PROFILE_FOLDER avec un fichier JSON compagnon (route,
+hash du document, durées des étapes) ; le dossier est borné à
+PROFILE_MAX_ENTRIES profils, les plus anciens étant supprimés.
+
+Résumé des fonctions les plus coûteuses sur l'ensemble des profils :
+    python -m utils.profiling --folder profiles --top 25
+"""
+import argparse
+import cProfile
+import functools
+import json
+import os
+import pstats
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from flask import g, request
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "0") == "1"
+PROFILE_HEADER = os.environ.get("PROFILE_HEADER", "X-Profile-Request")
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_FOLDER = os.environ.get("PROFILE_FOLDER", "profiles")
+PROFILE_MAX_ENTRIES = int(os.environ.get("PROFILE_MAX_ENTRIES", "200"))
+
+
+class ProfileStore:
+    """
+    Tampon circulaire de profils sur disque : chaque profil (.prof, format
+    pstats) est accompagné de ses métadonnées (.json) ; au-delà de max_entries,
+    les plus anciens sont supprimés. Les écritures sont atomiques.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 200):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def save(self, profiler: cProfile.Profile, metadata: Dict) -> str:
+        """
+        Enregistre un profil et ses métadonnées puis applique la limite.
+
+        Returns:
+        - str: Chemin du fichier .prof écrit.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        stem = f"{time.time_ns()}_{os.getpid()}_{threading.get_ident()}"
+        path = os.path.join(self.directory, f"{stem}.prof")
+        profiler.dump_stats(f"{path}.tmp")
+        with open(os.path.join(self.directory, f"{stem}.json.tmp"), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, ensure_ascii=False)
+        # Le .json est publié en dernier : un profil listé est toujours complet
+        os.replace(f"{path}.tmp", path)
+        os.replace(os.path.join(self.directory, f"{stem}.json.tmp"), os.path.join(self.directory, f"{stem}.json"))
+        self.prune()
+        return path
+
+    def entries(self) -> List[Tuple[str, Dict]]:
+        """
+        Retourne les profils (chemin .prof, métadonnées), du plus ancien au plus récent.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        # Noms préfixés par time_ns : l'ordre alphabétique est l'ordre chronologique
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(".json"):
+                continue
+            stem = os.path.join(self.directory, name[:-len(".json")])
+            try:
+                with open(f"{stem}.json", encoding="utf-8") as f:
+                    entries.append((f"{stem}.prof", json.load(f)))
+            except (OSError, ValueError):
+                continue
+        return entries
+
+    def prune(self) -> None:
+        entries = self.entries()
+        for path, _ in entries[:max(0, len(entries) - self.max_entries)]:
+            stem = path[:-len(".prof")]
+            for suffix in (".json", ".prof"):
+                try:
+                    os.remove(stem + suffix)
+                except OSError:
+                    pass
+
+
+store = ProfileStore(PROFILE_FOLDER, PROFILE_MAX_ENTRIES)
+
+
+def profile_trigger(headers) -> Optional[str]:
+    """
+    Retourne la raison du profilage ("header" ou "sample"), ou None.
+    """
+    if not PROFILING_ENABLED:
+        return None
+    if headers.get(PROFILE_HEADER) == "1":
+        return "header"
+    if PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+def profiled(endpoint: str):
+    """
+    Décorateur de route Flask : profile la requête si elle est sélectionnée.
+
+    Pendant une requête profilée, g.profiling vaut True ; la route peut
+    renseigner g.profile_document_hash (SHA-256 du fichier téléversé) et
+    g.profile_timings, repris dans les métadonnées. cProfile ne suit que le thread de la requête : les routes
+    exécutent alors leurs moteurs dans ce thread.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            trigger = profile_trigger(request.headers)
+            if trigger is None:
+                return view(*args, **kwargs)
+
+            g.profiling = True
+            profiler = cProfile.Profile()
+            start = time.perf_counter()
+            profiler.enable()
+            try:
+                return view(*args, **kwargs)
+            finally:
+                profiler.disable()
+                store.save(profiler, {
+                    "endpoint": endpoint,
+                    "trigger": trigger,
+                    "document_hash": g.get("profile_document_hash"),
+                    "timings": g.get("profile_timings", {}),
+                    "total_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "pid": os.getpid()
+                })
+        return wrapper
+    return decorator
+
+
+def summarize(profile_store: ProfileStore, top: int = 25, sort: str = "cumulative", endpoint: Optional[str] = None) -> None:
+    """
+    Affiche les requêtes profilées les plus lentes puis les fonctions les plus
+    coûteuses, agrégées sur l'ensemble des profils retenus.
+    """
+    entries = [(path, metadata) for path, metadata in profile_store.entries()
+               if endpoint is None or metadata.get("endpoint") == endpoint]
+    if not entries:
+        print(f"Aucun profil dans {profile_store.directory}")
+        return
+
+    print(f"{len(entries)} requête(s) profilée(s)\n")
+    print("Requêtes les plus lentes :")
+    for path, metadata in sorted(entries, key=lambda entry: -entry[1].get("total_ms", 0))[:10]:
+        document_hash = (metadata.get("document_hash") or "-")[:12]
+        print(f"  {metadata.get('total_ms', 0):>10.1f} ms  {metadata.get('endpoint')}  {document_hash}  {metadata.get('timings')}")
+    print()
+
+    stats = pstats.Stats(*[path for path, _ in entries])
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Résumé des profils de requêtes capturés.")
+    parser.add_argument("--folder", default=PROFILE_FOLDER)
+    parser.add_argument("--top", type=int, default=25, help="Nombre de fonctions affichées.")
+    parser.add_argument("--sort", default="cumulative", choices=["cumulative", "tottime", "ncalls"])
+    parser.add_argument("--endpoint", help="Ne garder que les profils de cette route.")
+    args = parser.parse_args()
+
+    summarize(ProfileStore(args.folder), top=args.top, sort=args.sort, endpoint=args.endpoint)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Lecture et nettoyage des textes par morceaux, bornés par un budget de caractères.
+
+Un .txt de plusieurs centaines de Mo, lu d'un bloc puis passé dans une chaîne
+de re.sub (une copie complète par passe), peut épuiser la mémoire d'un worker.
+Ici le fichier est lu par morceaux de CHUNK_CHARS caractères, chaque morceau
+est nettoyé dès qu'il est complet et la lecture s'arrête une fois
+TEXT_MAX_CHARS caractères nettoyés produits : aucun moteur n'exploite un texte
+plus long (encodage SBERT, annotation SkillNER, TF-IDF du domaine).
+
+Les morceaux sont coupés juste après un mot fait uniquement de caractères \\w et
+suivi d'un blanc, jamais après la fin d'un mot coupé par un tiret ("pa-\\nge") :
+aucun motif des nettoyages (espaces, tirets de coupure, mots collés, en-têtes)
+ne chevauche la coupure, et le résultat est identique au nettoyage du texte
+entier tant que le budget n'est pas atteint.
+"""
+import os
+import re
+
+# Budget de caractères d'un document (texte nettoyé, ou texte brut d'un .txt)
+TEXT_MAX_CHARS = int(os.environ.get("TEXT_MAX_CHARS", "200000"))
+# Taille des morceaux lus puis nettoyés
+CHUNK_CHARS = 1 << 16
+
+# Fin d'un mot (\w uniquement) suivi d'un blanc : frontière sûre entre deux morceaux
+_FRONTIERE = re.compile(r"(?:(?<=\s)|^)(\w+)(?=\s)")
+# Fenêtre de recherche de la frontière, en fin de tampon
+_FENETRE = 4096
+
+
+def lire_texte(filepath, max_chars=TEXT_MAX_CHARS):
+    """
+    Lit au plus max_chars caractères d'un fichier texte UTF-8 (0 : sans limite).
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        return f.read(max_chars or -1)
+
+
+def morceaux_fichier(filepath, taille=CHUNK_CHARS):
+    with open(filepath, "r", encoding="utf-8") as f:
+        for morceau in iter(lambda: f.read(taille), ""):
+            yield morceau
+
+
+def morceaux_texte(texte, taille=CHUNK_CHARS):
+    for debut in range(0, len(texte), taille):
+        yield texte[debut:debut + taille]
+
+
+def _apres_tiret(tampon, debut):
+    # Mot précédé de "-" puis de blancs : fin d'un mot recollé par le nettoyage ("pa-\nge" -> "page")
+    while debut > 0 and tampon[debut - 1].isspace():
+        debut -= 1
+    return debut > 0 and tampon[debut - 1] == "-"
+
+
+def _coupure(tampon, mots_proteges):
+    coupure = -1
+    for match in _FRONTIERE.finditer(tampon, max(0, len(tampon) - _FENETRE)):
+        # Mot qu'un motif peut prolonger au-delà du blanc (ex. "page 3") : pas de coupure
+        if match.group(1).lower() not in mots_proteges and not _apres_tiret(tampon, match.start()):
+            coupure = match.end()
+    return coupure
+
+
+def _ajouter(sorties, sortie):
+    # Les blancs sont déjà réduits dans chaque morceau : seul un double espace à la jonction est possible
+    if sorties and sorties[-1].endswith(" ") and sortie.startswith(" "):
+        sortie = sortie[1:]
+    sorties.append(sortie)
+    return len(sortie)
+
+
+def nettoyer_par_morceaux(morceaux, nettoyer, max_chars=TEXT_MAX_CHARS, mots_proteges=()):
+    """
+    Applique un nettoyage morceau par morceau et s'arrête une fois le budget atteint.
+
+    Args:
+    - morceaux (iterable[str]): Texte source, par morceaux.
+    - nettoyer (callable): Nettoyage d'un morceau, sans strip final.
+    - max_chars (int): Budget de caractères du texte nettoyé (0 : sans limite).
+    - mots_proteges (tuple[str]): Mots (en minuscules) qu'un motif du nettoyage
+      peut prolonger au-delà d'un blanc ; jamais utilisés comme frontière.
+
+    Returns:
+    - str: Texte nettoyé (strip), tronqué à max_chars caractères.
+    """
+    sorties, taille, tampon = [], 0, ""
+    for morceau in morceaux:
+        tampon += morceau
+        if len(tampon) < CHUNK_CHARS:
+            continue
+        coupure = _coupure(tampon, mots_proteges)
+        if coupure <= 0:
+            # Aucune frontière sûre (ex. texte sans blancs) : on attend, dans une limite
+            if len(tampon) < 4 * CHUNK_CHARS:
+                continue
+            coupure = len(tampon)
+        taille += _ajouter(sorties, nettoyer(tampon[:coupure]))
+        tampon = tampon[coupure:]
+        if max_chars and taille >= max_chars:
+            tampon = ""
+            break
+    if tampon:
+        _ajouter(sorties, nettoyer(tampon))
+
+    texte = "".join(sorties).strip()
+    return texte[:max_chars].rstrip() if max_chars and len(texte) > max_chars else texte
@@ -0,0 +1,171 @@
+import bisect
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Désactivé : span() renvoie un contexte vide partagé, sans horloge ni verrou
+TRACING_ENABLED = os.environ.get("TRACING_ENABLED", "1") == "1"
+
+# Bornes (secondes) des histogrammes : de la regex (ms) à la traduction d'un long CV
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_NULL_SPAN = nullcontext()
+
+
+class Histogram:
+    """
+    Histogramme cumulatif au format Prometheus (compte par borne, somme, total).
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float, count: int = 1) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += count
+        self.sum += value * count
+        self.count += count
+
+    def samples(self, name: str, help_text: str) -> List[Tuple[str, str, str, Dict[str, str], float]]:
+        """
+        Échantillons _bucket, _sum et _count de l'histogramme, au format des
+        métriques supplémentaires de MetricsRegistry.render.
+        """
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            samples.append((f"{name}_bucket", "histogram", help_text, {"le": le}, cumulative))
+        samples.append((f"{name}_sum", "histogram", help_text, {}, self.sum))
+        samples.append((f"{name}_count", "histogram", help_text, {}, self.count))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Durées par étape (histogrammes) et valeurs ponctuelles (temps de chargement
+    des modèles, compteurs exposés par d'autres composants), rendues au format
+    texte Prometheus.
+
+    Les métriques sont propres au processus : avec plusieurs workers gunicorn,
+    chaque worker expose les siennes.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.stages: Dict[str, Histogram] = {}
+        self.model_load_seconds: Dict[str, float] = {}
+        self.lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        with self.lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def record_model_load(self, model: str, seconds: float) -> None:
+        with self.lock:
+            self.model_load_seconds[model] = seconds
+
+    def render(self, extra: Optional[List[Tuple[str, str, str, Dict[str, str], float]]] = None) -> str:
+        """
+        Rend les métriques au format texte Prometheus.
+
+        Args:
+        - extra (list): Métriques supplémentaires (nom, type, aide, labels, valeur),
+          calculées par l'appelant au moment de la collecte.
+
+        Returns:
+        - str: Corps de la réponse /metrics.
+        """
+        lines = [
+            "# HELP matching_stage_duration_seconds Durée de chaque étape du traitement.",
+            "# TYPE matching_stage_duration_seconds histogram",
+        ]
+        with self.lock:
+            for stage, histogram in sorted(self.stages.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'matching_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+                lines.append(f'matching_stage_duration_seconds_sum{{stage="{stage}"}} {histogram.sum}')
+                lines.append(f'matching_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+            lines.append("# HELP matching_model_load_seconds Temps de chargement de chaque modèle.")
+            lines.append("# TYPE matching_model_load_seconds gauge")
+            for model, seconds in sorted(self.model_load_seconds.items()):
+                lines.append(f'matching_model_load_seconds{{model="{model}"}} {seconds}')
+
+        declared = set()
+        for name, metric_type, help_text, labels, value in extra or []:
+            # Histogramme : HELP et TYPE portent le nom sans suffixe _bucket / _sum / _count
+            family = name.rsplit("_", 1)[0] if metric_type == "histogram" else name
+            if family not in declared:
+                lines.append(f"# HELP {family} {help_text}")
+                lines.append(f"# TYPE {family} {metric_type}")
+                declared.add(family)
+            label_text = ",".join(f'{key}="{val}"' for key, val in labels.items())
+            lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _Span:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        registry.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def span(stage: str):
+    """
+    Contexte chronométrant une étape : `with span("sbert_encode"): ...`.
+    Sans effet (contexte vide partagé) si TRACING_ENABLED est faux.
+    """
+    if not TRACING_ENABLED:
+        return _NULL_SPAN
+    return _Span(stage)
+
+
+def record(stage: str, seconds: float) -> None:
+    """
+    Enregistre une durée déjà mesurée par l'appelant.
+    """
+    if TRACING_ENABLED:
+        registry.observe(stage, seconds)
+
+
+class model_load:
+    """
+    Contexte enregistrant le temps de chargement d'un modèle, même si le
+    traçage des étapes est désactivé (mesure unique au démarrage).
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            registry.record_model_load(self.model, time.perf_counter() - self.start)
+        return False